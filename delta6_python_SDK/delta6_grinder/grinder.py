@@ -27,19 +27,23 @@ class Delta6_grinder(RTLoop):
         # Serial object
         self.ser = None
 
+        # Seconds from opening the port until the Arduino reported 'Initialized'
+        self.connect_time = None
+
     def setup(self):
         """
         Called once before the main loop starts.
         Initializes the serial port and waits for Arduino to send 'initialized'.
         """
-        # 1. Open serial connection
-        self.ser = serial.Serial(port=self.port, baudrate=self.baud, timeout=1)
-        time.sleep(2)  # Allow time for Arduino to reset and start up
+        # 1. Open serial connection; the Arduino resets and announces itself when it is ready
+        start_time = time.perf_counter()
+        self.ser = serial.Serial(port=self.port, baudrate=self.baud, timeout=0.1)
 
         print("[Info] Waiting for Arduino to send 'Initialized'...")
         self._wait_for_arduino_init(msg="Initialized", timeout=10.0)
+        self.connect_time = time.perf_counter() - start_time
 
-        print("[Info] Delta6_grinder setup complete.")
+        print(f"[Info] Delta6_grinder setup complete, Arduino ready after {self.connect_time:.3f} s.")
 
         # Call parent setup method if needed
         super().setup()
@@ -88,23 +92,20 @@ class Delta6_grinder(RTLoop):
         :param msg: Expected message string from Arduino
         :param timeout: Timeout in seconds
         """
-        start_time = time.time()
+        start_time = time.perf_counter()
         while True:
             # Check for timeout
-            if (time.time() - start_time) > timeout:
+            if (time.perf_counter() - start_time) > timeout:
                 raise TimeoutError(
                     f"Waiting for '{msg}' timed out after {timeout} seconds.")
 
-            # Check incoming serial data
-            if self.ser.in_waiting > 0:
-                response = self.ser.readline().decode('utf-8').strip()
-                if response:
-                    print(f"[Delta6_grinder] Received: '{response}'")
-                    if response == msg:
-                        print("[Delta6_grinder] Arduino init message detected!")
-                        break
-            else:
-                time.sleep(0.1)  # Small delay to prevent tight loop
+            # readline() returns as soon as a line arrives, or after the serial timeout
+            response = self.ser.readline().decode('utf-8', errors='replace').strip()
+            if response:
+                print(f"[Delta6_grinder] Received: '{response}'")
+                if response == msg:
+                    print("[Delta6_grinder] Arduino init message detected!")
+                    break
 
 
 if __name__ == "__main__":
@@ -1,508 +1,1110 @@
-"""
-Using the method from code:
-https://github.com/mhp/delta-bot/blob/main/kinematics.py
-"""
-
-import math
-from scipy.optimize import fsolve
-import numpy as np
-import scipy.spatial.transform as tfm
-from scipy.spatial.transform import Rotation as R
-
-# Class representing a Delta Robot
-
-
-class DeltaRobot:
-    def __init__(self, short_arm_length=40.0, parallel_arm_length=120.0, base_radius=72.0, end_effector_radius=21.24, theta_offset=math.pi / 6, spring_coef=0.639236, version="original"):
-        """
-        Initialize the Delta Robot with given dimensions.
-
-        Parameters:
-        short_arm_length (float): Length of the short arms (rf)
-        parallel_arm_length (float): Length of the parallel arms (re)
-        base_radius (float): Radius of the base (f)
-        end_effector_radius (float): Radius of the end effector (e)
-        """
-        # in mm
-        self.e = end_effector_radius
-        self.f = base_radius
-        self.re = parallel_arm_length
-        self.rf = short_arm_length
-
-        self.z_offset_upper = 33  # mm
-        self.z_offset_lower = 30  # mm
-        self.z_offset = self.z_offset_upper + self.z_offset_lower  # mm
-
-        self.theta_offset = theta_offset  # radian
-
-        self.version = version
-
-        self.theta1 = 0
-        self.theta2 = 0
-        self.theta3 = 0
-        self.theta4 = 0
-        self.theta5 = 0
-        self.theta6 = 0
-
-        self.torque1 = 0
-        self.torque2 = 0
-        self.torque3 = 0
-        self.torque4 = 0
-        self.torque5 = 0
-        self.torque6 = 0
-
-        self.spring_coef = spring_coef
-
-    def update(self, theta1, theta2, theta3, theta4, theta5, theta6):
-        self.update_angles(theta1, theta2, theta3, theta4, theta5, theta6)
-        self.update_torques(theta1, theta2, theta3, theta4, theta5, theta6)
-
-    def update_angles(self, theta1, theta2, theta3, theta4, theta5, theta6):
-        self.theta1 = theta1
-        self.theta2 = theta2
-        self.theta3 = theta3
-        self.theta4 = theta4
-        self.theta5 = theta5
-        self.theta6 = theta6
-
-    def update_torques(self, theta1, theta2, theta3, theta4, theta5, theta6):
-        self.torque1 = theta1 * self.spring_coef
-        self.torque2 = theta2 * self.spring_coef
-        self.torque3 = theta3 * self.spring_coef
-        self.torque6 = theta6 * self.spring_coef
-        if self.version == "double-springs-roll-pitch":
-            self.torque4 = 2 * theta4 * self.spring_coef
-            self.torque5 = 2 * theta5 * self.spring_coef
-        else:
-            self.torque4 = theta4 * self.spring_coef
-            self.torque5 = theta5 * self.spring_coef
-
-    def get_end_force(self):
-        return self.calculate_end_force(self.torque1, self.torque2, self.torque3, self.torque4, self.torque5, self.torque6)
-
-    def calculate_end_force(self, torque1, torque2, torque3, torque4, torque5, torque6):
-        Fx, Fy, Fz = self.calculate_force_xyz(
-            torque1, torque2, torque3)
-        Mx, My, Mz = torque4, torque5, torque6
-
-        pose_trans = self.get_FK_result()
-        rotate_trans = [0, 0, 0, pose_trans[3], pose_trans[4], pose_trans[5]]
-        transfered_wrench = represent_wrench_to_B(
-            [Fx, Fy, Fz, Mx, My, Mz], rotate_trans)
-        # transfered_wrench = compute_force_at_B([Fx, Fy, Fz, Mx, My, Mz], rotate_trans)
-        # transfered_wrench = [Fx, Fy, Fz, 0, 0, 0]
-        return transfered_wrench[0], transfered_wrench[1], transfered_wrench[2], transfered_wrench[3], transfered_wrench[4], transfered_wrench[5]
-
-    def get_FK_result(self):
-        return self.forward_kinematics(self.theta1, self.theta2, self.theta3, self.theta4, self.theta5, self.theta6)
-
-    def forward_kinematics(self, theta1, theta2, theta3, theta4, theta5, theta6):
-        """
-        Calculate the (x, y, z) position of the end effector given the short angles.
-
-        Parameters:
-        theta1, theta2, theta3 (float): Angles of the shorts in radians.
-
-        Returns:
-        tuple: (x, y, z) coordinates of the end effector if valid, None otherwise.
-        """
-
-        theta1 = theta1 + self.theta_offset
-        theta2 = theta2 + self.theta_offset
-        theta3 = theta3 + self.theta_offset
-
-        t = self.f - self.e
-
-        # Calculate position of leg 1's joint (x1 is implicitly zero - along the axis)
-        y1 = -(t + self.rf * math.cos(theta1))
-        z1 = -self.rf * math.sin(theta1)
-
-        # Calculate position of leg 2's joint
-        y2 = (t + self.rf * math.cos(theta2)) * math.sin(math.pi / 6)
-        x2 = y2 * math.tan(math.pi / 3)
-        z2 = -self.rf * math.sin(theta2)
-
-        # Calculate position of leg 3's joint
-        y3 = (t + self.rf * math.cos(theta3)) * math.sin(math.pi / 6)
-        x3 = -y3 * math.tan(math.pi / 3)
-        z3 = -self.rf * math.sin(theta3)
-
-        # Calculate the determinant of the matrix formed by the three positions
-        dnm = (y2 - y1) * x3 - (y3 - y1) * x2
-
-        # Intermediate calculations for determining the position of the end effector
-        w1 = y1 ** 2 + z1 ** 2
-        w2 = x2 ** 2 + y2 ** 2 + z2 ** 2
-        w3 = x3 ** 2 + y3 ** 2 + z3 ** 2
-
-        a1 = (z2 - z1) * (y3 - y1) - (z3 - z1) * (y2 - y1)
-        b1 = -((w2 - w1) * (y3 - y1) - (w3 - w1) * (y2 - y1)) / 2.0
-
-        a2 = -(z2 - z1) * x3 + (z3 - z1) * x2
-        b2 = ((w2 - w1) * x3 - (w3 - w1) * x2) / 2.0
-
-        # Coefficients for the quadratic equation az^2 + bz + c = 0
-        a = a1 ** 2 + a2 ** 2 + dnm ** 2
-        b = 2 * (a1 * b1 + a2 * (b2 - y1 * dnm) - z1 * dnm ** 2)
-        c = (b2 - y1 * dnm) ** 2 + b1 ** 2 + \
-            dnm ** 2 * (z1 ** 2 - self.re ** 2)
-
-        # Calculate discriminant
-        discriminant = b ** 2 - 4.0 * a * c
-        if discriminant < 0:
-            return None  # No valid solution
-
-        # Calculate z0, x0, and y0 (coordinates of the end effector)
-        z0 = (-0.5 * (b + math.sqrt(discriminant)) / a)
-        x0 = (a1 * z0 + b1) / dnm
-        y0 = (a2 * z0 + b2) / dnm
-
-        # shift to defination
-        x = -y0 / 1000.0
-        y = x0 / 1000.0
-        z = -(z0 - self.z_offset) / 1000.0
-
-        # Convert extrinsic rotation angles to intrinsic roll, pitch, yaw
-        ZXY = [theta6, theta4, theta5]
-        r = tfm.Rotation.from_euler('ZXY', ZXY, degrees=False)
-        roll, pitch, yaw = map(float, r.as_euler('XYZ', degrees=False))
-        # roll, pitch, yaw = theta4, theta5, theta6
-        return x, y, z, roll, pitch, yaw
-
-    def _calculate_angle_yz(self, x0, y0, z0):
-        """
-        Helper function to calculate the angle for a given (x, y, z) position.
-
-        Parameters:
-        x0, y0, z0 (float): Coordinates of the end effector.
-
-        Returns:
-        float: Angle in radians if valid, None otherwise.
-        """
-        y1 = -self.f
-        y0 -= self.e
-
-        a = (x0 ** 2 + y0 ** 2 + z0 ** 2 + self.rf **
-             2 - self.re ** 2 - y1 ** 2) / (2 * z0)
-        b = (y1 - y0) / z0
-        discriminant = -(a + b * y1) ** 2 + self.rf * \
-            (b ** 2 * self.rf + self.rf)
-
-        if discriminant < 0:
-            return None
-
-        yj = (y1 - a * b - math.sqrt(discriminant)) / (b ** 2 + 1)
-        zj = a + b * yj
-
-        # Calculate theta in radians
-        theta = math.atan(-zj / (y1 - yj))
-        if yj > y1:
-            theta += math.pi
-
-        return theta
-
-    def inverse_kinematics(self, x, y, z, roll, pitch, yaw):
-        """
-        Calculate the short angles for a given (x, y, z) position of the end effector in m.
-
-        Parameters:
-        x0, y0, z0 (float): Coordinates of the end effector.
-
-        Returns:
-        tuple: Angles (theta1, theta2, theta3) in radians if valid, None otherwise.
-        """
-        cos120 = math.cos(2.0 * math.pi / 3.0)
-        sin120 = math.sin(2.0 * math.pi / 3.0)
-
-        x0 = y * 1000.0
-        y0 = -x * 1000.0
-        z0 = -z * 1000 + self.z_offset
-
-        # Calculate the three short angles
-        theta1 = self._calculate_angle_yz(x0, y0, z0)
-        if theta1 is None:
-            return None
-
-        theta2 = self._calculate_angle_yz(
-            x0 * cos120 + y0 * sin120, y0 * cos120 - x0 * sin120, z0)  # Rotate +120 degrees
-        if theta2 is None:
-            return None
-
-        theta3 = self._calculate_angle_yz(
-            x0 * cos120 - y0 * sin120, y0 * cos120 + x0 * sin120, z0)  # Rotate -120 degrees
-        if theta3 is None:
-            return None
-
-        theta1 -= self.theta_offset
-        theta2 -= self.theta_offset
-        theta3 -= self.theta_offset
-
-        # Convert intrinsic roll, pitch, yaw to ZXY rotation angles
-        XYZ = [roll, pitch, yaw]
-        r = tfm.Rotation.from_euler('XYZ', XYZ, degrees=False)
-        theta6, theta4, theta5 = map(float, r.as_euler('ZXY', degrees=False))
-        # theta4, theta5, theta6 = roll, pitch, yaw
-        return theta1, theta2, theta3, theta4, theta5, theta6
-
-    def calculate_force_xyz(self, torque1, torque2, torque3):
-
-        theta1 = torque1/self.spring_coef + self.theta_offset
-        theta2 = torque2/self.spring_coef + self.theta_offset
-        theta3 = torque3/self.spring_coef + self.theta_offset
-
-        a = self.f/1000  # mm to m
-        b = self.e/1000
-        la = self.rf/1000
-        lb = self.re/1000
-
-        cos120 = -0.5
-        sin120 = math.sqrt(3)/2
-
-        cos240 = -0.5
-        sin240 = -math.sqrt(3)/2
-
-        sin_theta1 = math.sin(theta1)
-        cos_theta1 = math.cos(theta1)
-        sin_theta2 = math.sin(theta2)
-        cos_theta2 = math.cos(theta2)
-        sin_theta3 = math.sin(theta3)
-        cos_theta3 = math.cos(theta3)
-        # a. find px py pz
-        px, py, pz, _, _, _ = self.forward_kinematics(
-            torque1/self.spring_coef, torque2/self.spring_coef, torque3/self.spring_coef, 0, 0, 0)
-
-        pz = pz - self.z_offset/1000
-        # b.calculate unit vector of AiPi for each branch refer to main
-        k = b-a
-        m2 = cos120*(b-a)
-        n2 = sin120*(b-a)
-        m3 = cos240*(b-a)
-        n3 = sin240*(b-a)
-
-        A_1P_1 = np.array([px-cos_theta1*la+k, py, pz-la*sin_theta1])
-        A_2P_2 = np.array([px-cos120*cos_theta2*la + m2,
-                           py-sin120*cos_theta2*la + n2,
-                           pz-la*sin_theta2])
-        A_3P_3 = np.array([px-cos240*cos_theta3*la + m3,
-                           py-sin240*cos_theta3*la + n3,
-                           pz-la*sin_theta3])
-
-        A_1P_1_unit = A_1P_1 / lb
-        A_2P_2_unit = A_2P_2 / lb
-        A_3P_3_unit = A_3P_3 / lb
-
-        # c. find rotation matrix
-        rot_neg_120 = tfm.Rotation.from_euler('Z', -120, degrees=True)
-        mat_neg_120_3d = rot_neg_120.as_matrix()  # 3x3 matrix
-
-        rot_neg_240 = tfm.Rotation.from_euler('Z', -240, degrees=True)
-        mat_neg_240_3d = rot_neg_240.as_matrix()  # 3x3 matrix
-
-        # d.convert unit vector of AiPi from each branch to branch coordinates
-        A_1P_1_unit_O1 = A_1P_1_unit
-        A_2P_2_unit_O2 = mat_neg_120_3d @ A_2P_2_unit
-        A_3P_3_unit_O3 = mat_neg_240_3d @ A_3P_3_unit
-
-        # e. calculate force magnitudes Fa1 Fa2 Fa3
-
-        Fa1_mag = torque1 / \
-            (sin_theta1*la*A_1P_1_unit_O1[0] - cos_theta1*la*A_1P_1_unit_O1[2])
-        Fa2_mag = torque2 / \
-            (sin_theta2*la*A_2P_2_unit_O2[0] - cos_theta2*la*A_2P_2_unit_O2[2])
-        Fa3_mag = torque3 / \
-            (sin_theta3*la*A_3P_3_unit_O3[0] - cos_theta3*la*A_3P_3_unit_O3[2])
-
-        # f. calculate force on each branch refer to main coordinates
-        Fa1 = Fa1_mag * A_1P_1_unit
-        Fa2 = Fa2_mag * A_2P_2_unit
-        Fa3 = Fa3_mag * A_3P_3_unit
-
-        F = Fa1 + Fa2 + Fa3
-        Fx = -F[0]
-        Fy = -F[1]
-        Fz = -F[2]
-
-        return Fx, Fy, Fz
-
-    def calculate_torques(self, Fx_target, Fy_target, Fz_target, Mx_target, My_target, Mz_target):
-
-        def residuals(torques):
-            t1, t2, t3, t4, t5, t6 = torques
-            Fx, Fy, Fz, Mx, My, Mz = self.calculate_end_force(
-                t1, t2, t3, t4, t5, t6)
-
-            return [
-                Fx - Fx_target,
-                Fy - Fy_target,
-                Fz - Fz_target,
-                Mx - Mx_target,
-                My - My_target,
-                Mz - Mz_target
-            ]
-
-        initial_guess = [0.0, 0.0, 0.0, 0.0, 0.0, 0.0]
-
-        solution = fsolve(residuals, initial_guess, xtol=1e-7)
-        return solution
-
-    def calculate_euler_pose(self, Fx, Fy, Fz, Mx, My, Mz):
-        torque1, torque2, torque3, torque4, torque5, torque6 = self.calculate_torques(
-            Fx, Fy, Fz, Mx, My, Mz)
-
-        theta1 = torque1/self.spring_coef
-        theta2 = torque2/self.spring_coef
-        theta3 = torque3/self.spring_coef
-
-        if self.version == "double-springs-roll-pitch":
-            theta4 = torque4/(2*self.spring_coef)
-            theta5 = torque5/(2*self.spring_coef)
-            theta6 = torque6/(2*self.spring_coef)
-        else:
-            theta4 = torque4/self.spring_coef
-            theta5 = torque5/self.spring_coef
-            theta6 = torque6/self.spring_coef
-
-        thetas = np.array([theta1, theta2, theta3, theta4,
-                          theta5, theta6], dtype=float)
-        thetas = np.round(thetas, 5)
-
-        return self.forward_kinematics(*thetas)
-
-
-def represent_wrench_to_B(wrench_a, transform_6d):
-
-    T_AB = position_to_trans_matrix(transform_6d)
-    R_AB = T_AB[:3, :3]
-    t_AB = T_AB[:3, 3]
-
-    f_a = np.array(wrench_a[:3])
-    tau_a = np.array(wrench_a[3:])
-
-    cross_term = np.cross(t_AB, tau_a)
-
-    f_b = R_AB.T @ f_a - R_AB.T @ cross_term
-    tau_b = R_AB.T @ tau_a
-
-    wrench_b = np.concatenate([f_b, tau_b])
-    return wrench_b
-
-
-def position_to_trans_matrix(transform):
-    """
-    Converts position [x, y, z] and Euler angles [roll, pitch, yaw] (in radians)
-    into a 4x4 homogeneous transformation matrix T_AB.
-
-    Here, 'transform' describes the pose of frame B relative to frame A.
-    i.e., T_AB transforms coordinates from A to B.
-
-    :param transform: [x, y, z, roll, pitch, yaw]
-    :return: a 4x4 numpy array, T_AB
-    """
-    if len(transform) != 6:
-        raise ValueError(
-            "Transform must have 6 elements: [x, y, z, roll, pitch, yaw].")
-
-    x, y, z, roll, pitch, yaw = transform
-
-    # Rotation from Euler angles (in radians, 'XYZ' convention)
-    rot = R.from_euler('XYZ', [roll, pitch, yaw], degrees=False)
-    R_mat = rot.as_matrix()  # 3x3
-
-    # Build the 4x4 homogeneous transform
-    T_AB = np.eye(4)
-    T_AB[0:3, 0:3] = R_mat
-    T_AB[0:3, 3] = [x, y, z]
-
-    return T_AB
-
-
-# ---------------------------------------------------------------
-# Main – quick round-trip test for FK ⇄ IK
-# ---------------------------------------------------------------
-if __name__ == "__main__":
-    import numpy as np
-
-    def pretty_print_pose(label, pose):
-        """Pose: (x, y, z, roll, pitch, yaw)"""
-        if pose is None:
-            print(f"{label:<14}:  None / IK failed")
-            return
-        x, y, z, r, p, yaw = pose
-        print(f"{label:<14}:  "
-              f"x={x: .4f}  y={y: .4f}  z={z: .4f}  "
-              f"r={r: .4f}  p={p: .4f}  y={yaw: .4f}")
-
-    def pretty_print_wrench(label, wrench):
-        """Wrench: (Fx, Fy, Fz, Tx, Ty, Tz)"""
-        Fx, Fy, Fz, Tx, Ty, Tz = wrench
-        print(f"{label:<14}:  "
-              f"Fx={Fx: .4f}  Fy={Fy: .4f}  Fz={Fz: .4f}  "
-              f"Tx={Tx: .4f}  Ty={Ty: .4f}  Tz={Tz: .4f}")
-
-    # 1) Instantiate the robot
-    robot = DeltaRobot()
-
-    # 2) Choose a target pose (units: metres, radians)
-    x_target, y_target, z_target = 0.005, -0.016, 0.155   # 5 mm, –6 mm, –150 mm
-    roll_target = 0.03                                     # rad
-    pitch_target = -0.01                                    # rad
-    yaw_target = 0.04                                     # rad
-
-    print("Target end-effector pose:")
-    print(f"  xyz  = ({x_target:.4f}, {y_target:.4f}, {z_target:.4f})  [m]")
-    print(
-        f"  rpy  = ({roll_target:.4f}, {pitch_target:.4f}, {yaw_target:.4f})  [rad]")
-
-    # 3) Inverse kinematics
-    joint_angles = robot.inverse_kinematics(
-        x_target, y_target, z_target, roll_target, pitch_target, yaw_target
-    )
-    if joint_angles is None:
-        print("\n❌  Inverse kinematics failed - pose out of workspace.")
-        raise SystemExit(1)
-
-    # 4) Update robot state and run forward kinematics
-    robot.update(*joint_angles)
-    fk_pose = robot.get_FK_result()          # (x, y, z, roll, pitch, yaw)
-    end_force = robot.get_end_force()
-
-    # 5) Compare results
-    fk = np.array(fk_pose)
-    tgt = np.array([x_target, y_target, z_target,
-                   roll_target, pitch_target, yaw_target])
-    diff = fk - tgt
-
-    print("\nJoint angles (rad):")
-    print("  " + ", ".join(f"{a:.6f}" for a in joint_angles))
-
-    print("\nPose returned by forward kinematics:")
-    print(
-        f"  xyz  = ({fk_pose[0]:.4f}, {fk_pose[1]:.4f}, {fk_pose[2]:.4f})  [m]")
-    print(
-        f"  rpy  = ({fk_pose[3]:.4f}, {fk_pose[4]:.4f}, {fk_pose[5]:.4f})  [rad]")
-
-    print("\nResidual error  (FK – target):")
-    print(f"  Δxyz = {diff[:3]}")
-    print(f"  Δrpy = {diff[3:]}")
-
-    pretty_print_wrench("\nEnd-effector force", end_force)
-
-    # ---------------------------------------------------------------
-    trans1 = [0, 0, 0.15, 0.3, 0,   0]
-    trans2 = [0, 0, 0.15, 0.3, 0.2,   0]
-
-    print("\n===== Pose 1 =================================================")
-    enc1 = robot.inverse_kinematics(*trans1)
-    print("Inverse kinematics  :", enc1)
-    if enc1:
-        robot.update(*enc1)
-        pretty_print_pose("Forward kinematics", robot.get_FK_result())
-        pretty_print_wrench("End-effector force", robot.get_end_force())
-
-    print("\n===== Pose 2 =================================================")
-    enc2 = robot.inverse_kinematics(*trans2)
-    print("Inverse kinematics  :", enc2)
-    if enc2:
-        robot.update(*enc2)
-        pretty_print_pose("Forward kinematics", robot.get_FK_result())
-        pretty_print_wrench("End-effector force", robot.get_end_force())
+"""
+Using the method from code:
+https://github.com/mhp/delta-bot/blob/main/kinematics.py
+"""
+
+import math
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+from scipy.optimize import fsolve
+import numpy as np
+from delta6_kinematics.jit_backend import select_backend
+from delta6_kinematics.wrench_solver import WrenchSolver
+from delta6_utils.math_tools import counts_to_radians
+from delta6_utils.rotation_tools import (
+    ROT_Z_NEG_120, ROT_Z_NEG_240, euler_xyz_to_matrix, xyz_to_zxy, zxy_to_xyz)
+
+# Branch layout around the base: branch i sits at 0, 120 and 240 degrees
+_BRANCH_COS = np.array([1.0, -0.5, -0.5])
+_BRANCH_SIN = np.array([0.0, math.sqrt(3)/2, -math.sqrt(3)/2])
+
+# Rotations from the main frame into each branch frame
+_MAIN_TO_BRANCH = np.stack([np.eye(3), ROT_Z_NEG_120, ROT_Z_NEG_240])
+
+
+class Delta6State(NamedTuple):
+    """
+    Snapshot of the Delta6 state for one set of joint angles.
+
+    thetas: joint angles (theta1 ... theta6) in radians
+    pose: (x, y, z, roll, pitch, yaw) in m and rad, None outside the workspace
+    branch_units: (3, 3) unit vectors of AiPi, one row per branch
+    branch_forces: (3,) force magnitudes along each branch
+    wrench: (Fx, Fy, Fz, Mx, My, Mz) in the tool frame
+    """
+    thetas: tuple
+    pose: Optional[tuple]
+    branch_units: Optional[np.ndarray]
+    branch_forces: Optional[np.ndarray]
+    wrench: Optional[tuple]
+
+
+# Class representing a Delta Robot
+
+
+class DeltaRobot:
+    def __init__(self, short_arm_length=40.0, parallel_arm_length=120.0, base_radius=72.0, end_effector_radius=21.24, theta_offset=math.pi / 6, spring_coef=0.639236, version="original"):
+        """
+        Initialize the Delta Robot with given dimensions.
+
+        Parameters:
+        short_arm_length (float): Length of the short arms (rf)
+        parallel_arm_length (float): Length of the parallel arms (re)
+        base_radius (float): Radius of the base (f)
+        end_effector_radius (float): Radius of the end effector (e)
+        """
+        # in mm
+        self.e = end_effector_radius
+        self.f = base_radius
+        self.re = parallel_arm_length
+        self.rf = short_arm_length
+
+        self.z_offset_upper = 33  # mm
+        self.z_offset_lower = 30  # mm
+        self.z_offset = self.z_offset_upper + self.z_offset_lower  # mm
+
+        self.theta_offset = theta_offset  # radian
+
+        self.version = version
+
+        self.theta1 = 0
+        self.theta2 = 0
+        self.theta3 = 0
+        self.theta4 = 0
+        self.theta5 = 0
+        self.theta6 = 0
+
+        self.torque1 = 0
+        self.torque2 = 0
+        self.torque3 = 0
+        self.torque4 = 0
+        self.torque5 = 0
+        self.torque6 = 0
+
+        self.spring_coef = spring_coef
+
+        # Cached result of compute_state() and the joint state it belongs to
+        self._state = None
+        self._state_key = None
+
+        # Opt-in LRU cache of states keyed on raw encoder counts, see enable_cache()
+        self._state_cache = None
+        self._cache_maxsize = 0
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._cache_evictions = 0
+        self._counts = None
+        self._counts_key = None
+
+        # Newton solver used by calculate_torques / calculate_euler_pose
+        self.wrench_solver = WrenchSolver(self)
+        self.last_solver_report = None
+
+        # Scalar kernels of the optional JIT backend, see set_backend()
+        self._kernels = None
+        self.backend = "default"
+
+    def set_backend(self, name="auto"):
+        """
+        Select the implementation of the single-sample kinematics path.
+
+        "jit" routes forward_kinematics, inverse_kinematics, calculate_force_xyz
+        and the wrench transform through the scalar kernels in jit_backend,
+        compiled with Numba when it is installed. "auto" does so only if Numba
+        is available, and any compilation failure falls back to "default".
+
+        Parameters:
+        name (str): "default", "jit" or "auto"
+
+        Returns:
+        str: the backend actually in use, "default" or "jit"
+        """
+        self._kernels = select_backend(self, name)
+        self.backend = "default" if self._kernels is None else "jit"
+        self._state = None
+        return self.backend
+
+    def update(self, theta1, theta2, theta3, theta4, theta5, theta6):
+        self.update_angles(theta1, theta2, theta3, theta4, theta5, theta6)
+        self.update_torques(theta1, theta2, theta3, theta4, theta5, theta6)
+
+    def update_from_counts(self, counts):
+        """
+        Update the joint state from six raw encoder counts (encoder direction applied).
+
+        The counts are converted exactly as SensorInterface.read_radians does. When the
+        cache is enabled, compute_state() reuses the state of an earlier identical reading.
+
+        Parameters:
+        counts (sequence of int): signed encoder counts, e.g. ReadEncoderLoop.get_encoder_counts()
+        """
+        counts = tuple(int(c) for c in counts)
+        self.update(*[counts_to_radians(c) for c in counts])
+        self._counts = counts
+        self._counts_key = self._joint_state_key()
+
+    def enable_cache(self, maxsize=256):
+        """
+        Enable the LRU cache of compute_state() results for update_from_counts().
+
+        Parameters:
+        maxsize (int): maximum number of cached states
+        """
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive.")
+        self._cache_maxsize = maxsize
+        if self._state_cache is None:
+            self._state_cache = OrderedDict()
+        while len(self._state_cache) > maxsize:
+            self._state_cache.popitem(last=False)
+            self._cache_evictions += 1
+
+    def disable_cache(self):
+        """
+        Disable and clear the state cache.
+        """
+        self._state_cache = None
+        self._cache_maxsize = 0
+
+    def cache_info(self):
+        """
+        Cache statistics.
+
+        Returns:
+        dict: hits, misses, evictions, size and maxsize
+        """
+        return {
+            "hits": self._cache_hits,
+            "misses": self._cache_misses,
+            "evictions": self._cache_evictions,
+            "size": 0 if self._state_cache is None else len(self._state_cache),
+            "maxsize": self._cache_maxsize,
+        }
+
+    def _joint_state_key(self):
+        return (self.theta1, self.theta2, self.theta3, self.theta4, self.theta5, self.theta6,
+                self.torque1, self.torque2, self.torque3, self.torque4, self.torque5, self.torque6)
+
+    def _model_key(self):
+        """
+        Geometry and spring parameters that a cached state depends on.
+        """
+        return (self.e, self.f, self.re, self.rf, self.z_offset,
+                self.theta_offset, self.spring_coef, self.version)
+
+    def _model_params(self):
+        """
+        Numeric part of _model_key() as a float array, stored with precomputed tables
+        (workspace index, wrench surrogate) to check them against the robot on load.
+        """
+        return np.array(self._model_key()[:-1], dtype=float)
+
+    def update_angles(self, theta1, theta2, theta3, theta4, theta5, theta6):
+        self.theta1 = theta1
+        self.theta2 = theta2
+        self.theta3 = theta3
+        self.theta4 = theta4
+        self.theta5 = theta5
+        self.theta6 = theta6
+
+    def update_torques(self, theta1, theta2, theta3, theta4, theta5, theta6):
+        self.torque1 = theta1 * self.spring_coef
+        self.torque2 = theta2 * self.spring_coef
+        self.torque3 = theta3 * self.spring_coef
+        self.torque6 = theta6 * self.spring_coef
+        if self.version == "double-springs-roll-pitch":
+            self.torque4 = 2 * theta4 * self.spring_coef
+            self.torque5 = 2 * theta5 * self.spring_coef
+        else:
+            self.torque4 = theta4 * self.spring_coef
+            self.torque5 = theta5 * self.spring_coef
+
+    def get_end_force(self):
+        """
+        Wrench (Fx, Fy, Fz, Mx, My, Mz) in the tool frame for the current joint state.
+
+        Returns:
+        tuple: the wrench, or None when the angles are outside the workspace
+        (earlier versions returned an array in that case)
+        """
+        return self.compute_state().wrench
+
+    def compute_state(self):
+        """
+        Evaluate pose, branch geometry and wrench for the current joint state in one kinematics pass.
+
+        The result is cached and reused until the angles or torques change,
+        so get_FK_result() and get_end_force() on the same sample share it.
+
+        Returns:
+        Delta6State: snapshot of the current state. pose and wrench are None
+        when the angles are outside the workspace.
+        """
+        key = self._joint_state_key()
+        if self._state is not None and self._state_key == key:
+            return self._state
+
+        # Repeated raw readings are served from the LRU cache
+        cache_key = None
+        if self._state_cache is not None and self._counts_key == key:
+            cache_key = (self._counts, self._model_key())
+            state = self._state_cache.get(cache_key)
+            if state is not None:
+                self._state_cache.move_to_end(cache_key)
+                self._cache_hits += 1
+                self._state = state
+                self._state_key = key
+                return state
+            self._cache_misses += 1
+
+        pose = self.forward_kinematics(
+            self.theta1, self.theta2, self.theta3, self.theta4, self.theta5, self.theta6)
+        if pose is None:
+            state = Delta6State(key[:6], None, None, None, None)
+        else:
+            # The force chain only needs the position, which FK already gave us
+            units, magnitudes, (Fx, Fy, Fz) = self._branch_forces(
+                self.torque1, self.torque2, self.torque3, pose[:3])
+            main_wrench = [Fx, Fy, Fz, self.torque4, self.torque5, self.torque6]
+            if self._kernels is not None:
+                wrench = self._kernels.wrench_to_tool(main_wrench, pose)
+            else:
+                rotate_trans = [0, 0, 0, pose[3], pose[4], pose[5]]
+                wrench = represent_wrench_to_B(main_wrench, rotate_trans)
+            state = Delta6State(key[:6], pose, np.array(units),
+                                np.array(magnitudes), tuple(wrench))
+
+        if cache_key is not None:
+            self._state_cache[cache_key] = state
+            if len(self._state_cache) > self._cache_maxsize:
+                self._state_cache.popitem(last=False)
+                self._cache_evictions += 1
+
+        self._state = state
+        self._state_key = key
+        return state
+
+    def calculate_end_force(self, torque1, torque2, torque3, torque4, torque5, torque6):
+        Fx, Fy, Fz = self.calculate_force_xyz(
+            torque1, torque2, torque3)
+        Mx, My, Mz = torque4, torque5, torque6
+
+        pose_trans = self.get_FK_result()
+        rotate_trans = [0, 0, 0, pose_trans[3], pose_trans[4], pose_trans[5]]
+        transfered_wrench = represent_wrench_to_B(
+            [Fx, Fy, Fz, Mx, My, Mz], rotate_trans)
+        # transfered_wrench = compute_force_at_B([Fx, Fy, Fz, Mx, My, Mz], rotate_trans)
+        # transfered_wrench = [Fx, Fy, Fz, 0, 0, 0]
+        return transfered_wrench[0], transfered_wrench[1], transfered_wrench[2], transfered_wrench[3], transfered_wrench[4], transfered_wrench[5]
+
+    def end_force_batch(self, thetas):
+        """
+        Vectorized get_end_force for N sets of joint angles.
+
+        Parameters:
+        thetas (array_like): (N, 6) array of joint angles in radians.
+
+        Returns:
+        np.ndarray: (N, 6) array of (Fx, Fy, Fz, Mx, My, Mz) in the tool frame. Rows without a valid FK solution are NaN.
+        """
+        thetas = np.asarray(thetas, dtype=float)
+        if thetas.ndim != 2 or thetas.shape[1] != 6:
+            raise ValueError("thetas must have shape (N, 6).")
+
+        wrenches = np.full(thetas.shape, np.nan)
+        if len(thetas) == 0:
+            return wrenches
+
+        torques = self._torques_batch(thetas)
+        poses = self.forward_kinematics_batch(thetas)
+
+        _, _, force = self._branch_forces_batch(
+            thetas[:, :3], torques[:, :3], poses[:, :3])
+
+        # Rotate force and moment into the tool frame (no translation)
+        valid = ~np.isnan(poses[:, 0])
+        if np.any(valid):
+            R_AB = euler_xyz_to_matrix(
+                poses[valid, 3], poses[valid, 4], poses[valid, 5])
+            wrenches[valid, :3] = np.einsum(
+                'nji,nj->ni', R_AB, force[valid])
+            wrenches[valid, 3:] = np.einsum(
+                'nji,nj->ni', R_AB, torques[valid, 3:])
+        return wrenches
+
+    def _torques_batch(self, thetas):
+        """
+        Vectorized update_torques: spring torques for (N, 6) joint angles.
+        """
+        torques = thetas * self.spring_coef
+        if self.version == "double-springs-roll-pitch":
+            torques[:, 3:5] *= 2
+        return torques
+
+    def _branch_forces_batch(self, thetas, torques, positions):
+        """
+        Vectorized core of calculate_force_xyz.
+
+        Parameters:
+        thetas (np.ndarray): (N, 3) short-arm angles in radians, without theta_offset.
+        torques (np.ndarray): (N, 3) spring torques of the short arms.
+        positions (np.ndarray): (N, 3) end-effector positions from forward kinematics in m.
+
+        Returns:
+        tuple: (units, magnitudes, force) where units is (N, 3, 3) with the unit vector
+        of AiPi per branch, magnitudes is (N, 3) and force is the (N, 3) end-effector force.
+        """
+        a = self.f/1000  # mm to m
+        b = self.e/1000
+        la = self.rf/1000
+        lb = self.re/1000
+
+        theta = thetas + self.theta_offset
+        sin_theta = np.sin(theta)
+        cos_theta = np.cos(theta)
+
+        px = positions[:, 0, None]
+        py = positions[:, 1, None]
+        pz = positions[:, 2, None] - self.z_offset/1000
+
+        # b. unit vector of AiPi for each branch, shape (N, branch, xyz)
+        k = b-a
+        A_P = np.stack([
+            px - _BRANCH_COS*cos_theta*la + _BRANCH_COS*k,
+            py - _BRANCH_SIN*cos_theta*la + _BRANCH_SIN*k,
+            pz - la*sin_theta,
+        ], axis=-1)
+        units = A_P / lb
+
+        # d. convert unit vectors to branch coordinates
+        units_local = np.einsum('bij,nbj->nbi', _MAIN_TO_BRANCH, units)
+
+        # e. force magnitudes Fa1 Fa2 Fa3
+        magnitudes = torques / \
+            (sin_theta*la*units_local[:, :, 0] - cos_theta*la*units_local[:, :, 2])
+
+        # f. sum of branch forces in main coordinates
+        force = -np.einsum('nb,nbi->ni', magnitudes, units)
+        return units, magnitudes, force
+
+    def end_force_jacobian(self, torque1, torque2, torque3, torque4, torque5, torque6):
+        """
+        Analytical Jacobian of calculate_end_force with respect to the six torques.
+
+        Like calculate_end_force, the rotation into the tool frame is taken from
+        the current joint state and does not depend on the torques.
+
+        Returns:
+        np.ndarray: (6, 6) matrix d(Fx, Fy, Fz, Mx, My, Mz) / d(torque1 ... torque6), NaN outside the workspace.
+        """
+        torques = np.array([[torque1, torque2, torque3]], dtype=float)
+        thetas = torques / self.spring_coef
+        positions = np.stack(self._fk_position_batch(
+            thetas[:, 0], thetas[:, 1], thetas[:, 2]), axis=-1)
+        _, jacobian = self._force_jacobian_batch(thetas, torques, positions)
+
+        pose = self.get_FK_result()
+        R_AB = euler_xyz_to_matrix(pose[3], pose[4], pose[5])
+
+        J = np.zeros((6, 6))
+        J[:3, :3] = R_AB.T @ jacobian[0]
+        J[3:, 3:] = R_AB.T
+        return J
+
+    def _force_jacobian_batch(self, thetas, torques, positions):
+        """
+        Vectorized Jacobian of calculate_force_xyz with respect to torque1 ... torque3.
+
+        The end-effector position follows from the closure constraints |P - J_i| = lb,
+        where J_i is the elbow of branch i, so dP/dtheta comes from implicit
+        differentiation and needs no extra FK evaluations.
+
+        Parameters:
+        thetas, torques, positions (np.ndarray): as for _branch_forces_batch, shape (N, 3).
+
+        Returns:
+        tuple: (force, jacobian) with the (N, 3) end-effector force and the (N, 3, 3)
+        matrix dF/dtorque, indexed [n, force axis, torque].
+        """
+        units, magnitudes, force = self._branch_forces_batch(
+            thetas, torques, positions)
+
+        la = self.rf/1000
+        lb = self.re/1000
+        eye = np.eye(3)
+
+        theta = thetas + self.theta_offset
+        sin_theta = np.sin(theta)
+        cos_theta = np.cos(theta)
+
+        # First and second derivative of each elbow position J_i(theta_i), shape (N, branch, xyz)
+        dJ = np.stack([-_BRANCH_COS*la*sin_theta,
+                       -_BRANCH_SIN*la*sin_theta,
+                       la*cos_theta], axis=-1)
+        ddJ = np.stack([-_BRANCH_COS*la*cos_theta,
+                        -_BRANCH_SIN*la*cos_theta,
+                        -la*sin_theta], axis=-1)
+
+        # Denominator of the force magnitudes, d_i = -u_i . J_i'
+        d = -np.einsum('nbi,nbi->nb', units, dJ)
+
+        # dP/dtheta_j from u_i . (dP - J_i' dtheta_i) = 0, indexed [n, xyz, j]
+        dP = np.linalg.solve(units, -d[:, :, None] * eye)
+
+        # du_i/dtheta_j, indexed [n, i, xyz, j]
+        du = (dP[:, None, :, :] - eye[None, :, None, :] * dJ[:, :, :, None]) / lb
+
+        # dd_i/dtheta_j
+        dd = -np.einsum('nixj,nix->nij', du, dJ) \
+            - eye * np.einsum('nix,nix->ni', units, ddJ)[:, :, None]
+
+        # theta_i = torque_i / spring_coef, magnitudes m_i = torque_i / d_i
+        k = self.spring_coef
+        dm = eye / d[:, :, None] \
+            - (torques / d ** 2)[:, :, None] * dd / k
+
+        # F = -sum_i m_i u_i
+        jacobian = -(np.einsum('nij,nix->nxj', dm, units)
+                     + np.einsum('ni,nixj->nxj', magnitudes, du) / k)
+        return force, jacobian
+
+    def get_FK_result(self):
+        """
+        Returns:
+        tuple: (x, y, z, roll, pitch, yaw) for the current joint state, or None when
+        the angles are outside the workspace
+        """
+        return self.compute_state().pose
+
+    def forward_kinematics(self, theta1, theta2, theta3, theta4, theta5, theta6):
+        """
+        Calculate the (x, y, z) position of the end effector given the short angles.
+
+        Parameters:
+        theta1, theta2, theta3 (float): Angles of the shorts in radians.
+
+        Returns:
+        tuple: (x, y, z) coordinates of the end effector if valid, None otherwise.
+        """
+        if self._kernels is not None:
+            return self._kernels.forward_kinematics(theta1, theta2, theta3, theta4, theta5, theta6)
+
+        theta1 = theta1 + self.theta_offset
+        theta2 = theta2 + self.theta_offset
+        theta3 = theta3 + self.theta_offset
+
+        t = self.f - self.e
+
+        # Calculate position of leg 1's joint (x1 is implicitly zero - along the axis)
+        y1 = -(t + self.rf * math.cos(theta1))
+        z1 = -self.rf * math.sin(theta1)
+
+        # Calculate position of leg 2's joint
+        y2 = (t + self.rf * math.cos(theta2)) * math.sin(math.pi / 6)
+        x2 = y2 * math.tan(math.pi / 3)
+        z2 = -self.rf * math.sin(theta2)
+
+        # Calculate position of leg 3's joint
+        y3 = (t + self.rf * math.cos(theta3)) * math.sin(math.pi / 6)
+        x3 = -y3 * math.tan(math.pi / 3)
+        z3 = -self.rf * math.sin(theta3)
+
+        # Calculate the determinant of the matrix formed by the three positions
+        dnm = (y2 - y1) * x3 - (y3 - y1) * x2
+
+        # Intermediate calculations for determining the position of the end effector
+        w1 = y1 ** 2 + z1 ** 2
+        w2 = x2 ** 2 + y2 ** 2 + z2 ** 2
+        w3 = x3 ** 2 + y3 ** 2 + z3 ** 2
+
+        a1 = (z2 - z1) * (y3 - y1) - (z3 - z1) * (y2 - y1)
+        b1 = -((w2 - w1) * (y3 - y1) - (w3 - w1) * (y2 - y1)) / 2.0
+
+        a2 = -(z2 - z1) * x3 + (z3 - z1) * x2
+        b2 = ((w2 - w1) * x3 - (w3 - w1) * x2) / 2.0
+
+        # Coefficients for the quadratic equation az^2 + bz + c = 0
+        a = a1 ** 2 + a2 ** 2 + dnm ** 2
+        b = 2 * (a1 * b1 + a2 * (b2 - y1 * dnm) - z1 * dnm ** 2)
+        c = (b2 - y1 * dnm) ** 2 + b1 ** 2 + \
+            dnm ** 2 * (z1 ** 2 - self.re ** 2)
+
+        # Calculate discriminant
+        discriminant = b ** 2 - 4.0 * a * c
+        if discriminant < 0:
+            return None  # No valid solution
+
+        # Calculate z0, x0, and y0 (coordinates of the end effector)
+        z0 = (-0.5 * (b + math.sqrt(discriminant)) / a)
+        x0 = (a1 * z0 + b1) / dnm
+        y0 = (a2 * z0 + b2) / dnm
+
+        # shift to defination
+        x = -y0 / 1000.0
+        y = x0 / 1000.0
+        z = -(z0 - self.z_offset) / 1000.0
+
+        # Convert extrinsic rotation angles to intrinsic roll, pitch, yaw
+        roll, pitch, yaw = map(float, zxy_to_xyz(theta6, theta4, theta5))
+        # roll, pitch, yaw = theta4, theta5, theta6
+        return x, y, z, roll, pitch, yaw
+
+    def forward_kinematics_batch(self, thetas):
+        """
+        Vectorized forward kinematics for N sets of joint angles.
+
+        Parameters:
+        thetas (array_like): (N, 6) array of joint angles in radians.
+
+        Returns:
+        np.ndarray: (N, 6) array of (x, y, z, roll, pitch, yaw). Rows without a valid solution are NaN.
+        """
+        thetas = np.asarray(thetas, dtype=float)
+        if thetas.ndim != 2 or thetas.shape[1] != 6:
+            raise ValueError("thetas must have shape (N, 6).")
+
+        poses = np.full(thetas.shape, np.nan)
+        if len(thetas) == 0:
+            return poses
+
+        x, y, z = self._fk_position_batch(
+            thetas[:, 0], thetas[:, 1], thetas[:, 2])
+        valid = ~np.isnan(z)
+
+        # Convert extrinsic rotation angles to intrinsic roll, pitch, yaw
+        ZXY = thetas[valid][:, [5, 3, 4]]
+        poses[valid, 3:] = np.stack(zxy_to_xyz(*ZXY.T), axis=-1)
+
+        poses[valid, 0] = x[valid]
+        poses[valid, 1] = y[valid]
+        poses[valid, 2] = z[valid]
+        return poses
+
+    def _fk_position_batch(self, theta1, theta2, theta3):
+        """
+        Vectorized position part of forward_kinematics.
+
+        Parameters:
+        theta1, theta2, theta3 (np.ndarray): Angles of the shorts in radians, shape (N,).
+
+        Returns:
+        tuple: (x, y, z) arrays in m, NaN where there is no valid solution.
+        """
+        theta1 = theta1 + self.theta_offset
+        theta2 = theta2 + self.theta_offset
+        theta3 = theta3 + self.theta_offset
+
+        t = self.f - self.e
+
+        # Same sequence of operations as forward_kinematics, one lane per sample
+        y1 = -(t + self.rf * np.cos(theta1))
+        z1 = -self.rf * np.sin(theta1)
+
+        y2 = (t + self.rf * np.cos(theta2)) * math.sin(math.pi / 6)
+        x2 = y2 * math.tan(math.pi / 3)
+        z2 = -self.rf * np.sin(theta2)
+
+        y3 = (t + self.rf * np.cos(theta3)) * math.sin(math.pi / 6)
+        x3 = -y3 * math.tan(math.pi / 3)
+        z3 = -self.rf * np.sin(theta3)
+
+        dnm = (y2 - y1) * x3 - (y3 - y1) * x2
+
+        w1 = y1 ** 2 + z1 ** 2
+        w2 = x2 ** 2 + y2 ** 2 + z2 ** 2
+        w3 = x3 ** 2 + y3 ** 2 + z3 ** 2
+
+        a1 = (z2 - z1) * (y3 - y1) - (z3 - z1) * (y2 - y1)
+        b1 = -((w2 - w1) * (y3 - y1) - (w3 - w1) * (y2 - y1)) / 2.0
+
+        a2 = -(z2 - z1) * x3 + (z3 - z1) * x2
+        b2 = ((w2 - w1) * x3 - (w3 - w1) * x2) / 2.0
+
+        a = a1 ** 2 + a2 ** 2 + dnm ** 2
+        b = 2 * (a1 * b1 + a2 * (b2 - y1 * dnm) - z1 * dnm ** 2)
+        c = (b2 - y1 * dnm) ** 2 + b1 ** 2 + \
+            dnm ** 2 * (z1 ** 2 - self.re ** 2)
+
+        # Rows with a negative discriminant have no valid solution
+        discriminant = b ** 2 - 4.0 * a * c
+        discriminant = np.where(discriminant < 0, np.nan, discriminant)
+
+        z0 = (-0.5 * (b + np.sqrt(discriminant)) / a)
+        x0 = (a1 * z0 + b1) / dnm
+        y0 = (a2 * z0 + b2) / dnm
+
+        x = -y0 / 1000.0
+        y = x0 / 1000.0
+        z = -(z0 - self.z_offset) / 1000.0
+        return x, y, z
+
+    def _calculate_angle_yz(self, x0, y0, z0):
+        """
+        Helper function to calculate the angle for a given (x, y, z) position.
+
+        Parameters:
+        x0, y0, z0 (float): Coordinates of the end effector.
+
+        Returns:
+        float: Angle in radians if valid, None otherwise.
+        """
+        y1 = -self.f
+        y0 -= self.e
+
+        a = (x0 ** 2 + y0 ** 2 + z0 ** 2 + self.rf **
+             2 - self.re ** 2 - y1 ** 2) / (2 * z0)
+        b = (y1 - y0) / z0
+        discriminant = -(a + b * y1) ** 2 + self.rf * \
+            (b ** 2 * self.rf + self.rf)
+
+        if discriminant < 0:
+            return None
+
+        yj = (y1 - a * b - math.sqrt(discriminant)) / (b ** 2 + 1)
+        zj = a + b * yj
+
+        # Calculate theta in radians
+        theta = math.atan(-zj / (y1 - yj))
+        if yj > y1:
+            theta += math.pi
+
+        return theta
+
+    def inverse_kinematics(self, x, y, z, roll, pitch, yaw):
+        """
+        Calculate the short angles for a given (x, y, z) position of the end effector in m.
+
+        Parameters:
+        x0, y0, z0 (float): Coordinates of the end effector.
+
+        Returns:
+        tuple: Angles (theta1, theta2, theta3) in radians if valid, None otherwise.
+        """
+        if self._kernels is not None:
+            return self._kernels.inverse_kinematics(x, y, z, roll, pitch, yaw)
+
+        cos120 = math.cos(2.0 * math.pi / 3.0)
+        sin120 = math.sin(2.0 * math.pi / 3.0)
+
+        x0 = y * 1000.0
+        y0 = -x * 1000.0
+        z0 = -z * 1000 + self.z_offset
+
+        # Calculate the three short angles
+        theta1 = self._calculate_angle_yz(x0, y0, z0)
+        if theta1 is None:
+            return None
+
+        theta2 = self._calculate_angle_yz(
+            x0 * cos120 + y0 * sin120, y0 * cos120 - x0 * sin120, z0)  # Rotate +120 degrees
+        if theta2 is None:
+            return None
+
+        theta3 = self._calculate_angle_yz(
+            x0 * cos120 - y0 * sin120, y0 * cos120 + x0 * sin120, z0)  # Rotate -120 degrees
+        if theta3 is None:
+            return None
+
+        theta1 -= self.theta_offset
+        theta2 -= self.theta_offset
+        theta3 -= self.theta_offset
+
+        # Convert intrinsic roll, pitch, yaw to ZXY rotation angles
+        theta6, theta4, theta5 = map(float, xyz_to_zxy(roll, pitch, yaw))
+        # theta4, theta5, theta6 = roll, pitch, yaw
+        return theta1, theta2, theta3, theta4, theta5, theta6
+
+    def inverse_kinematics_batch(self, poses, chunk_size=None):
+        """
+        Vectorized inverse kinematics for N poses.
+
+        Parameters:
+        poses (array_like): (N, 6) array of (x, y, z, roll, pitch, yaw) in m and rad.
+        chunk_size (int): if given, evaluate at most chunk_size rows at a time to bound temporary memory.
+        Must be a positive integer.
+
+        Returns:
+        tuple: (thetas, valid) where thetas is the (N, 6) array of joint angles in radians
+        (NaN rows where the pose is unreachable) and valid is the (N,) boolean mask.
+        """
+        poses = np.asarray(poses, dtype=float)
+        if poses.ndim != 2 or poses.shape[1] != 6:
+            raise ValueError("poses must have shape (N, 6).")
+        if chunk_size is not None and (
+                isinstance(chunk_size, bool) or not isinstance(chunk_size, (int, np.integer)) or chunk_size <= 0):
+            raise ValueError(f"chunk_size must be a positive integer, got {chunk_size!r}.")
+
+        if chunk_size is None or chunk_size >= len(poses):
+            return self._inverse_kinematics_chunk(poses)
+
+        thetas = np.empty(poses.shape)
+        valid = np.empty(len(poses), dtype=bool)
+        for start in range(0, len(poses), chunk_size):
+            stop = start + chunk_size
+            thetas[start:stop], valid[start:stop] = self._inverse_kinematics_chunk(
+                poses[start:stop])
+        return thetas, valid
+
+    def inverse_kinematics_stream(self, pose_chunks):
+        """
+        Streaming inverse kinematics for trajectories too long to hold in memory.
+
+        Parameters:
+        pose_chunks (iterable): iterable of (n, 6) pose arrays, e.g. slices of a memory-mapped file.
+
+        Yields:
+        tuple: (thetas, valid) for each chunk, as returned by inverse_kinematics_batch.
+        """
+        for chunk in pose_chunks:
+            yield self.inverse_kinematics_batch(chunk)
+
+    def _inverse_kinematics_chunk(self, poses):
+        cos120 = math.cos(2.0 * math.pi / 3.0)
+        sin120 = math.sin(2.0 * math.pi / 3.0)
+
+        x0 = poses[:, 1] * 1000.0
+        y0 = -poses[:, 0] * 1000.0
+        z0 = -poses[:, 2] * 1000 + self.z_offset
+
+        thetas = np.empty(poses.shape)
+        thetas[:, 0] = self._calculate_angle_yz_batch(x0, y0, z0)
+        thetas[:, 1] = self._calculate_angle_yz_batch(
+            x0 * cos120 + y0 * sin120, y0 * cos120 - x0 * sin120, z0)  # Rotate +120 degrees
+        thetas[:, 2] = self._calculate_angle_yz_batch(
+            x0 * cos120 - y0 * sin120, y0 * cos120 + x0 * sin120, z0)  # Rotate -120 degrees
+        thetas[:, :3] -= self.theta_offset
+
+        theta6, theta4, theta5 = xyz_to_zxy(
+            poses[:, 3], poses[:, 4], poses[:, 5])
+        thetas[:, 3] = theta4
+        thetas[:, 4] = theta5
+        thetas[:, 5] = theta6
+
+        valid = np.isfinite(thetas).all(axis=1)
+        thetas[~valid] = np.nan
+        return thetas, valid
+
+    def _calculate_angle_yz_batch(self, x0, y0, z0):
+        """
+        Vectorized _calculate_angle_yz.
+
+        Returns:
+        np.ndarray: angles in radians, NaN where there is no valid solution.
+        """
+        y1 = -self.f
+        y0 = y0 - self.e
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            a = (x0 ** 2 + y0 ** 2 + z0 ** 2 + self.rf **
+                 2 - self.re ** 2 - y1 ** 2) / (2 * z0)
+            b = (y1 - y0) / z0
+            discriminant = -(a + b * y1) ** 2 + self.rf * \
+                (b ** 2 * self.rf + self.rf)
+            discriminant = np.where(discriminant < 0, np.nan, discriminant)
+
+            yj = (y1 - a * b - np.sqrt(discriminant)) / (b ** 2 + 1)
+            zj = a + b * yj
+
+            theta = np.arctan(-zj / (y1 - yj))
+        return np.where(yj > y1, theta + math.pi, theta)
+
+    def calculate_force_xyz(self, torque1, torque2, torque3, position=None):
+        _, _, force = self._branch_forces(torque1, torque2, torque3, position)
+        return force
+
+    def _branch_forces(self, torque1, torque2, torque3, position=None):
+        """
+        Branch geometry and force decomposition behind calculate_force_xyz.
+
+        Parameters:
+        torque1, torque2, torque3 (float): Spring torques of the short arms.
+        position (tuple): (x, y, z) from forward kinematics in m. Computed when None.
+
+        Returns:
+        tuple: (units, magnitudes, (Fx, Fy, Fz)) with the unit vector of AiPi
+        and the force magnitude of each branch.
+        """
+        if self._kernels is not None:
+            if position is None:
+                position = self.forward_kinematics(
+                    torque1/self.spring_coef, torque2/self.spring_coef, torque3/self.spring_coef, 0, 0, 0)
+            return self._kernels.branch_forces(torque1, torque2, torque3, position)
+
+        theta1 = torque1/self.spring_coef + self.theta_offset
+        theta2 = torque2/self.spring_coef + self.theta_offset
+        theta3 = torque3/self.spring_coef + self.theta_offset
+
+        a = self.f/1000  # mm to m
+        b = self.e/1000
+        la = self.rf/1000
+        lb = self.re/1000
+
+        cos120 = -0.5
+        sin120 = math.sqrt(3)/2
+
+        cos240 = -0.5
+        sin240 = -math.sqrt(3)/2
+
+        sin_theta1 = math.sin(theta1)
+        cos_theta1 = math.cos(theta1)
+        sin_theta2 = math.sin(theta2)
+        cos_theta2 = math.cos(theta2)
+        sin_theta3 = math.sin(theta3)
+        cos_theta3 = math.cos(theta3)
+        # a. find px py pz
+        if position is None:
+            position = self.forward_kinematics(
+                torque1/self.spring_coef, torque2/self.spring_coef, torque3/self.spring_coef, 0, 0, 0)
+        px, py, pz = position[0], position[1], position[2]
+
+        pz = pz - self.z_offset/1000
+        # b.calculate unit vector of AiPi for each branch refer to main
+        k = b-a
+        m2 = cos120*(b-a)
+        n2 = sin120*(b-a)
+        m3 = cos240*(b-a)
+        n3 = sin240*(b-a)
+
+        A_1P_1 = np.array([px-cos_theta1*la+k, py, pz-la*sin_theta1])
+        A_2P_2 = np.array([px-cos120*cos_theta2*la + m2,
+                           py-sin120*cos_theta2*la + n2,
+                           pz-la*sin_theta2])
+        A_3P_3 = np.array([px-cos240*cos_theta3*la + m3,
+                           py-sin240*cos_theta3*la + n3,
+                           pz-la*sin_theta3])
+
+        A_1P_1_unit = A_1P_1 / lb
+        A_2P_2_unit = A_2P_2 / lb
+        A_3P_3_unit = A_3P_3 / lb
+
+        # c. rotation matrices are the precomputed ROT_Z_NEG_120 / ROT_Z_NEG_240
+
+        # d.convert unit vector of AiPi from each branch to branch coordinates
+        A_1P_1_unit_O1 = A_1P_1_unit
+        A_2P_2_unit_O2 = ROT_Z_NEG_120 @ A_2P_2_unit
+        A_3P_3_unit_O3 = ROT_Z_NEG_240 @ A_3P_3_unit
+
+        # e. calculate force magnitudes Fa1 Fa2 Fa3
+
+        Fa1_mag = torque1 / \
+            (sin_theta1*la*A_1P_1_unit_O1[0] - cos_theta1*la*A_1P_1_unit_O1[2])
+        Fa2_mag = torque2 / \
+            (sin_theta2*la*A_2P_2_unit_O2[0] - cos_theta2*la*A_2P_2_unit_O2[2])
+        Fa3_mag = torque3 / \
+            (sin_theta3*la*A_3P_3_unit_O3[0] - cos_theta3*la*A_3P_3_unit_O3[2])
+
+        # f. calculate force on each branch refer to main coordinates
+        Fa1 = Fa1_mag * A_1P_1_unit
+        Fa2 = Fa2_mag * A_2P_2_unit
+        Fa3 = Fa3_mag * A_3P_3_unit
+
+        F = Fa1 + Fa2 + Fa3
+        Fx = -F[0]
+        Fy = -F[1]
+        Fz = -F[2]
+
+        units = (A_1P_1_unit, A_2P_2_unit, A_3P_3_unit)
+        magnitudes = (Fa1_mag, Fa2_mag, Fa3_mag)
+        return units, magnitudes, (Fx, Fy, Fz)
+
+    def calculate_torques(self, Fx_target, Fy_target, Fz_target, Mx_target, My_target, Mz_target):
+        """
+        Solve the six spring torques that produce the target end wrench.
+
+        Uses the analytical-Jacobian Newton solver, warm started from the previous
+        solution, and falls back to fsolve if it does not converge. The solver
+        report is kept in self.last_solver_report.
+
+        Raises ValueError if the current joint state is outside the workspace.
+        """
+        target = [Fx_target, Fy_target, Fz_target,
+                  Mx_target, My_target, Mz_target]
+        solution, self.last_solver_report = self.wrench_solver.solve(target)
+        if self.last_solver_report.converged:
+            return solution
+        if self.get_FK_result() is None:
+            # The tool-frame rotation is undefined, so fsolve cannot help either
+            raise ValueError("Current joint state is outside the workspace.")
+
+        def residuals(torques):
+            t1, t2, t3, t4, t5, t6 = torques
+            Fx, Fy, Fz, Mx, My, Mz = self.calculate_end_force(
+                t1, t2, t3, t4, t5, t6)
+
+            return [
+                Fx - Fx_target,
+                Fy - Fy_target,
+                Fz - Fz_target,
+                Mx - Mx_target,
+                My - My_target,
+                Mz - Mz_target
+            ]
+
+        initial_guess = [0.0, 0.0, 0.0, 0.0, 0.0, 0.0]
+
+        solution = fsolve(residuals, initial_guess, xtol=1e-7)
+        return solution
+
+    def calculate_euler_pose(self, Fx, Fy, Fz, Mx, My, Mz):
+        torque1, torque2, torque3, torque4, torque5, torque6 = self.calculate_torques(
+            Fx, Fy, Fz, Mx, My, Mz)
+
+        theta1 = torque1/self.spring_coef
+        theta2 = torque2/self.spring_coef
+        theta3 = torque3/self.spring_coef
+
+        if self.version == "double-springs-roll-pitch":
+            theta4 = torque4/(2*self.spring_coef)
+            theta5 = torque5/(2*self.spring_coef)
+            theta6 = torque6/(2*self.spring_coef)
+        else:
+            theta4 = torque4/self.spring_coef
+            theta5 = torque5/self.spring_coef
+            theta6 = torque6/self.spring_coef
+
+        thetas = np.array([theta1, theta2, theta3, theta4,
+                          theta5, theta6], dtype=float)
+        thetas = np.round(thetas, 5)
+
+        return self.forward_kinematics(*thetas)
+
+
+def represent_wrench_to_B(wrench_a, transform_6d):
+
+    T_AB = position_to_trans_matrix(transform_6d)
+    R_AB = T_AB[:3, :3]
+    t_AB = T_AB[:3, 3]
+
+    f_a = np.array(wrench_a[:3])
+    tau_a = np.array(wrench_a[3:])
+
+    cross_term = np.cross(t_AB, tau_a)
+
+    f_b = R_AB.T @ f_a - R_AB.T @ cross_term
+    tau_b = R_AB.T @ tau_a
+
+    wrench_b = np.concatenate([f_b, tau_b])
+    return wrench_b
+
+
+def position_to_trans_matrix(transform):
+    """
+    Converts position [x, y, z] and Euler angles [roll, pitch, yaw] (in radians)
+    into a 4x4 homogeneous transformation matrix T_AB.
+
+    Here, 'transform' describes the pose of frame B relative to frame A.
+    i.e., T_AB transforms coordinates from A to B.
+
+    :param transform: [x, y, z, roll, pitch, yaw]
+    :return: a 4x4 numpy array, T_AB
+    """
+    if len(transform) != 6:
+        raise ValueError(
+            "Transform must have 6 elements: [x, y, z, roll, pitch, yaw].")
+
+    x, y, z, roll, pitch, yaw = transform
+
+    # Rotation from Euler angles (in radians, 'XYZ' convention)
+    R_mat = euler_xyz_to_matrix(roll, pitch, yaw)  # 3x3
+
+    # Build the 4x4 homogeneous transform
+    T_AB = np.eye(4)
+    T_AB[0:3, 0:3] = R_mat
+    T_AB[0:3, 3] = [x, y, z]
+
+    return T_AB
+
+
+# ---------------------------------------------------------------
+# Main – quick round-trip test for FK ⇄ IK
+# ---------------------------------------------------------------
+if __name__ == "__main__":
+    import numpy as np
+
+    def pretty_print_pose(label, pose):
+        """Pose: (x, y, z, roll, pitch, yaw)"""
+        if pose is None:
+            print(f"{label:<14}:  None / IK failed")
+            return
+        x, y, z, r, p, yaw = pose
+        print(f"{label:<14}:  "
+              f"x={x: .4f}  y={y: .4f}  z={z: .4f}  "
+              f"r={r: .4f}  p={p: .4f}  y={yaw: .4f}")
+
+    def pretty_print_wrench(label, wrench):
+        """Wrench: (Fx, Fy, Fz, Tx, Ty, Tz)"""
+        if wrench is None:
+            print(f"{label:<14}:  None / outside workspace")
+            return
+        Fx, Fy, Fz, Tx, Ty, Tz = wrench
+        print(f"{label:<14}:  "
+              f"Fx={Fx: .4f}  Fy={Fy: .4f}  Fz={Fz: .4f}  "
+              f"Tx={Tx: .4f}  Ty={Ty: .4f}  Tz={Tz: .4f}")
+
+    # 1) Instantiate the robot
+    robot = DeltaRobot()
+
+    # 2) Choose a target pose (units: metres, radians)
+    x_target, y_target, z_target = 0.005, -0.016, 0.155   # 5 mm, –6 mm, –150 mm
+    roll_target = 0.03                                     # rad
+    pitch_target = -0.01                                    # rad
+    yaw_target = 0.04                                     # rad
+
+    print("Target end-effector pose:")
+    print(f"  xyz  = ({x_target:.4f}, {y_target:.4f}, {z_target:.4f})  [m]")
+    print(
+        f"  rpy  = ({roll_target:.4f}, {pitch_target:.4f}, {yaw_target:.4f})  [rad]")
+
+    # 3) Inverse kinematics
+    joint_angles = robot.inverse_kinematics(
+        x_target, y_target, z_target, roll_target, pitch_target, yaw_target
+    )
+    if joint_angles is None:
+        print("\n❌  Inverse kinematics failed - pose out of workspace.")
+        raise SystemExit(1)
+
+    # 4) Update robot state and run forward kinematics
+    robot.update(*joint_angles)
+    fk_pose = robot.get_FK_result()          # (x, y, z, roll, pitch, yaw)
+    end_force = robot.get_end_force()
+
+    # 5) Compare results
+    fk = np.array(fk_pose)
+    tgt = np.array([x_target, y_target, z_target,
+                   roll_target, pitch_target, yaw_target])
+    diff = fk - tgt
+
+    print("\nJoint angles (rad):")
+    print("  " + ", ".join(f"{a:.6f}" for a in joint_angles))
+
+    print("\nPose returned by forward kinematics:")
+    print(
+        f"  xyz  = ({fk_pose[0]:.4f}, {fk_pose[1]:.4f}, {fk_pose[2]:.4f})  [m]")
+    print(
+        f"  rpy  = ({fk_pose[3]:.4f}, {fk_pose[4]:.4f}, {fk_pose[5]:.4f})  [rad]")
+
+    print("\nResidual error  (FK – target):")
+    print(f"  Δxyz = {diff[:3]}")
+    print(f"  Δrpy = {diff[3:]}")
+
+    pretty_print_wrench("\nEnd-effector force", end_force)
+
+    # ---------------------------------------------------------------
+    trans1 = [0, 0, 0.15, 0.3, 0,   0]
+    trans2 = [0, 0, 0.15, 0.3, 0.2,   0]
+
+    print("\n===== Pose 1 =================================================")
+    enc1 = robot.inverse_kinematics(*trans1)
+    print("Inverse kinematics  :", enc1)
+    if enc1:
+        robot.update(*enc1)
+        pretty_print_pose("Forward kinematics", robot.get_FK_result())
+        pretty_print_wrench("End-effector force", robot.get_end_force())
+
+    print("\n===== Pose 2 =================================================")
+    enc2 = robot.inverse_kinematics(*trans2)
+    print("Inverse kinematics  :", enc2)
+    if enc2:
+        robot.update(*enc2)
+        pretty_print_pose("Forward kinematics", robot.get_FK_result())
+        pretty_print_wrench("End-effector force", robot.get_end_force())
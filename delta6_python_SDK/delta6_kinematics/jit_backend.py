@@ -0,0 +1,377 @@
+"""
+Optional JIT-compiled scalar kernels for the Delta6 kinematics.
+
+The control path evaluates one sample at a time, where NumPy's per-call
+overhead dominates. This module re-implements forward_kinematics,
+_calculate_angle_yz, calculate_force_xyz and the wrench transform of
+DeltaRobot as plain scalar functions and compiles them with Numba's njit when
+Numba is installed (pip install delta6[jit]).
+
+Select it at runtime with DeltaRobot.set_backend("jit") or ("auto"). Without
+Numba, "auto" keeps the default implementation and "jit" runs the same
+kernels interpreted.
+
+Compare single-sample latency of the backends:
+    python -m delta6_kinematics.jit_backend
+"""
+
+import math
+import time
+import warnings
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """
+        Stand-in for numba.njit that leaves the function interpreted.
+        """
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+BACKENDS = ("default", "jit", "auto")
+
+_SIN120 = math.sqrt(3) / 2
+# Below this |cos(pitch)| roll and yaw are treated as aligned, as in rotation_tools
+_GIMBAL_EPS = 1e-7
+
+
+@njit(cache=True)
+def _fk_kernel(theta1, theta2, theta3, theta4, theta5, theta6,
+               e, f, re, rf, z_offset, theta_offset):
+    """
+    DeltaRobot.forward_kinematics; x is NaN outside the workspace.
+    """
+    theta1 = theta1 + theta_offset
+    theta2 = theta2 + theta_offset
+    theta3 = theta3 + theta_offset
+
+    t = f - e
+    tan60 = math.tan(math.pi / 3)
+
+    y1 = -(t + rf * math.cos(theta1))
+    z1 = -rf * math.sin(theta1)
+
+    y2 = (t + rf * math.cos(theta2)) * 0.5
+    x2 = y2 * tan60
+    z2 = -rf * math.sin(theta2)
+
+    y3 = (t + rf * math.cos(theta3)) * 0.5
+    x3 = -y3 * tan60
+    z3 = -rf * math.sin(theta3)
+
+    dnm = (y2 - y1) * x3 - (y3 - y1) * x2
+
+    w1 = y1 * y1 + z1 * z1
+    w2 = x2 * x2 + y2 * y2 + z2 * z2
+    w3 = x3 * x3 + y3 * y3 + z3 * z3
+
+    a1 = (z2 - z1) * (y3 - y1) - (z3 - z1) * (y2 - y1)
+    b1 = -((w2 - w1) * (y3 - y1) - (w3 - w1) * (y2 - y1)) / 2.0
+
+    a2 = -(z2 - z1) * x3 + (z3 - z1) * x2
+    b2 = ((w2 - w1) * x3 - (w3 - w1) * x2) / 2.0
+
+    a = a1 * a1 + a2 * a2 + dnm * dnm
+    b = 2 * (a1 * b1 + a2 * (b2 - y1 * dnm) - z1 * dnm * dnm)
+    c = (b2 - y1 * dnm) ** 2 + b1 * b1 + dnm * dnm * (z1 * z1 - re * re)
+
+    discriminant = b * b - 4.0 * a * c
+    if discriminant < 0:
+        nan = math.nan
+        return nan, nan, nan, nan, nan, nan
+
+    z0 = -0.5 * (b + math.sqrt(discriminant)) / a
+    x0 = (a1 * z0 + b1) / dnm
+    y0 = (a2 * z0 + b2) / dnm
+
+    # ZXY joint angles (theta6, theta4, theta5) -> intrinsic XYZ roll, pitch, yaw
+    ca, sa = math.cos(theta6), math.sin(theta6)
+    cb, sb = math.cos(theta4), math.sin(theta4)
+    cc, sc = math.cos(theta5), math.sin(theta5)
+    r00 = ca * cc - sa * sb * sc
+    r01 = -sa * cb
+    r02 = ca * sc + sa * sb * cc
+    r11 = ca * cb
+    r12 = sa * sc - ca * sb * cc
+    r21 = sb
+    r22 = cb * cc
+    cos_pitch = math.hypot(r00, r01)
+    pitch = math.atan2(r02, cos_pitch)
+    if cos_pitch < _GIMBAL_EPS:
+        roll = math.atan2(r21, r11)
+        yaw = 0.0
+    else:
+        roll = math.atan2(-r12, r22)
+        yaw = math.atan2(-r01, r00)
+
+    return -y0 / 1000.0, x0 / 1000.0, -(z0 - z_offset) / 1000.0, roll, pitch, yaw
+
+
+@njit(cache=True)
+def _angle_yz_kernel(x0, y0, z0, e, f, re, rf):
+    """
+    DeltaRobot._calculate_angle_yz; NaN if the position is unreachable.
+    """
+    y1 = -f
+    y0 -= e
+
+    a = (x0 * x0 + y0 * y0 + z0 * z0 + rf * rf - re * re - y1 * y1) / (2 * z0)
+    b = (y1 - y0) / z0
+    discriminant = -(a + b * y1) ** 2 + rf * (b * b * rf + rf)
+    if discriminant < 0:
+        return math.nan
+
+    yj = (y1 - a * b - math.sqrt(discriminant)) / (b * b + 1)
+    zj = a + b * yj
+
+    theta = math.atan(-zj / (y1 - yj))
+    if yj > y1:
+        theta += math.pi
+    return theta
+
+
+@njit(cache=True)
+def _ik_kernel(x, y, z, roll, pitch, yaw, e, f, re, rf, z_offset, theta_offset):
+    """
+    DeltaRobot.inverse_kinematics; theta1 is NaN outside the workspace.
+    """
+    cos120 = -0.5
+    sin120 = _SIN120
+    nan = math.nan
+
+    x0 = y * 1000.0
+    y0 = -x * 1000.0
+    z0 = -z * 1000 + z_offset
+
+    theta1 = _angle_yz_kernel(x0, y0, z0, e, f, re, rf)
+    theta2 = _angle_yz_kernel(x0 * cos120 + y0 * sin120,
+                              y0 * cos120 - x0 * sin120, z0, e, f, re, rf)
+    theta3 = _angle_yz_kernel(x0 * cos120 - y0 * sin120,
+                              y0 * cos120 + x0 * sin120, z0, e, f, re, rf)
+    if math.isnan(theta1) or math.isnan(theta2) or math.isnan(theta3):
+        return nan, nan, nan, nan, nan, nan
+
+    # Intrinsic XYZ roll, pitch, yaw -> ZXY joint angles (theta6, theta4, theta5)
+    ca, sa = math.cos(roll), math.sin(roll)
+    cb, sb = math.cos(pitch), math.sin(pitch)
+    cc, sc = math.cos(yaw), math.sin(yaw)
+    r00 = cb * cc
+    r01 = -cb * sc
+    r10 = ca * sc + sa * sb * cc
+    r11 = ca * cc - sa * sb * sc
+    r20 = sa * sc - ca * sb * cc
+    r21 = sa * cc + ca * sb * sc
+    r22 = ca * cb
+    cos_x = math.hypot(r20, r22)
+    theta4 = math.atan2(r21, cos_x)
+    if cos_x < _GIMBAL_EPS:
+        theta6 = math.atan2(r10, r00)
+        theta5 = 0.0
+    else:
+        theta6 = math.atan2(-r01, r11)
+        theta5 = math.atan2(-r20, r22)
+
+    return (theta1 - theta_offset, theta2 - theta_offset, theta3 - theta_offset,
+            theta4, theta5, theta6)
+
+
+@njit(cache=True)
+def _branch_forces_kernel(torque1, torque2, torque3, px, py, pz,
+                          e, f, re, rf, z_offset, theta_offset, spring_coef):
+    """
+    DeltaRobot._branch_forces for a known position.
+
+    Returns the three AiPi unit vectors (main frame), the three force
+    magnitudes and (Fx, Fy, Fz) as one flat tuple of 15 values.
+    """
+    theta1 = torque1 / spring_coef + theta_offset
+    theta2 = torque2 / spring_coef + theta_offset
+    theta3 = torque3 / spring_coef + theta_offset
+
+    k = (e - f) / 1000
+    la = rf / 1000
+    lb = re / 1000
+    pz = pz - z_offset / 1000
+
+    s1, c1 = math.sin(theta1), math.cos(theta1)
+    s2, c2 = math.sin(theta2), math.cos(theta2)
+    s3, c3 = math.sin(theta3), math.cos(theta3)
+
+    # Branch i sits at 0, 120 and 240 degrees around the base
+    u1x = (px - c1 * la + k) / lb
+    u1y = py / lb
+    u1z = (pz - la * s1) / lb
+    u2x = (px + 0.5 * c2 * la - 0.5 * k) / lb
+    u2y = (py - _SIN120 * c2 * la + _SIN120 * k) / lb
+    u2z = (pz - la * s2) / lb
+    u3x = (px + 0.5 * c3 * la - 0.5 * k) / lb
+    u3y = (py + _SIN120 * c3 * la - _SIN120 * k) / lb
+    u3z = (pz - la * s3) / lb
+
+    # Only the x component changes when rotating into the branch frame
+    b2x = -0.5 * u2x + _SIN120 * u2y
+    b3x = -0.5 * u3x - _SIN120 * u3y
+
+    mag1 = torque1 / (s1 * la * u1x - c1 * la * u1z)
+    mag2 = torque2 / (s2 * la * b2x - c2 * la * u2z)
+    mag3 = torque3 / (s3 * la * b3x - c3 * la * u3z)
+
+    fx = -(mag1 * u1x + mag2 * u2x + mag3 * u3x)
+    fy = -(mag1 * u1y + mag2 * u2y + mag3 * u3y)
+    fz = -(mag1 * u1z + mag2 * u2z + mag3 * u3z)
+
+    return (u1x, u1y, u1z, u2x, u2y, u2z, u3x, u3y, u3z,
+            mag1, mag2, mag3, fx, fy, fz)
+
+
+@njit(cache=True)
+def _wrench_to_tool_kernel(fx, fy, fz, mx, my, mz, roll, pitch, yaw):
+    """
+    represent_wrench_to_B for a pure rotation: R^T f and R^T tau with R = Rx Ry Rz.
+    """
+    ca, sa = math.cos(roll), math.sin(roll)
+    cb, sb = math.cos(pitch), math.sin(pitch)
+    cc, sc = math.cos(yaw), math.sin(yaw)
+    r00 = cb * cc
+    r01 = -cb * sc
+    r02 = sb
+    r10 = ca * sc + sa * sb * cc
+    r11 = ca * cc - sa * sb * sc
+    r12 = -sa * cb
+    r20 = sa * sc - ca * sb * cc
+    r21 = sa * cc + ca * sb * sc
+    r22 = ca * cb
+    return (r00 * fx + r10 * fy + r20 * fz,
+            r01 * fx + r11 * fy + r21 * fz,
+            r02 * fx + r12 * fy + r22 * fz,
+            r00 * mx + r10 * my + r20 * mz,
+            r01 * mx + r11 * my + r21 * mz,
+            r02 * mx + r12 * my + r22 * mz)
+
+
+class JitKinematics:
+    def __init__(self, robot):
+        """
+        Scalar-kernel implementation of the DeltaRobot hot path.
+
+        :param robot: DeltaRobot whose geometry and spring parameters are used (read on every call)
+        """
+        self.robot = robot
+        self.compiled = NUMBA_AVAILABLE
+
+    def _geometry(self):
+        robot = self.robot
+        return robot.e, robot.f, robot.re, robot.rf, robot.z_offset, robot.theta_offset
+
+    def forward_kinematics(self, theta1, theta2, theta3, theta4, theta5, theta6):
+        pose = _fk_kernel(float(theta1), float(theta2), float(theta3),
+                          float(theta4), float(theta5), float(theta6),
+                          *self._geometry())
+        if math.isnan(pose[0]):
+            return None
+        return pose
+
+    def inverse_kinematics(self, x, y, z, roll, pitch, yaw):
+        thetas = _ik_kernel(float(x), float(y), float(z),
+                            float(roll), float(pitch), float(yaw),
+                            *self._geometry())
+        if math.isnan(thetas[0]):
+            return None
+        return thetas
+
+    def branch_forces(self, torque1, torque2, torque3, position):
+        """
+        Same contract as DeltaRobot._branch_forces with a known position.
+        """
+        r = _branch_forces_kernel(float(torque1), float(torque2), float(torque3),
+                                  float(position[0]), float(position[1]), float(position[2]),
+                                  *self._geometry(), self.robot.spring_coef)
+        units = ((r[0], r[1], r[2]), (r[3], r[4], r[5]), (r[6], r[7], r[8]))
+        return units, (r[9], r[10], r[11]), (r[12], r[13], r[14])
+
+    def wrench_to_tool(self, wrench, pose):
+        """
+        Rotate a main-frame wrench into the tool frame of pose.
+        """
+        return _wrench_to_tool_kernel(float(wrench[0]), float(wrench[1]), float(wrench[2]),
+                                      float(wrench[3]), float(wrench[4]), float(wrench[5]),
+                                      float(pose[3]), float(pose[4]), float(pose[5]))
+
+    def warm_up(self):
+        """
+        Trigger compilation of every kernel so the first control sample is not delayed.
+        """
+        pose = self.forward_kinematics(0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+        self.inverse_kinematics(*pose)
+        _, _, force = self.branch_forces(0.0, 0.0, 0.0, pose)
+        self.wrench_to_tool((*force, 0.0, 0.0, 0.0), pose)
+
+
+def select_backend(robot, name="auto"):
+    """
+    Resolve a backend name for a DeltaRobot.
+
+    :param name: "default" (NumPy/math implementation), "jit" (scalar kernels,
+                 compiled when Numba is available) or "auto" (jit only if Numba is installed)
+    :return: JitKinematics instance, or None for the default implementation
+    :raises ValueError: for an unknown backend name
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown backend '{name}', expected one of {BACKENDS}.")
+    if name == "default" or (name == "auto" and not NUMBA_AVAILABLE):
+        return None
+    if not NUMBA_AVAILABLE:
+        warnings.warn("Numba is not installed; the jit backend runs interpreted.")
+
+    kernels = JitKinematics(robot)
+    try:
+        kernels.warm_up()
+    except Exception as exc:
+        # Compilation failures must not take down the control loop
+        warnings.warn(f"JIT backend unavailable ({exc}); using the default implementation.")
+        return None
+    return kernels
+
+
+if __name__ == "__main__":
+    import numpy as np
+    from delta6_kinematics.delta6_analytics import DeltaRobot
+
+    n = 20000
+    rng = np.random.default_rng(0)
+    samples = rng.uniform(-0.1, 0.1, (n, 6)).tolist()
+
+    def bench(robot):
+        poses = []
+        start = time.perf_counter()
+        for row in samples:
+            poses.append(robot.forward_kinematics(*row))
+        t_fk = (time.perf_counter() - start) / n
+
+        start = time.perf_counter()
+        for pose in poses:
+            robot.inverse_kinematics(*pose)
+        t_ik = (time.perf_counter() - start) / n
+
+        start = time.perf_counter()
+        for row in samples:
+            robot.update(*row)
+            robot.get_end_force()
+        t_state = (time.perf_counter() - start) / n
+        return t_fk, t_ik, t_state
+
+    print(f"Numba available: {NUMBA_AVAILABLE}")
+    results = {}
+    for name in ("default", "jit"):
+        robot = DeltaRobot()
+        active = robot.set_backend(name)
+        results[active] = bench(robot)
+
+    print(f"{'backend':<10}{'FK [us]':>10}{'IK [us]':>10}{'update + get_end_force [us]':>30}")
+    for name, (t_fk, t_ik, t_state) in results.items():
+        print(f"{name:<10}{t_fk * 1e6:>10.2f}{t_ik * 1e6:>10.2f}{t_state * 1e6:>30.2f}")
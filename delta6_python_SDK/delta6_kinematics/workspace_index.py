@@ -0,0 +1,180 @@
+"""
+Precomputed workspace reachability and force-conditioning index for the Delta6.
+
+The workspace is sampled once on a regular voxel grid with the FK/IK equations
+of DeltaRobot. For every voxel the index stores whether the position is
+reachable (optionally within a joint limit) and the condition number of the
+force Jacobian dF/dtorque there. Controllers can then reject or de-rate a
+commanded pose with an O(1) lookup instead of solving IK online.
+
+Orientation does not enter: roll, pitch and yaw map to theta4 ... theta6
+independently of the position, so reachability is a function of (x, y, z).
+
+Build an index once:
+    python -m delta6_kinematics.workspace_index --out delta6_workspace.npz
+"""
+
+import argparse
+import math
+import time
+import numpy as np
+
+
+class WorkspaceIndex:
+    def __init__(self, reachable, condition, origin, step, params):
+        """
+        :param reachable: (nx, ny, nz) boolean voxel grid
+        :param condition: (nx, ny, nz) condition number of dF/dtorque, inf where unreachable
+        :param origin: (x, y, z) of the centre of voxel (0, 0, 0) in m
+        :param step: voxel edge length in m
+        :param params: geometry and spring parameters of the robot the index was built for
+        """
+        self.reachable = np.asarray(reachable, dtype=bool)
+        self.condition = np.asarray(condition, dtype=np.float32)
+        self.origin = tuple(float(v) for v in origin)
+        self.step = float(step)
+        self.params = np.asarray(params, dtype=float)
+        self.shape = self.reachable.shape
+
+    def _voxel(self, x, y, z):
+        """
+        Index of the voxel containing (x, y, z), or None outside the grid.
+        """
+        i = int(math.floor((x - self.origin[0]) / self.step + 0.5))
+        j = int(math.floor((y - self.origin[1]) / self.step + 0.5))
+        k = int(math.floor((z - self.origin[2]) / self.step + 0.5))
+        nx, ny, nz = self.shape
+        if 0 <= i < nx and 0 <= j < ny and 0 <= k < nz:
+            return i, j, k
+        return None
+
+    def query(self, pose):
+        """
+        Look up a pose.
+
+        :param pose: (x, y, z, ...) in m; orientation entries are ignored
+        :return: (reachable, condition_number); (False, inf) outside the sampled grid
+        """
+        voxel = self._voxel(pose[0], pose[1], pose[2])
+        if voxel is None:
+            return False, math.inf
+        return bool(self.reachable[voxel]), float(self.condition[voxel])
+
+    def is_reachable(self, pose, max_condition=None):
+        """
+        True if the pose is reachable and, when max_condition is given, well enough conditioned.
+        """
+        reachable, condition = self.query(pose)
+        if max_condition is not None:
+            return reachable and condition <= max_condition
+        return reachable
+
+    def save(self, path):
+        """
+        Save the index to a .npz file.
+        """
+        np.savez_compressed(path, reachable=self.reachable, condition=self.condition,
+                            origin=np.array(self.origin), step=self.step, params=self.params)
+
+    @classmethod
+    def load(cls, path, robot=None):
+        """
+        Load an index saved with save().
+
+        :param robot: optional DeltaRobot; if given, its parameters must match the index
+        :raises ValueError: if the index was built for different robot parameters
+        """
+        with np.load(path) as data:
+            if robot is not None and not np.allclose(data["params"], robot._model_params(),
+                                                     rtol=0, atol=1e-12):
+                raise ValueError(
+                    f"Workspace index {path} was built for different robot parameters.")
+            return cls(data["reachable"], data["condition"], data["origin"],
+                       float(data["step"]), data["params"])
+
+
+def build_workspace_index(robot, x_range=(-0.03, 0.03), y_range=(-0.03, 0.03),
+                          z_range=(0.137, 0.197), step=0.001, joint_limit=None,
+                          chunk_size=100000):
+    """
+    Sample the workspace of a DeltaRobot on a voxel grid.
+
+    :param robot: DeltaRobot to sample
+    :param x_range, y_range, z_range: (min, max) voxel centres in m
+    :param step: voxel edge length in m
+    :param joint_limit: if given, positions needing |theta1 ... theta3| > joint_limit rad are unreachable
+    :param chunk_size: number of voxels evaluated per vectorized pass
+    :return: WorkspaceIndex
+    """
+    axes = [np.arange(lo, hi + step / 2, step)
+            for lo, hi in (x_range, y_range, z_range)]
+    shape = tuple(len(a) for a in axes)
+    centres = np.stack(np.meshgrid(*axes, indexing="ij"),
+                       axis=-1).reshape(-1, 3)
+
+    reachable = np.zeros(len(centres), dtype=bool)
+    condition = np.full(len(centres), np.inf, dtype=np.float32)
+
+    for start in range(0, len(centres), chunk_size):
+        xyz = centres[start:start + chunk_size]
+        poses = np.zeros((len(xyz), 6))
+        poses[:, :3] = xyz
+        thetas, valid = robot.inverse_kinematics_batch(poses)
+        if joint_limit is not None:
+            valid &= np.all(np.abs(thetas[:, :3]) <= joint_limit, axis=1)
+
+        thetas = thetas[valid, :3]
+        positions = np.stack(robot._fk_position_batch(
+            thetas[:, 0], thetas[:, 1], thetas[:, 2]), axis=-1)
+        _, jacobian = robot._force_jacobian_batch(
+            thetas, thetas * robot.spring_coef, positions)
+        cond = np.linalg.cond(jacobian) if len(jacobian) else np.empty(0)
+
+        chunk_reachable = np.zeros(len(xyz), dtype=bool)
+        chunk_reachable[valid] = np.isfinite(cond)
+        chunk_condition = np.full(len(xyz), np.inf, dtype=np.float32)
+        chunk_condition[valid] = cond
+
+        reachable[start:start + chunk_size] = chunk_reachable
+        condition[start:start + chunk_size] = chunk_condition
+
+    origin = (axes[0][0], axes[1][0], axes[2][0])
+    return WorkspaceIndex(reachable.reshape(shape), condition.reshape(shape),
+                          origin, step, robot._model_params())
+
+
+if __name__ == "__main__":
+    from delta6_kinematics.delta6_analytics import DeltaRobot
+
+    parser = argparse.ArgumentParser(
+        description="Build the Delta6 workspace reachability / conditioning index.")
+    parser.add_argument("--out", type=str, default="delta6_workspace.npz",
+                        help="Output .npz file (default delta6_workspace.npz)")
+    parser.add_argument("--step", type=float, default=0.001,
+                        help="Voxel size in m (default 0.001)")
+    parser.add_argument("--joint-limit", type=float, default=None,
+                        help="Optional joint limit in rad for theta1 ... theta3")
+    args = parser.parse_args()
+
+    robot = DeltaRobot()
+    start = time.perf_counter()
+    index = build_workspace_index(
+        robot, step=args.step, joint_limit=args.joint_limit)
+    index.save(args.out)
+    print(f"Built {index.shape} voxel index in {time.perf_counter() - start:.1f} s -> {args.out}")
+    print(f"Reachable voxels: {index.reachable.mean() * 100:.1f} %, "
+          f"condition number range: {index.condition[index.reachable].min():.2f} "
+          f"- {index.condition[index.reachable].max():.2f}")
+
+    # Compare lookup latency against an IK solve
+    pose = (0.005, -0.004, 0.16, 0.0, 0.0, 0.0)
+    n = 10000
+    start = time.perf_counter()
+    for _ in range(n):
+        index.query(pose)
+    t_query = (time.perf_counter() - start) / n
+    start = time.perf_counter()
+    for _ in range(n):
+        robot.inverse_kinematics(*pose)
+    t_ik = (time.perf_counter() - start) / n
+    print(f"query: {t_query * 1e6:.2f} us, inverse_kinematics: {t_ik * 1e6:.2f} us")
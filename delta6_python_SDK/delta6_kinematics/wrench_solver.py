@@ -0,0 +1,134 @@
+"""
+Newton solver for the wrench -> spring torque problem of the Delta6.
+
+Inverts DeltaRobot.calculate_end_force with its analytical Jacobian and warm
+starts from the previous solution, which is what a feed-forward loop needs:
+consecutive targets are close, so one or two iterations are usually enough.
+"""
+
+from typing import NamedTuple
+import numpy as np
+from delta6_utils.rotation_tools import euler_xyz_to_matrix
+
+
+class SolverReport(NamedTuple):
+    """
+    Outcome of one WrenchSolver.solve call.
+
+    converged: True if the tolerances were met within max_iter
+    iterations: number of Newton iterations taken
+    residual_norm: norm of the wrench residual at the returned torques
+    warm_started: True if the previous solution was used as initial guess
+    """
+    converged: bool
+    iterations: int
+    residual_norm: float
+    warm_started: bool
+
+
+class WrenchSolver:
+    def __init__(self, robot, xtol=1e-7, ftol=1e-10, max_iter=20, max_backtracks=8):
+        """
+        :param robot: DeltaRobot whose current joint state defines the tool-frame rotation
+        :param xtol: relative step tolerance on the torques (as in fsolve)
+        :param ftol: absolute tolerance on the wrench residual norm
+        :param max_iter: maximum number of Newton iterations
+        :param max_backtracks: maximum number of step halvings per iteration
+        """
+        self.robot = robot
+        self.xtol = xtol
+        self.ftol = ftol
+        self.max_iter = max_iter
+        self.max_backtracks = max_backtracks
+        self.last_solution = None
+
+    def reset(self):
+        """
+        Forget the previous solution so the next solve starts from zero torques.
+        """
+        self.last_solution = None
+
+    def _force_and_jacobian(self, torques):
+        """
+        End-effector force (main frame) and its (3, 3) Jacobian for torque1 ... torque3.
+        """
+        robot = self.robot
+        torques = torques[None, :]
+        thetas = torques / robot.spring_coef
+        # Scalar FK is cheaper than the batch path for a single sample
+        pose = robot.forward_kinematics(*thetas[0], 0, 0, 0)
+        if pose is None:
+            return np.full(3, np.nan), np.full((3, 3), np.nan)
+        positions = np.array([pose[:3]])
+        force, jacobian = robot._force_jacobian_batch(
+            thetas, torques, positions)
+        return force[0], jacobian[0]
+
+    def solve(self, wrench_target, initial_guess=None):
+        """
+        Find the six spring torques whose end wrench equals wrench_target.
+
+        :param wrench_target: (Fx, Fy, Fz, Mx, My, Mz) in the tool frame
+        :param initial_guess: optional torques to start from; defaults to the previous solution, then zeros
+        :return: (torques, SolverReport), torques as a (6,) numpy array; when the current
+                 joint state is outside the workspace the torques are NaN and the report is
+                 not converged, with an infinite residual
+        """
+        wrench_target = np.asarray(wrench_target, dtype=float)
+
+        warm_started = initial_guess is None and self.last_solution is not None
+        if initial_guess is None:
+            initial_guess = self.last_solution if warm_started else np.zeros(6)
+        torques = np.array(initial_guess, dtype=float)
+
+        # The rotation into the tool frame comes from the current joint state only
+        pose = self.robot.get_FK_result()
+        if pose is None:
+            return np.full(6, np.nan), SolverReport(False, 0, float("inf"), warm_started)
+        R_AB = euler_xyz_to_matrix(pose[3], pose[4], pose[5])
+
+        # Moments map linearly: tau_b = R^T tau, so they are solved exactly
+        torques[3:] = R_AB @ wrench_target[3:]
+
+        # Forces: Newton on R^T F(torque1..3) = f_target, i.e. F = R f_target
+        force_target = R_AB @ wrench_target[:3]
+        force, jacobian = self._force_and_jacobian(torques[:3])
+        residual = force - force_target
+        residual_norm = np.linalg.norm(residual)
+
+        converged = residual_norm <= self.ftol
+        iterations = 0
+        while not converged and iterations < self.max_iter:
+            iterations += 1
+            try:
+                step = np.linalg.solve(jacobian, residual)
+            except np.linalg.LinAlgError:
+                break
+
+            # Backtrack if the full step leaves the workspace or increases the residual
+            scale = 1.0
+            for _ in range(self.max_backtracks + 1):
+                candidate = torques[:3] - scale * step
+                new_force, new_jacobian = self._force_and_jacobian(candidate)
+                new_residual = new_force - force_target
+                new_norm = np.linalg.norm(new_residual)
+                if np.isfinite(new_norm) and new_norm < residual_norm:
+                    break
+                scale *= 0.5
+            else:
+                break
+
+            torques[:3] = candidate
+            force, jacobian = new_force, new_jacobian
+            residual, residual_norm = new_residual, new_norm
+
+            step_norm = scale * np.linalg.norm(step)
+            converged = residual_norm <= self.ftol or \
+                step_norm <= self.xtol * (1.0 + np.linalg.norm(torques[:3]))
+
+        if converged:
+            self.last_solution = torques.copy()
+
+        report = SolverReport(bool(converged), iterations,
+                              float(residual_norm), warm_started)
+        return torques, report
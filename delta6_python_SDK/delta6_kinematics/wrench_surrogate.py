@@ -0,0 +1,273 @@
+"""
+Precomputed encoder -> wrench surrogate for the Delta6.
+
+The only expensive part of DeltaRobot.get_end_force is the force of the three
+parallel branches, which depends on theta1 ... theta3 alone. This module
+tabulates that force on a regular grid over the calibrated joint range and
+evaluates it by trilinear interpolation; the moments and the rotation into
+the tool frame are closed form. Outside the table the exact model is used.
+
+Two error figures are kept with the table: max_error, the largest error measured
+against the exact model at build time, and error_bound, the trilinear error bound
+h^2/8 * sum of max|d^2F/dtheta_i^2| with the second derivatives estimated from
+the table itself (plus a margin), which also covers the points between samples.
+
+Build a table once:
+    python -m delta6_kinematics.wrench_surrogate --out delta6_surrogate.npz --range 0.2 --points 65
+"""
+
+import argparse
+import math
+import time
+import numpy as np
+from delta6_utils.rotation_tools import euler_zxy_to_matrix
+
+
+def _exact_force_xyz(robot, thetas):
+    """
+    Exact branch force (main frame) for an (N, 3) array of theta1 ... theta3.
+    """
+    positions = np.stack(robot._fk_position_batch(
+        thetas[:, 0], thetas[:, 1], thetas[:, 2]), axis=-1)
+    _, _, force = robot._branch_forces_batch(
+        thetas, thetas * robot.spring_coef, positions)
+    return force
+
+
+class WrenchSurrogate:
+    def __init__(self, robot, grid, lower, upper, max_error, error_bound=None):
+        """
+        :param robot: DeltaRobot the table was built for; also used as exact fallback
+        :param grid: (n, n, n, 3) branch force at the grid nodes, in N
+        :param lower: lower joint limit of the table in rad (same for theta1 ... theta3)
+        :param upper: upper joint limit of the table in rad
+        :param max_error: (3,) largest |Fx|, |Fy|, |Fz| error against the exact model measured at
+                          build time, in N; a measurement at sample points, not a bound
+        :param error_bound: (3,) bound on the |Fx|, |Fy|, |Fz| interpolation error anywhere in the
+                            table, in N, see interpolation_error_bound(); None if unknown
+        """
+        self.robot = robot
+        self.grid = np.ascontiguousarray(grid, dtype=float)
+        self.lower = float(lower)
+        self.upper = float(upper)
+        self.points = self.grid.shape[0]
+        self.step = (self.upper - self.lower) / (self.points - 1)
+        self.max_error = np.asarray(max_error, dtype=float)
+        self.error_bound = interpolation_error_bound(self.grid, self.step) \
+            if error_bound is None else np.asarray(error_bound, dtype=float)
+        self.params = robot._model_params()
+
+        # How often the table answered vs. the exact model
+        self.table_hits = 0
+        self.fallbacks = 0
+
+    def in_domain(self, theta1, theta2, theta3):
+        """
+        True if the three branch angles lie inside the table.
+        """
+        return (self.lower <= theta1 <= self.upper and
+                self.lower <= theta2 <= self.upper and
+                self.lower <= theta3 <= self.upper)
+
+    def force_xyz(self, theta1, theta2, theta3):
+        """
+        Interpolated branch force in the main frame, or None outside the table.
+        """
+        if not self.in_domain(theta1, theta2, theta3):
+            return None
+
+        last = self.points - 2
+        u = (theta1 - self.lower) / self.step
+        v = (theta2 - self.lower) / self.step
+        w = (theta3 - self.lower) / self.step
+        i = min(int(u), last)
+        j = min(int(v), last)
+        k = min(int(w), last)
+        u -= i
+        v -= j
+        w -= k
+
+        # Collapse the 2x2x2 cell one axis at a time
+        c = self.grid[i:i + 2, j:j + 2, k:k + 2]
+        c = c[0] + u * (c[1] - c[0])
+        c = c[0] + v * (c[1] - c[0])
+        c = c[0] + w * (c[1] - c[0])
+        return c
+
+    def end_force(self, theta1, theta2, theta3, theta4, theta5, theta6):
+        """
+        Wrench (Fx, Fy, Fz, Mx, My, Mz) in the tool frame, like DeltaRobot.get_end_force.
+
+        Uses the table inside its domain and the exact model outside.
+        """
+        force = self.force_xyz(theta1, theta2, theta3)
+        if force is None:
+            self.fallbacks += 1
+            wrench = self.robot.end_force_batch(
+                [[theta1, theta2, theta3, theta4, theta5, theta6]])[0]
+            return tuple(wrench)
+        self.table_hits += 1
+
+        spring_coef = self.robot.spring_coef
+        if self.robot.version == "double-springs-roll-pitch":
+            moment = np.array([2 * theta4 * spring_coef,
+                               2 * theta5 * spring_coef,
+                               theta6 * spring_coef])
+        else:
+            moment = np.array([theta4, theta5, theta6]) * spring_coef
+
+        # FK turns the ZXY joint angles into roll/pitch/yaw of the same rotation
+        R_AB = euler_zxy_to_matrix(theta6, theta4, theta5)
+        f_b = force @ R_AB
+        tau_b = moment @ R_AB
+        return f_b[0], f_b[1], f_b[2], tau_b[0], tau_b[1], tau_b[2]
+
+    def save(self, path):
+        """
+        Save the table to a .npz file.
+        """
+        np.savez_compressed(path, grid=self.grid, lower=self.lower, upper=self.upper,
+                            max_error=self.max_error, error_bound=self.error_bound,
+                            params=self.params)
+
+    @classmethod
+    def load(cls, path, robot):
+        """
+        Load a table saved with save() for the given robot.
+
+        :raises ValueError: if the table was built for different geometry or spring parameters
+        """
+        with np.load(path) as data:
+            if not np.allclose(data["params"], robot._model_params(), rtol=0, atol=1e-12):
+                raise ValueError(
+                    f"Surrogate {path} was built for different robot parameters.")
+            # Tables saved before error_bound existed get it recomputed from the grid
+            return cls(robot, data["grid"], float(data["lower"]), float(data["upper"]),
+                       data["max_error"], data["error_bound"] if "error_bound" in data else None)
+
+
+def interpolation_error_bound(grid, step, margin=1.25):
+    """
+    Bound on the trilinear interpolation error of a tabulated smooth function.
+
+    Per component, |F - I F| <= h^2 / 8 * (M_1 + M_2 + M_3) with M_i = max |d^2F / dtheta_i^2|
+    over the table. M_i is estimated from second differences of the grid, raised by h times
+    the largest third difference (the second derivative can change that much between the
+    points a difference averages over), and multiplied by margin. The derivatives come from
+    the table, so this is an estimate of the bound rather than a proof; it assumes F has no
+    features narrower than a grid cell.
+
+    :param grid: (n, n, n, 3) function values at the nodes, n >= 4
+    :param step: node spacing h in rad
+    :param margin: safety factor on the derivative estimates
+    :return: (3,) error bound per component
+    """
+    if min(grid.shape[:3]) < 4:
+        raise ValueError("The error bound needs at least 4 grid nodes per axis.")
+    total = np.zeros(grid.shape[-1])
+    for axis in range(3):
+        second = np.abs(np.diff(grid, 2, axis=axis)).reshape(-1, grid.shape[-1]).max(axis=0) / step ** 2
+        third = np.abs(np.diff(grid, 3, axis=axis)).reshape(-1, grid.shape[-1]).max(axis=0) / step ** 3
+        total += second + step * third
+    return margin * step ** 2 / 8 * total
+
+
+def build_wrench_surrogate(robot, joint_range=0.2, points=65, validation_samples=200000, seed=0):
+    """
+    Tabulate the branch force of a DeltaRobot, bound and measure the interpolation error.
+
+    surrogate.error_bound is computed from the grid, see interpolation_error_bound().
+    surrogate.max_error is the largest error measured at every cell centre and at
+    validation_samples random points; it checks the bound but does not replace it.
+
+    :param robot: DeltaRobot to tabulate
+    :param joint_range: table covers theta1 ... theta3 in [-joint_range, joint_range] rad
+    :param points: grid nodes per axis
+    :param validation_samples: number of random points checked in addition to cell centres
+    :param seed: random seed for the validation points
+    :return: WrenchSurrogate
+    """
+    nodes = np.linspace(-joint_range, joint_range, points)
+    mesh = np.stack(np.meshgrid(nodes, nodes, nodes, indexing="ij"), axis=-1)
+    grid = _exact_force_xyz(robot, mesh.reshape(-1, 3)).reshape(
+        points, points, points, 3)
+    if np.isnan(grid).any():
+        raise ValueError(
+            "Joint range leaves the workspace; choose a smaller joint_range.")
+
+    surrogate = WrenchSurrogate(robot, grid, -joint_range, joint_range,
+                                np.zeros(3))
+
+    centres = (nodes[:-1] + nodes[1:]) / 2
+    samples = np.stack(np.meshgrid(centres, centres, centres, indexing="ij"),
+                       axis=-1).reshape(-1, 3)
+    rng = np.random.default_rng(seed)
+    samples = np.concatenate([samples, rng.uniform(
+        -joint_range, joint_range, (validation_samples, 3))])
+
+    exact = _exact_force_xyz(robot, samples)
+    approx = _interpolate_batch(surrogate, samples)
+    surrogate.max_error = np.abs(approx - exact).max(axis=0)
+    return surrogate
+
+
+def _interpolate_batch(surrogate, thetas):
+    """
+    Vectorized force_xyz for an (N, 3) array of in-domain angles.
+    """
+    last = surrogate.points - 2
+    scaled = (thetas - surrogate.lower) / surrogate.step
+    idx = np.minimum(scaled.astype(int), last)
+    frac = scaled - idx
+
+    result = np.zeros((len(thetas), 3))
+    for corner in range(8):
+        di, dj, dk = (corner >> 2) & 1, (corner >> 1) & 1, corner & 1
+        weight = (np.where(di, frac[:, 0], 1 - frac[:, 0]) *
+                  np.where(dj, frac[:, 1], 1 - frac[:, 1]) *
+                  np.where(dk, frac[:, 2], 1 - frac[:, 2]))
+        result += weight[:, None] * surrogate.grid[idx[:, 0] + di,
+                                                   idx[:, 1] + dj,
+                                                   idx[:, 2] + dk]
+    return result
+
+
+if __name__ == "__main__":
+    from delta6_kinematics.delta6_analytics import DeltaRobot
+
+    parser = argparse.ArgumentParser(
+        description="Build the Delta6 encoder -> wrench surrogate table.")
+    parser.add_argument("--out", type=str, default="delta6_surrogate.npz",
+                        help="Output .npz file (default delta6_surrogate.npz)")
+    parser.add_argument("--range", type=float, default=0.2,
+                        help="Joint range in rad covered by the table (default 0.2)")
+    parser.add_argument("--points", type=int, default=65,
+                        help="Grid nodes per axis (default 65)")
+    args = parser.parse_args()
+
+    robot = DeltaRobot()
+    start = time.perf_counter()
+    surrogate = build_wrench_surrogate(
+        robot, joint_range=args.range, points=args.points)
+    surrogate.save(args.out)
+    print(f"Built {args.points}^3 table over ±{args.range} rad "
+          f"({math.degrees(args.range):.1f} deg) in {time.perf_counter() - start:.1f} s -> {args.out}")
+    print(f"Force error bound (Fx, Fy, Fz) [N]: {surrogate.error_bound}")
+    print(f"Max force error measured (Fx, Fy, Fz) [N]: {surrogate.max_error}")
+
+    # Runtime comparison against the exact model
+    rng = np.random.default_rng(1)
+    thetas = rng.uniform(-args.range, args.range, (2000, 6))
+
+    start = time.perf_counter()
+    for row in thetas:
+        surrogate.end_force(*row)
+    t_table = (time.perf_counter() - start) / len(thetas)
+
+    start = time.perf_counter()
+    for row in thetas:
+        robot.update(*row)
+        robot.get_end_force()
+    t_exact = (time.perf_counter() - start) / len(thetas)
+
+    print(f"Surrogate: {t_table * 1e6:.1f} us/sample, exact model: {t_exact * 1e6:.1f} us/sample")
@@ -0,0 +1,165 @@
+# LoopTiming.py
+
+import math
+
+
+class TimingHistogram:
+    def __init__(self, min_time=1e-6, max_time=10.0, buckets_per_decade=20):
+        """
+        Histogram of durations in fixed, preallocated, logarithmically spaced buckets.
+
+        Recording is O(1) with no allocation, so it can stay enabled in production.
+        Percentiles are accurate to one bucket width (about 12 % with 20 buckets per decade).
+
+        :param min_time: Upper edge in seconds of the first bucket; shorter durations land in it
+        :param max_time: Lower edge in seconds of the last bucket; longer durations land in it
+        :param buckets_per_decade: Resolution of the buckets
+        """
+        self._min_ns = min_time * 1e9
+        self._scale = buckets_per_decade / math.log(10)
+        self._last = int(math.log(max_time / min_time) * self._scale) + 1
+        self.counts = [0] * (self._last + 1)
+        self.total = 0
+        self.sum_ns = 0
+        self.max_ns = 0
+
+    def record(self, value_ns):
+        if value_ns > self._min_ns:
+            idx = min(int(math.log(value_ns / self._min_ns) * self._scale) + 1, self._last)
+        else:
+            idx = 0
+        self.counts[idx] += 1
+        self.total += 1
+        self.sum_ns += value_ns
+        if value_ns > self.max_ns:
+            self.max_ns = value_ns
+
+    def _bucket_upper_ns(self, idx):
+        return self._min_ns * math.exp(idx / self._scale)
+
+    def percentile(self, q):
+        """
+        Duration in seconds below which a fraction q (0 ... 1) of the records lie; 0 when empty.
+        """
+        if not self.total:
+            return 0.0
+        rank = q * self.total
+        seen = 0
+        for idx, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return min(self._bucket_upper_ns(idx), self.max_ns) / 1e9
+        return self.max_ns / 1e9
+
+    def summary(self):
+        """
+        Dict of mean, p50, p99, p99.9 and max in seconds.
+        """
+        return {
+            "mean": self.sum_ns / self.total / 1e9 if self.total else 0.0,
+            "p50": self.percentile(0.5),
+            "p99": self.percentile(0.99),
+            "p99.9": self.percentile(0.999),
+            "max": self.max_ns / 1e9,
+        }
+
+    def reset(self):
+        for idx in range(len(self.counts)):
+            self.counts[idx] = 0
+        self.total = 0
+        self.sum_ns = 0
+        self.max_ns = 0
+
+
+class LoopTimingStats:
+    def __init__(self, period=None, buckets_per_decade=20):
+        """
+        Per-iteration timing of a periodic loop.
+
+        For every iteration the owner calls record() with its intended start (deadline),
+        actual wake-up and end time, all from time.perf_counter_ns(). Recorded are:
+            lateness:  wake-up minus deadline
+            execution: end minus wake-up
+            jitter:    |wake-up minus previous wake-up minus period|
+        and an overrun whenever an iteration ends after the next deadline.
+
+        Records are written by the loop thread only; snapshot() may be called from any
+        thread and is at most one iteration out of date.
+
+        :param period: Nominal period in seconds; None for loops paced by incoming data,
+                       whose jitter is then measured against the mean period
+        """
+        self.period_ns = None if period is None else int(period * 1e9)
+        self.lateness = TimingHistogram(buckets_per_decade=buckets_per_decade)
+        self.execution = TimingHistogram(buckets_per_decade=buckets_per_decade)
+        self.jitter = TimingHistogram(buckets_per_decade=buckets_per_decade)
+        self.iterations = 0
+        self.overruns = 0
+        self._first_wake_ns = None
+        self._last_wake_ns = None
+
+    def record(self, deadline_ns, wake_ns, end_ns):
+        """
+        :param deadline_ns: Intended start of the iteration, or None if the loop has no deadline
+        :param wake_ns: Actual start of the iteration
+        :param end_ns: End of the iteration
+        """
+        if self._last_wake_ns is None:
+            self._first_wake_ns = wake_ns
+        elif self.period_ns is not None:
+            self.jitter.record(abs(wake_ns - self._last_wake_ns - self.period_ns))
+        elif self.iterations >= 2:
+            mean_period_ns = (self._last_wake_ns - self._first_wake_ns) / (self.iterations - 1)
+            self.jitter.record(abs(wake_ns - self._last_wake_ns - mean_period_ns))
+        self._last_wake_ns = wake_ns
+        self.iterations += 1
+
+        if deadline_ns is not None:
+            self.lateness.record(max(0, wake_ns - deadline_ns))
+            if self.period_ns is not None and end_ns > deadline_ns + self.period_ns:
+                self.overruns += 1
+        self.execution.record(end_ns - wake_ns)
+
+    def rate(self):
+        """
+        Achieved iterations per second since the first iteration (or the last reset).
+        """
+        if self.iterations < 2:
+            return 0.0
+        return (self.iterations - 1) * 1e9 / (self._last_wake_ns - self._first_wake_ns)
+
+    def snapshot(self):
+        """
+        Dict with iteration and overrun counts, the achieved rate in Hz and a summary
+        (mean, p50, p99, p99.9, max in seconds) of lateness, execution time and jitter.
+        """
+        return {
+            "iterations": self.iterations,
+            "overruns": self.overruns,
+            "rate": self.rate(),
+            "lateness": self.lateness.summary(),
+            "execution": self.execution.summary(),
+            "jitter": self.jitter.summary(),
+        }
+
+    def reset(self):
+        self.lateness.reset()
+        self.execution.reset()
+        self.jitter.reset()
+        self.iterations = 0
+        self.overruns = 0
+        self._first_wake_ns = None
+        self._last_wake_ns = None
+
+    def format(self, name="loop"):
+        """
+        One-line human-readable summary, times in microseconds.
+        """
+        snap = self.snapshot()
+        parts = [f"{name}: {snap['iterations']} iterations at {snap['rate']:.1f} Hz, "
+                 f"{snap['overruns']} overruns"]
+        for key in ("lateness", "execution", "jitter"):
+            s = snap[key]
+            parts.append(f"{key} p50/p99/p99.9/max {s['p50'] * 1e6:.0f}/{s['p99'] * 1e6:.0f}/"
+                         f"{s['p99.9'] * 1e6:.0f}/{s['max'] * 1e6:.0f} us")
+        return "; ".join(parts)
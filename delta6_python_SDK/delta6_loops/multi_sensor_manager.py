@@ -0,0 +1,212 @@
+# MultiSensorManager.py
+
+import os
+import time
+import threading
+import logging
+import selectors
+from collections import deque
+from delta6_sensor_interface.frame_parser import FRAME_FORMAT_TIMESTAMPED
+from delta6_sensor_interface.interface import CMD_READ, SensorInterface, SensorSample, frame_host_times
+
+
+class MultiSensorManager:
+    def __init__(self, ports, stream_rate=500, poll_rate=100, buffer_size=1024,
+                 frame_format=FRAME_FORMAT_TIMESTAMPED):
+        """
+        Acquire several Delta6 encoder boards from a single thread.
+
+        All ports are watched with one selector, so N boards cost one thread instead of
+        one ReadEncoderLoop thread each, and no thread sits in a blocking serial read.
+        Selectors only accept serial ports on POSIX systems (Linux, macOS); on Windows
+        use one ReadEncoderLoop per board instead.
+
+        :param ports: dict of name -> serial port (or SensorInterface), or a list of port names
+        :param stream_rate: If given, every board streams frames at this rate in Hz.
+                            If None, all boards are polled together at poll_rate.
+        :param poll_rate: Rate in Hz of the simultaneous CMD_READ requests when not streaming
+        :param buffer_size: Samples kept per board
+        :param frame_format: Frame format requested from every board; the timestamped format
+                             lets latest_set() and consumers detect dropped frames
+        """
+        if os.name == "nt":
+            raise RuntimeError("MultiSensorManager needs a POSIX system: "
+                               "serial ports cannot be registered with selectors on Windows.")
+        if not isinstance(ports, dict):
+            ports = {port: port for port in ports}
+
+        self.stream_rate = stream_rate
+        self.poll_rate = poll_rate
+
+        self.sensors = {}
+        for name, port in ports.items():
+            sensor = port if isinstance(port, SensorInterface) else SensorInterface(port=port)
+            if sensor.ser is None:
+                raise RuntimeError(f"Failed to open the serial port of sensor '{name}'.")
+            sensor.set_frame_format(frame_format)
+            self.sensors[name] = sensor
+
+        # Per-sensor history of SensorSample, newest last
+        self.buffers = {name: deque(maxlen=buffer_size) for name in self.sensors}
+        self._lock = threading.Lock()
+
+        # Thread control
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def latest(self, name):
+        """
+        Newest SensorSample of one board, or None if none has arrived yet.
+        """
+        with self._lock:
+            buffer = self.buffers[name]
+            return buffer[-1] if buffer else None
+
+    def history(self, name, n=None):
+        """
+        Up to n newest samples of one board (all buffered samples if n is None), oldest first.
+        """
+        with self._lock:
+            samples = list(self.buffers[name])
+        return samples if n is None else samples[-n:]
+
+    def latest_set(self, max_skew=None):
+        """
+        Newest sample of every board, taken under one lock so the set is consistent.
+
+        :param max_skew: If given, the host receive times of the samples must lie within
+                         max_skew seconds of each other
+        :return: dict name -> SensorSample, or None if a board has no sample yet or the
+                 samples are further apart than max_skew
+        """
+        with self._lock:
+            if not all(self.buffers.values()):
+                return None
+            samples = {name: buffer[-1] for name, buffer in self.buffers.items()}
+
+        if max_skew is not None:
+            times = [sample.host_time for sample in samples.values()]
+            if max(times) - min(times) > max_skew:
+                return None
+        return samples
+
+    def stats(self):
+        """
+        Link health of every board, see SensorInterface.stats().
+        """
+        return {name: sensor.stats() for name, sensor in self.sensors.items()}
+
+    def _drain(self, name, selector):
+        """
+        Decode everything a readable port has buffered and store the samples.
+        """
+        sensor = self.sensors[name]
+        serial_errors = sensor.serial_errors
+        # A readable port with nothing waiting has usually gone away; a blocking read tells
+        batch = sensor.read_frames(block=not sensor.ser.in_waiting)
+        if sensor.serial_errors != serial_errors:
+            logging.error(f"Sensor '{name}' stopped responding, removed from acquisition.")
+            selector.unregister(sensor.ser)
+            return
+
+        n = len(batch.counts)
+        if not n:
+            return
+        # Spread a backlog back from the newest frame's decode time
+        frame_period = 1.0 / self.stream_rate if sensor.streaming else None
+        host_times = frame_host_times(sensor.last_sample.host_time, n, batch.device_time_us, frame_period)
+        samples = [SensorSample(
+            batch.counts[i].tolist(), int(batch.error_flags[i]),
+            None if batch.sequence is None else int(batch.sequence[i]),
+            None if batch.device_time_us is None else int(batch.device_time_us[i]),
+            float(host_times[i])) for i in range(n)]
+        with self._lock:
+            self.buffers[name].extend(samples)
+
+    def _spin_loop(self):
+        """
+        Internal method that multiplexes all ports until stop_spin() is called.
+        """
+        selector = selectors.DefaultSelector()
+        for name, sensor in self.sensors.items():
+            selector.register(sensor.ser, selectors.EVENT_READ, name)
+            if self.stream_rate:
+                sensor.start_streaming(self.stream_rate)
+
+        period = 1.0 / self.poll_rate
+        next_tick = time.perf_counter()
+        try:
+            while not self._stop_event.is_set() and selector.get_map():
+                if self.stream_rate:
+                    timeout = 0.1
+                else:
+                    now = time.perf_counter()
+                    if now >= next_tick:
+                        # Request all boards at once so their samples are taken together
+                        for key in list(selector.get_map().values()):
+                            self.sensors[key.data].send_command(CMD_READ)
+                        next_tick += period
+                        if now >= next_tick:
+                            next_tick = now + period  # Fell behind, restart the schedule
+                    timeout = max(0.0, next_tick - time.perf_counter())
+
+                for key, _ in selector.select(timeout):
+                    self._drain(key.data, selector)
+        finally:
+            if self.stream_rate:
+                for sensor in self.sensors.values():
+                    sensor.stop_streaming()
+            selector.close()
+
+    def loop_spin(self):
+        """
+        Start acquisition in a separate thread.
+        """
+        if self._thread is None:
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._spin_loop, daemon=True)
+            self._thread.start()
+            logging.info(f"MultiSensorManager thread started for {len(self.sensors)} sensors.")
+        else:
+            logging.warning("MultiSensorManager thread is already running.")
+
+    def stop_spin(self):
+        """
+        Stop acquisition gracefully.
+        """
+        if self._thread is not None:
+            self._stop_event.set()
+            self._thread.join()
+            self._thread = None
+            logging.info("MultiSensorManager thread has been stopped.")
+        else:
+            logging.warning("MultiSensorManager thread is not running.")
+
+    def shutdown(self):
+        """
+        Stop acquisition and close all ports.
+        """
+        if self._thread is not None:
+            self.stop_spin()
+        for sensor in self.sensors.values():
+            sensor.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO,
+                        format='%(asctime)s - %(levelname)s - %(message)s')
+
+    manager = MultiSensorManager({"left": "/dev/ttyACM0", "right": "/dev/ttyACM1"},
+                                 stream_rate=500)
+    manager.loop_spin()
+    try:
+        while True:
+            time.sleep(1)
+            samples = manager.latest_set(max_skew=0.005)
+            if samples:
+                logging.info({name: sample.counts for name, sample in samples.items()})
+            logging.info({name: (s.frames, s.dropped_frames) for name, s in manager.stats().items()})
+    except KeyboardInterrupt:
+        logging.info("MultiSensorManager stopped by user.")
+    finally:
+        manager.shutdown()
@@ -0,0 +1,147 @@
+# PeriodicExecutor.py
+
+import time
+import threading
+import logging
+
+OVERRUN_POLICIES = ("skip", "catch_up", "degrade")
+
+
+class PeriodicExecutor:
+    def __init__(self, func, period, overrun="skip", spin_time=0.0003, max_catch_up=10,
+                 max_degrade=8, recover_ticks=100, name=None, timing=None):
+        """
+        Call func every period seconds from a dedicated thread, on absolute deadlines.
+
+        Deadlines lie on a fixed grid start + k * period measured with perf_counter_ns,
+        so the execution time of func does not accumulate into drift. The thread sleeps
+        until spin_time before each deadline and busy-waits the rest, which trades a little
+        CPU for sub-millisecond wake-up accuracy.
+
+        :param func: Callable without arguments; exceptions are logged and the schedule goes on
+        :param period: Period in seconds
+        :param overrun: What to do when func runs past the next deadline:
+                        "skip"     - drop the missed ticks and continue on the original grid
+                        "catch_up" - run the missed ticks back to back (at most max_catch_up,
+                                     older ones are dropped)
+                        "degrade"  - double the period (up to max_degrade times the nominal
+                                     period) and halve it again after recover_ticks on-time ticks
+        :param spin_time: Seconds before each deadline spent busy-waiting instead of sleeping; 0 disables
+        :param name: Thread name
+        :param timing: Optional LoopTimingStats that records lateness, execution time and jitter of every call
+        """
+        if period <= 0:
+            raise ValueError(f"Period must be positive, got {period}.")
+        if overrun not in OVERRUN_POLICIES:
+            raise ValueError(f"Overrun policy must be one of {OVERRUN_POLICIES}, got '{overrun}'.")
+
+        self.func = func
+        self.period_ns = int(period * 1e9)
+        self.overrun = overrun
+        self.spin_ns = int(spin_time * 1e9)
+        self.max_catch_up = max_catch_up
+        self.max_degrade = max_degrade
+        self.recover_ticks = recover_ticks
+        self.name = name
+        self.timing = timing
+
+        # Period in use; differs from period_ns only under the "degrade" policy
+        self.current_period_ns = self.period_ns
+
+        # Counters
+        self.ticks = 0
+        self.overruns = 0
+        self.skipped_ticks = 0
+        self.errors = 0
+
+        # Thread control
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """
+        Start calling func in a separate thread; the first call is immediate.
+        """
+        if self._thread is not None:
+            logging.warning("PeriodicExecutor is already running.")
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self.run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        """
+        Stop after the current call of func returns.
+        """
+        self._stop_event.set()
+        if self._thread is None:
+            return
+        if self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        self._thread = None
+
+    def is_running(self):
+        return self._thread is not None
+
+    def _wait_until(self, deadline_ns):
+        """
+        Sleep until shortly before deadline_ns, then spin up to it.
+
+        :return: False if stop() was called meanwhile
+        """
+        remaining = deadline_ns - time.perf_counter_ns() - self.spin_ns
+        if remaining > 0 and self._stop_event.wait(remaining / 1e9):
+            return False
+        while time.perf_counter_ns() < deadline_ns:
+            pass
+        return not self._stop_event.is_set()
+
+    def run(self):
+        """
+        Run the schedule in the calling thread until stop() is called; start() runs it in a new thread.
+        """
+        deadline = time.perf_counter_ns()
+        on_time = 0
+        catching_up = False  # Running missed ticks back to back after an overrun
+        while self._wait_until(deadline):
+            wake = time.perf_counter_ns()
+            self.ticks += 1
+            try:
+                self.func()
+            except Exception:
+                self.errors += 1
+                logging.exception("Error in periodic task.")
+            if self.timing is not None:
+                self.timing.record(deadline, wake, time.perf_counter_ns())
+
+            deadline += self.current_period_ns
+            now = time.perf_counter_ns()
+            if now <= deadline:
+                on_time += 1
+                catching_up = False
+                if self.overrun == "degrade" and on_time >= self.recover_ticks and \
+                        self.current_period_ns > self.period_ns:
+                    self.current_period_ns = max(self.period_ns, self.current_period_ns // 2)
+                    on_time = 0
+                continue
+
+            # func ran past the next deadline; catch-up ticks that are still late belong to the same overrun
+            if not catching_up:
+                self.overruns += 1
+            on_time = 0
+            missed = (now - deadline) // self.current_period_ns + 1
+            if self.overrun == "catch_up":
+                catching_up = True
+                if missed > self.max_catch_up:
+                    # Too far behind; drop the oldest ticks instead of bursting forever
+                    dropped = missed - self.max_catch_up
+                    self.skipped_ticks += dropped
+                    deadline += dropped * self.current_period_ns
+            elif self.overrun == "skip":
+                self.skipped_ticks += missed
+                deadline += missed * self.current_period_ns
+            else:
+                self.skipped_ticks += missed
+                deadline += missed * self.current_period_ns
+                self.current_period_ns = min(self.current_period_ns * 2,
+                                             self.period_ns * self.max_degrade)
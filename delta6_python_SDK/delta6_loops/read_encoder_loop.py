@@ -3,24 +3,58 @@
 import time
 import threading
 import logging
-from delta6_sensor_interface.interface import SensorInterface
+import numpy as np
+from delta6_loops.loop_timing import LoopTimingStats
+from delta6_loops.periodic_executor import PeriodicExecutor
+from delta6_loops.sample_ring_buffer import SampleRingBuffer
+from delta6_sensor_interface.health import RateLimitedLogger
+from delta6_sensor_interface.interface import SensorInterface, frame_host_times
+from delta6_utils.math_tools import counts_to_radians
+
+# How _spin_loop paces loop(), see loop_spin()
+SCHEDULES = ("sleep", "deadline", "frames")
 
 
 class ReadEncoderLoop:
-    def __init__(self, nano_port, encoder_dir):
+    def __init__(self, nano_port, encoder_dir, stream_rate=None, pipeline_depth=0,
+                 timing_dump_interval=None, history_size=4096):
         """
         Initialize the ReadEncoderLoop by loading configuration and establishing a connection to the robot.
         Also initializes the SensorInterface for reading encoder data.
+
+        :param stream_rate: If given, the board streams frames at this rate in Hz and the
+                            loop consumes them as they arrive instead of polling.
+        :param pipeline_depth: When polling, keep this many (1 or 2) read requests in flight,
+                               see SensorInterface.enable_pipelining(). 0 disables it.
+        :param timing_dump_interval: If set, logs the loop timing summary every this many seconds.
+        :param history_size: Number of samples kept in self.samples, see SampleRingBuffer.
         """
 
         self.encoder_dir = encoder_dir
+        self.stream_rate = stream_rate
 
         # Initialize encoder_result with default values
         self.encoder_result = [0.0, 0.0, 0.0, 0.0, 0.0, 0.0]
 
+        # Raw counts behind encoder_result (direction applied)
+        self.encoder_counts = [0, 0, 0, 0, 0, 0]
+
         # Lock to ensure thread-safe access to encoder_result
         self.encoder_lock = threading.Lock()
 
+        # Every received frame, error frames included, for lock-free readers:
+        # samples.latest(), samples.since(seq) and samples.window(n) return zero-copy views
+        self.samples = SampleRingBuffer(history_size)
+        self._dir = np.asarray(encoder_dir, dtype=np.int32)
+
+        # Notification of new samples: callbacks run in the acquisition thread,
+        # wait_for_samples() blocks other threads on the condition
+        self._subscribers = []
+        self._new_samples = threading.Condition()
+
+        # Read failures repeat every tick while a fault lasts, so log them rate-limited
+        self._log = RateLimitedLogger(logging.getLogger())
+
         # Initialize SensorInterface for reading encoder data
         try:
             self.sensor_interface = SensorInterface(port=nano_port)
@@ -28,9 +62,20 @@ class ReadEncoderLoop:
             logging.error(f"Failed to initialize SensorInterface: {e}")
             exit(1)  # Exit if SensorInterface initialization fails
 
+        if pipeline_depth:
+            self.sensor_interface.enable_pipelining(pipeline_depth)
+
+        # Loop timing (lateness, execution time, jitter), created by loop_spin()
+        self.timing = None
+        self.timing_dump_interval = timing_dump_interval
+        self._last_dump_ns = 0
+
         # Thread control
         self._stop_event = threading.Event()
         self._thread = None
+        self._executor = None
+        self.schedule = None
+        self._frame_period = None  # Seconds between streamed frames, set while streaming
 
     def loop(self):
         """
@@ -38,19 +83,88 @@ class ReadEncoderLoop:
         """
         try:
             # Read encoder data using SensorInterface
-            encoder_data = self.sensor_interface.read_radians()
+            if self.sensor_interface.streaming:
+                # Drain every frame that arrived since the last call
+                batch = self.sensor_interface.read_frames(block=True)
+                frame_counts, flags = batch.counts, batch.error_flags
+                device_time_us = batch.device_time_us
+            else:
+                sample = self.sensor_interface.read_sample()
+                if sample is None:
+                    frame_counts, flags = np.empty((0, 6), dtype=np.int32), np.empty(0, dtype=np.uint8)
+                    device_time_us = None
+                else:
+                    frame_counts, flags = np.array([sample.counts]), np.array([sample.error_flags])
+                    device_time_us = None if sample.device_time_us is None else np.array([sample.device_time_us])
+
+            if len(frame_counts):
+                counts = frame_counts * self._dir
+                angles = np.round(counts / 16383.0 * (2 * np.pi), 5)  # As counts_to_radians
+                first_seq = self.samples.last_seq + 1
+                self.samples.write_batch(
+                    frame_host_times(self.sensor_interface.last_sample.host_time, len(counts),
+                                     device_time_us, self._frame_period),
+                    counts, angles, flags, device_time_us)
+                self._publish(first_seq)
+                if flags[-1]:
+                    for i in range(6):
+                        if flags[-1] & (1 << i):
+                            self._log.warning("Sensor %d error.", i + 1)
 
-            # Update encoder_result with thread safety
-            if encoder_data:
+            # Update encoder_result with thread safety, from the newest error-free frame
+            good = np.flatnonzero(flags == 0)
+            if len(good):
+                newest = counts[good[-1]].tolist()
                 with self.encoder_lock:
+                    self.encoder_counts = newest
                     self.encoder_result = [
-                        a * b for a, b in zip(encoder_data, self.encoder_dir)]
+                        counts_to_radians(c) for c in newest]
 
             else:
-                logging.warning("Failed to read Encoder data")
+                self._log.warning("Failed to read Encoder data")
 
         except Exception as e:
-            logging.error(f"Error getting encoder data: {e}")
+            self._log.error("Error getting encoder data: %s", e)
+
+    def _publish(self, first_seq):
+        """
+        Wake up wait_for_samples() and pass the samples from first_seq on to the subscribers.
+        """
+        with self._new_samples:
+            self._new_samples.notify_all()
+        if self._subscribers:
+            new_samples = self.samples.since(first_seq - 1)
+            for callback in self._subscribers:
+                try:
+                    callback(new_samples)
+                except Exception as e:
+                    self._log.error("Error in sample subscriber: %s", e)
+
+    def subscribe(self, callback):
+        """
+        Call callback(samples) from the acquisition thread whenever new frames arrive.
+
+        samples is a SampleRingBuffer view of the new frames, oldest first, error frames included.
+        The callback delays the next read, so it should only hand the samples on; use
+        wait_for_samples() from another thread for heavier processing.
+        """
+        # Replaced rather than appended to, so _publish() can iterate without a lock
+        self._subscribers = self._subscribers + [callback]
+
+    def unsubscribe(self, callback):
+        self._subscribers = [cb for cb in self._subscribers if cb is not callback]
+
+    def wait_for_samples(self, seq, timeout=None):
+        """
+        Block until a sample newer than seq is in self.samples.
+
+        :param seq: Sequence number of the last sample already seen, e.g. samples.last_seq
+        :param timeout: Seconds to wait at most; None waits forever
+        :return: Sequence number of the newest sample, equal to seq on timeout
+        """
+        with self._new_samples:
+            self._new_samples.wait_for(lambda: self.samples.last_seq > seq, timeout)
+        return self.samples.last_seq
 
     def get_encoder_reading(self):
         """
@@ -61,29 +175,112 @@ class ReadEncoderLoop:
         with self.encoder_lock:
             return self.encoder_result.copy()
 
+    def get_encoder_counts(self):
+        """
+        Get the raw counts behind the latest encoder reading, with encoder_dir applied.
+
+        :return: List of six signed integer counts.
+        """
+        with self.encoder_lock:
+            return self.encoder_counts.copy()
+
+    def get_timing(self):
+        """
+        Get the timing statistics of the spinning loop, see LoopTimingStats.snapshot().
+
+        :return: Dict with iteration and overrun counts, achieved rate and
+                 lateness / execution / jitter percentiles in seconds, or None if not started
+        """
+        return self.timing.snapshot() if self.timing is not None else None
+
+    def get_achieved_rate(self):
+        """
+        Get the rate in Hz at which loop() actually ran since loop_spin(), 0.0 if not started.
+        """
+        return self.timing.rate() if self.timing is not None else 0.0
+
+    def _record_timing(self, deadline_ns, wake_ns):
+        self.timing.record(deadline_ns, wake_ns, time.perf_counter_ns())
+        self._dump_timing()
+
+    def _dump_timing(self):
+        now = time.perf_counter_ns()
+        if self.timing_dump_interval and now - self._last_dump_ns >= self.timing_dump_interval * 1e9:
+            self._last_dump_ns = now
+            logging.info(self.timing.format("ReadEncoderLoop"))
+
+    def _deadline_tick(self):
+        self.loop()
+        self._dump_timing()
+
     def _spin_loop(self, frequency):
         """
         Internal method to run the spinning loop in a separate thread.
 
         :param frequency: Loop frequency in Hz.
         """
+        if self.schedule == "frames":
+            # Reads block until the next pushed frame, so the board's stream paces the loop
+            rate = self.stream_rate or frequency
+            self._frame_period = 1.0 / rate
+            self.sensor_interface.start_streaming(rate)
+            logging.info(
+                f"ReadForceLoop thread started, consuming frames streamed at {rate} Hz")
+            while not self._stop_event.is_set():
+                wake = time.perf_counter_ns()
+                self.loop()
+                self._record_timing(None, wake)
+            self.sensor_interface.stop_streaming()
+            self._frame_period = None
+            return
+
         interval = 1.0 / frequency  # Seconds
+        if self.schedule == "deadline":
+            # Ticks on absolute deadlines, so the read time does not stretch the period.
+            # No spinning before deadlines: this thread should not hold the GIL for timing alone.
+            logging.info(
+                f"ReadForceLoop thread started at {frequency} Hz on absolute deadlines")
+            self._executor = PeriodicExecutor(
+                self._deadline_tick, interval, spin_time=0, timing=self.timing)
+            if not self._stop_event.is_set():
+                self._executor.run()
+            return
+
         logging.info(
             f"ReadForceLoop thread started at {frequency} Hz (every {interval * 1000:.2f} ms)")
+        deadline = None
         while not self._stop_event.is_set():
             # Execute the loop task
+            wake = time.perf_counter_ns()
             self.loop()
+            self._record_timing(deadline, wake)
 
-            # Sleep for the interval duration
+            # Sleep for the interval duration; the period is interval plus the read time
+            deadline = time.perf_counter_ns() + int(interval * 1e9)
             time.sleep(interval)
 
-    def loop_spin(self, frequency=100):
+    def loop_spin(self, frequency=100, schedule=None):
         """
         Start the spinning loop in a separate thread that runs the loop method at the specified frequency.
 
-        :param frequency: Loop frequency in Hz. Default is 100 Hz.
+        :param frequency: Loop frequency in Hz. Default is 100 Hz. Ignored when stream_rate is set.
+        :param schedule: How loop() is paced:
+                         "deadline" - on absolute tick times, so the period does not drift with the read time
+                         "sleep"    - sleep 1 / frequency after every read (period = interval + read time)
+                         "frames"   - as fast as frames arrive from the board, which streams at
+                                      stream_rate (or frequency if stream_rate is not set)
+                         Default is "frames" if stream_rate is set, otherwise "deadline".
         """
+        if schedule is None:
+            schedule = "frames" if self.stream_rate else "deadline"
+        if schedule not in SCHEDULES:
+            raise ValueError(f"Schedule must be one of {SCHEDULES}, got '{schedule}'.")
+
         if self._thread is None:
+            self.schedule = schedule
+            self.timing = LoopTimingStats(None if schedule == "frames" else 1.0 / frequency)
+            self._last_dump_ns = time.perf_counter_ns()
+            self._stop_event.clear()
             self._thread = threading.Thread(
                 target=self._spin_loop, args=(frequency,), daemon=True)
             self._thread.start()
@@ -98,8 +295,13 @@ class ReadEncoderLoop:
         """
         if self._thread is not None:
             self._stop_event.set()
+            if self._executor is not None:
+                self._executor.stop()
             self._thread.join()
-            logging.info("ReadEncoderLoop spinning thread has been stopped.")
+            self._executor = None
+            logging.info(
+                f"ReadEncoderLoop spinning thread has been stopped, achieved {self.get_achieved_rate():.1f} Hz "
+                f"over {self.timing.iterations} iterations ({self.schedule} schedule).")
             self._thread = None
         else:
             logging.warning("ReadEncoderLoop spinning thread is not running.")
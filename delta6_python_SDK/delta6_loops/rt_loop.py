@@ -1,21 +1,30 @@
-from apscheduler.schedulers.background import BackgroundScheduler
 import threading
 import time
+from delta6_loops.loop_timing import LoopTimingStats
+from delta6_loops.periodic_executor import PeriodicExecutor
 
 
 class RTLoop:
-    def __init__(self, freq=50, print_frequency=False):
+    def __init__(self, freq=50, print_frequency=False, overrun="skip", timing_dump_interval=None):
         """
         Initialize the RTLoop class.
 
         :param freq: Loop frequency in Hz, default is 50
         :param print_frequency: If True, prints loop frequency and elapsed time in loop_spin, default is False
+        :param overrun: What happens when loop() runs longer than one period: "skip", "catch_up"
+                        or "degrade", see PeriodicExecutor. Default is "skip"
+        :param timing_dump_interval: If set, prints the loop timing summary every this many seconds
         """
         self.freq = freq
         self.count = 0
         self.hz = 0  # Current loop frequency
         self.time_from_start = 0  # Elapsed time in milliseconds
-        self.scheduler = BackgroundScheduler()
+        self.overrun = overrun
+        self.executor = None  # Runs loop() on absolute deadlines, created in setup()
+        self._housekeeping = None  # Updates hz and time_from_start every 100 ms
+        self.timing = LoopTimingStats(1 / freq)  # Lateness, execution time and jitter of loop()
+        self.timing_dump_interval = timing_dump_interval
+        self._last_dump_time = None
         self._lock = threading.Lock()  # Thread lock to ensure thread safety
         self._start_time = None  # To track the start time
         self._last_update_time = None  # To track the last frequency update time
@@ -30,21 +39,20 @@ class RTLoop:
         self._start_time = time.perf_counter()
         self._last_update_time = self._start_time
 
-        # Add loop task
-        self.scheduler.add_job(self.loop, 'interval',
-                               seconds=1/self.freq, id='loop_job')
+        # Loop task on a high-resolution deadline schedule
+        self.executor = PeriodicExecutor(
+            self.loop, 1 / self.freq, overrun=self.overrun, name=f"{type(self).__name__}.loop",
+            timing=self.timing)
+        self._last_dump_time = self._start_time
 
-        # Add frequency updating task
-        self.scheduler.add_job(self.update_frequency,
-                               'interval', seconds=1, id='update_freq_job')
+        # Frequency and time tracking (updates every 100 ms for better resolution), no spinning
+        self._housekeeping = PeriodicExecutor(
+            self._update_counters, 0.1, spin_time=0, name=f"{type(self).__name__}.housekeeping")
 
-        # Add time tracking task (updates every 100 ms for better resolution)
-        self.scheduler.add_job(self.update_time_from_start,
-                               'interval', seconds=0.1, id='time_job')
-
-        # Start the scheduler
-        self.scheduler.start()
-        print("Scheduler started.")
+        # Start the executors
+        self.executor.start()
+        self._housekeeping.start()
+        print("Executor started.")
 
     def loop(self):
         """
@@ -56,6 +64,15 @@ class RTLoop:
         # Add other operations that need to be executed in the loop here
         # For example, sensor reading, data processing, etc.
 
+    def _update_counters(self):
+        self.update_time_from_start()
+        now = time.perf_counter()
+        if now - self._last_update_time >= 1.0:
+            self.update_frequency()
+        if self.timing_dump_interval and now - self._last_dump_time >= self.timing_dump_interval:
+            self._last_dump_time = now
+            print(self.timing.format(type(self).__name__))
+
     def update_frequency(self):
         """
         Calculate and update the current loop frequency.
@@ -91,6 +108,15 @@ class RTLoop:
         with self._lock:
             return self.hz
 
+    def get_timing(self):
+        """
+        Get the timing statistics of loop(), see LoopTimingStats.snapshot().
+
+        :return: Dict with iteration and overrun counts, achieved rate and
+                 lateness / execution / jitter percentiles in seconds
+        """
+        return self.timing.snapshot()
+
     def get_time_from_start(self):
         """
         Get the elapsed time since the start of the loop in milliseconds.
@@ -102,10 +128,12 @@ class RTLoop:
 
     def shutdown(self):
         """
-        Shutdown the scheduler to ensure the program exits cleanly.
+        Stop the executors to ensure the program exits cleanly.
         """
-        self.scheduler.shutdown()
-        print("Scheduler shutdown.")
+        if self.executor is not None:
+            self.executor.stop()
+            self._housekeeping.stop()
+        print("Executor shutdown.")
 
     def loop_spin(self):
         """
@@ -0,0 +1,140 @@
+# SampleRingBuffer.py
+
+import numpy as np
+
+SAMPLE_DTYPE = np.dtype([
+    ('seq', 'i8'),             # Buffer sequence number, 1 for the first sample written
+    ('timestamp', 'f8'),       # Host time of the frame on the time.perf_counter() clock
+    ('device_time_us', 'i8'),  # Device sample time in us (timestamped frames), -1 if unknown
+    ('counts', 'i4', (6,)),    # Signed encoder counts, encoder direction applied
+    ('angles', 'f8', (6,)),    # Joint angles in rad
+    ('flags', 'u1'),           # Sensor error flags of the frame, bit i for sensor i+1
+])
+
+
+class SampleRingBuffer:
+    def __init__(self, capacity=4096):
+        """
+        Preallocated history of encoder samples with one writer and lock-free readers.
+
+        Every sample is stored twice, at slot i and slot i + capacity, so any run of up to
+        capacity consecutive samples is contiguous in memory and readers get it as a
+        zero-copy view. Like a seqlock, the writer keeps two counters: before copying it
+        announces the newest sequence number it is about to write, and after copying it
+        publishes that number as last_seq. Readers take last_seq first, read, and may check
+        is_intact() against the announced counter to confirm the writer has not started to
+        overwrite the samples meanwhile.
+
+        :param capacity: Number of samples kept
+        """
+        self.capacity = int(capacity)
+        self._data = np.zeros(2 * self.capacity, dtype=SAMPLE_DTYPE)
+        self._written = 0  # Sequence number of the newest published sample
+        self._writing = 0  # Sequence number of the newest sample whose write has begun
+
+    @property
+    def last_seq(self):
+        """
+        Sequence number of the newest sample, 0 while empty.
+        """
+        return self._written
+
+    def write(self, timestamp, counts, angles, flags=0, device_time_us=-1):
+        """
+        Append one sample (writer thread only).
+
+        :return: its sequence number
+        """
+        seq = self._written + 1
+        slot = (seq - 1) % self.capacity
+        self._writing = seq
+        for idx in (slot, slot + self.capacity):
+            record = self._data[idx]
+            record['seq'] = seq
+            record['timestamp'] = timestamp
+            record['device_time_us'] = device_time_us
+            record['counts'] = counts
+            record['angles'] = angles
+            record['flags'] = flags
+        self._written = seq
+        return seq
+
+    def write_batch(self, timestamps, counts, angles, flags, device_time_us=None):
+        """
+        Append N samples at once (writer thread only); arrays have N rows, oldest first.
+
+        :param device_time_us: N device sample times in us, or None if the frames carry none
+        :return: sequence number of the newest sample
+        """
+        n = len(counts)
+        if not n:
+            return self._written
+        if device_time_us is None:
+            device_time_us = -1
+        if n > self.capacity:
+            timestamps, counts, angles, flags, device_time_us = (
+                np.broadcast_to(a, (n,) + np.shape(a)[1:])[-self.capacity:]
+                for a in (timestamps, counts, angles, flags, device_time_us))
+            skipped, n = n - self.capacity, self.capacity
+        else:
+            skipped = 0
+
+        first = self._written + skipped + 1
+        seqs = np.arange(first, first + n)
+        slots = (seqs - 1) % self.capacity
+        # Announce the whole batch before touching its slots, see is_intact()
+        self._writing = int(seqs[-1])
+        for idx in (slots, slots + self.capacity):
+            self._data['seq'][idx] = seqs
+            self._data['timestamp'][idx] = timestamps
+            self._data['device_time_us'][idx] = device_time_us
+            self._data['counts'][idx] = counts
+            self._data['angles'][idx] = angles
+            self._data['flags'][idx] = flags
+        self._written = int(seqs[-1])
+        return self._written
+
+    def _view(self, n, written):
+        start = (written - n) % self.capacity
+        return self._data[start:start + n]
+
+    def latest(self):
+        """
+        Newest sample as a record view (fields as SAMPLE_DTYPE), or None while empty.
+        """
+        written = self._written
+        if not written:
+            return None
+        return self._data[(written - 1) % self.capacity]
+
+    def window(self, n):
+        """
+        View of the newest min(n, available) samples, oldest first.
+        """
+        written = self._written
+        return self._view(min(int(n), written, self.capacity), written)
+
+    def since(self, seq, until=None):
+        """
+        View of the samples newer than seq, up to and including until (default: the newest),
+        oldest first, e.g. since(last_seq) with the last_seq noted at the previous call.
+
+        With until <= last_seq noted by the caller, the view holds exactly the samples
+        seq + 1 ... until as long as that is at most capacity samples. Otherwise, and if
+        more than capacity samples were written since seq, only the newest capacity are returned.
+        """
+        written = self._written if until is None else min(int(until), self._written)
+        return self._view(max(0, min(written - int(seq), self.capacity)), written)
+
+    def is_intact(self, first_seq):
+        """
+        True if the sample first_seq and all newer ones have not been overwritten since they were read.
+
+        A view shares memory with the buffer, so its own 'seq' field cannot tell; take
+        first_seq from your own bookkeeping. For a snapshot that is guaranteed consistent:
+            last = ring.last_seq
+            snapshot = ring.since(last - n, last).copy()  # Samples last - n + 1 ... last
+            if not ring.is_intact(last - n + 1): ...  # Retry
+        """
+        # The slot of first_seq is reused by first_seq + capacity, which may be mid-write
+        return self._writing - int(first_seq) < self.capacity
@@ -0,0 +1,169 @@
+# WrenchPipeline.py
+
+import time
+import threading
+import logging
+from delta6_kinematics.delta6_analytics import DeltaRobot
+from delta6_loops.loop_timing import TimingHistogram
+
+
+class WrenchPipeline:
+    def __init__(self, read_encoder_loop, robot=None, on_state=None, coalesce=False,
+                 latency_dump_interval=None):
+        """
+        Compute pose and wrench once for every new encoder sample, in a dedicated thread.
+
+        Instead of polling get_encoder_reading() on its own timer, the pipeline waits on
+        ReadEncoderLoop.wait_for_samples() and runs the kinematics only when the acquisition
+        thread has published a fresh sample, so no sample is missed and none is computed twice.
+        Frames with a sensor error flag are counted and left out.
+
+        The sample-to-wrench latency, from the host time of the frame (SampleRingBuffer
+        'timestamp', which includes the wait of frames in a backlog) to the end of
+        compute_state(), is recorded per sample.
+
+        :param read_encoder_loop: Running ReadEncoderLoop whose samples are consumed
+        :param robot: DeltaRobot used for the kinematics, owned by the pipeline thread from start() on
+        :param on_state: Optional callback on_state(seq, state) with every Delta6State, called in the pipeline thread
+        :param coalesce: If True, only the newest of several pending samples is computed
+                         (the others are counted as skipped), which bounds the latency when the
+                         kinematics are slower than the sample rate
+        :param latency_dump_interval: If set, logs the latency summary every this many seconds
+        """
+        self.encoder_loop = read_encoder_loop
+        self.robot = robot if robot is not None else DeltaRobot()
+        self.on_state = on_state
+        self.coalesce = coalesce
+        self.latency_dump_interval = latency_dump_interval
+
+        # Sample-to-wrench latency
+        self.latency = TimingHistogram()
+
+        # Counters
+        self.processed = 0
+        self.skipped = 0        # Not computed because coalesce dropped them
+        self.missed = 0         # Overwritten in the ring buffer before the pipeline got to them
+        self.error_samples = 0  # Frames with a sensor error flag
+
+        # Newest (seq, Delta6State); replaced as a whole, so readers need no lock
+        self._latest = None
+
+        # Thread control
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def latest(self):
+        """
+        Get the newest result.
+
+        :return: (seq, Delta6State) of the last computed sample, or None if none yet
+        """
+        return self._latest
+
+    def stats(self):
+        """
+        Dict of the counters and the latency summary (mean, p50, p99, p99.9, max in seconds).
+        """
+        return {
+            "processed": self.processed,
+            "skipped": self.skipped,
+            "missed": self.missed,
+            "error_samples": self.error_samples,
+            "latency": self.latency.summary(),
+        }
+
+    def format(self):
+        """
+        One-line human-readable summary, latencies in microseconds.
+        """
+        s = self.latency.summary()
+        return (f"WrenchPipeline: {self.processed} samples, {self.skipped} skipped, {self.missed} missed, "
+                f"{self.error_samples} with errors; latency p50/p99/p99.9/max "
+                f"{s['p50'] * 1e6:.0f}/{s['p99'] * 1e6:.0f}/{s['p99.9'] * 1e6:.0f}/{s['max'] * 1e6:.0f} us")
+
+    def _process(self, last_seq, newest):
+        """
+        Compute the state of every usable sample from last_seq + 1 to newest.
+
+        Sequence numbers come from this bookkeeping, never from the records, which the
+        writer may already have reused for newer samples.
+
+        :return: Sequence number of the last sample handled
+        """
+        ring = self.encoder_loop.samples
+        lapped = newest - last_seq - (ring.capacity - 1)
+        if lapped > 0:
+            # The oldest pending samples are gone or about to be overwritten
+            self.missed += lapped
+            last_seq += lapped
+        first = last_seq + 1
+        if self.coalesce and newest > first:
+            self.skipped += newest - first
+            first = newest
+
+        samples = ring.since(first - 1, newest)
+        for seq, record in enumerate(samples, first):
+            flags = int(record['flags'])
+            counts = record['counts'].tolist()
+            timestamp = float(record['timestamp'])
+            if not ring.is_intact(seq):
+                # Lapped by the writer while computing earlier samples
+                self.missed += 1
+                continue
+            if flags:
+                self.error_samples += 1
+                continue
+
+            self.robot.update_from_counts(counts)
+            state = self.robot.compute_state()
+            self.latency.record((time.perf_counter() - timestamp) * 1e9)
+            self.processed += 1
+            self._latest = (seq, state)
+            if self.on_state is not None:
+                self.on_state(seq, state)
+        return newest
+
+    def _run(self):
+        """
+        Internal method that waits for samples and processes them until stop() is called.
+        """
+        ring = self.encoder_loop.samples
+        last_seq = ring.last_seq  # Start with the next sample, not the history
+        last_dump = time.perf_counter()
+        while not self._stop_event.is_set():
+            # Time out regularly to notice stop()
+            newest = self.encoder_loop.wait_for_samples(last_seq, timeout=0.1)
+            if newest > last_seq:
+                try:
+                    last_seq = self._process(last_seq, newest)
+                except Exception as e:
+                    last_seq = newest
+                    logging.error(f"Error computing the wrench: {e}")
+
+            if self.latency_dump_interval and time.perf_counter() - last_dump >= self.latency_dump_interval:
+                last_dump = time.perf_counter()
+                logging.info(self.format())
+
+    def start(self):
+        """
+        Start processing samples in a separate thread.
+        """
+        if self._thread is None:
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, name="WrenchPipeline", daemon=True)
+            self._thread.start()
+            logging.info("WrenchPipeline thread started.")
+        else:
+            logging.warning("WrenchPipeline thread is already running.")
+
+    def stop(self):
+        """
+        Stop processing after the current sample.
+        """
+        if self._thread is not None:
+            self._stop_event.set()
+            self._thread.join()
+            self._thread = None
+            logging.info(f"WrenchPipeline thread has been stopped. {self.format()}")
+        else:
+            logging.warning("WrenchPipeline thread is not running.")
@@ -0,0 +1,404 @@
+"""
+Asyncio interface to the Delta6 encoder board.
+
+The serial port is opened non-blocking and its file descriptor is watched with
+loop.add_reader, so any number of sensors and other I/O can share one event
+loop without a thread per sensor:
+
+    sensor = await AsyncSensorInterface.open('/dev/ttyACM0')
+    sample = await sensor.read()
+    async with sensor.stream(rate_hz=500) as samples:
+        async for sample in samples:
+            ...
+
+add_reader needs a selector event loop, i.e. a POSIX system (on Windows the
+default proactor loop does not support it).
+"""
+
+import asyncio
+from collections import deque
+import time
+import weakref
+import serial
+from delta6_sensor_interface.interface import (
+    CMD_CALIBRATION, CMD_HELLO, CMD_READ, CMD_SET_FORMAT, CMD_STREAM, SensorInterface, SensorSample,
+    is_ready_reply)
+
+
+class AsyncSensorInterface(SensorInterface):
+    def __init__(self, port='/dev/ttyACM0', baudrate=115200, queue_size=256):
+        """
+        Open the serial port without blocking. Use AsyncSensorInterface.open() from a coroutine,
+        which also waits for the board and starts watching the port.
+
+        :param queue_size: streamed samples kept for a slow consumer; the oldest are dropped beyond it
+        """
+        self.connect_time = None
+        self._open_time = time.perf_counter()
+        try:
+            self.ser = serial.Serial(port=port, baudrate=baudrate, timeout=0)
+            self.timeout = 0
+            self.baudrate = baudrate
+            print(f"Serial port {port} opened successfully.")
+
+        except serial.SerialException as e:
+            print(f"Error opening serial port {port}: {e}")
+            self.ser = None
+
+        self._init_state()
+
+        self.loop = None
+        self._waiters = deque()
+        self._samples = deque(maxlen=queue_size)
+        self._sample_ready = None
+        self.overflowed_samples = 0
+        # A read timed out, so its reply may still arrive and be taken for the next one
+        self._stale = False
+        # Weak reference to the SampleStream that started streaming, so an abandoned one is noticed
+        self._stream = None
+
+    @classmethod
+    async def open(cls, port='/dev/ttyACM0', baudrate=115200, queue_size=256, ready_timeout=3.0):
+        """
+        Open the port, wait for the board's ready handshake and attach to the running loop.
+        """
+        sensor = cls(port, baudrate, queue_size)
+        if sensor.ser is None:
+            return sensor
+        ready = await sensor.wait_ready_async(ready_timeout)
+        if ready:
+            await sensor.reset_board_async()
+        sensor.attach()
+        if ready:
+            sensor.connect_time = time.perf_counter() - sensor._open_time
+            print(f"Board ready after {sensor.connect_time:.3f} s.")
+        else:
+            print(f"Board not ready after {ready_timeout:.1f} s.")
+        return sensor
+
+    async def wait_ready_async(self, timeout=3.0, probe_interval=0.25):
+        """
+        Wait for the board to answer CMD_HELLO or CMD_READ without blocking the loop, see wait_ready().
+        Must be called before attach().
+        """
+        loop = asyncio.get_running_loop()
+        ready = loop.create_future()
+        buf = bytearray()
+
+        def on_readable():
+            try:
+                buf.extend(self.ser.read(self.ser.in_waiting or 1))
+            except serial.SerialException as e:
+                if not ready.done():
+                    ready.set_exception(e)
+                return
+            if not ready.done() and is_ready_reply(buf):
+                ready.set_result(True)
+            del buf[:-64]
+
+        loop.add_reader(self.ser.fileno(), on_readable)
+        try:
+            deadline = loop.time() + timeout
+            while loop.time() < deadline:
+                self.send_command(CMD_HELLO)
+                self.send_command(CMD_READ)  # Answered by firmware without the handshake as well
+                try:
+                    return await asyncio.wait_for(
+                        asyncio.shield(ready), min(probe_interval, deadline - loop.time()))
+                except asyncio.TimeoutError:
+                    pass
+            return False
+        except serial.SerialException as e:
+            self.serial_errors += 1
+            self.log.error("Error reading response: %s", e)
+            return False
+        finally:
+            loop.remove_reader(self.ser.fileno())
+            if not ready.done():
+                ready.cancel()
+
+    async def reset_board_async(self):
+        """
+        reset_board() without blocking the loop. Must be called before attach().
+        """
+        self.send_command(CMD_STREAM, (0).to_bytes(2, 'big'))
+        self.send_command(CMD_SET_FORMAT, bytes([self.frame_format]))
+        await asyncio.sleep(0.02)  # Let frames already on the wire arrive
+        self._discard_input()
+
+    def attach(self, loop=None):
+        """
+        Start watching the port on loop (default: the running loop).
+        """
+        if self.ser is None or self.loop is not None:
+            return
+        self.loop = loop or asyncio.get_running_loop()
+        self._sample_ready = asyncio.Event()
+        self._discard_input()
+        self.loop.add_reader(self.ser.fileno(), self._on_readable)
+
+    def detach(self):
+        """
+        Stop watching the port. Pending read() calls return None.
+        """
+        if self.loop is None:
+            return
+        self.loop.remove_reader(self.ser.fileno())
+        self.loop = None
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+        self._sample_ready.set()
+
+    def _on_readable(self):
+        """
+        Decode everything the port has buffered and hand each frame to a waiting read() or the stream.
+        """
+        try:
+            # A readable descriptor with nothing to read means the device went away
+            self.parser.feed(self.ser.read(self.ser.in_waiting or 1))
+        except serial.SerialException as e:
+            self.serial_errors += 1
+            self.log.error("Error reading response: %s", e)
+            self.detach()
+            return
+
+        batch = self._accept_batch(self.parser.parse())
+        if not len(batch.counts):
+            return
+
+        host_time = self.last_sample.host_time
+        for i in range(len(batch.counts)):
+            sample = SensorSample(
+                batch.counts[i].tolist(), int(batch.error_flags[i]),
+                None if batch.sequence is None else int(batch.sequence[i]),
+                None if batch.device_time_us is None else int(batch.device_time_us[i]),
+                host_time)
+
+            while self._waiters and self._waiters[0].done():
+                self._waiters.popleft()  # Timed out or cancelled
+            if self._waiters:
+                self._waiters.popleft().set_result(sample)
+            elif self.streaming:
+                if len(self._samples) == self._samples.maxlen:
+                    self.overflowed_samples += 1
+                self._samples.append(sample)
+        self._sample_ready.set()
+
+    def _stream_active(self):
+        """
+        True while the SampleStream that started streaming is still open and referenced.
+        """
+        stream = self._stream() if self._stream is not None else None
+        return self.streaming and stream is not None and not stream.closed
+
+    async def read(self, timeout=0.05):
+        """
+        Read one sample; while a stream() is open this is the next pushed frame.
+
+        If the board is still streaming for a stream that was abandoned without being
+        closed (e.g. a break out of a plain async for), streaming is stopped first.
+
+        :param timeout: seconds to wait for the response
+        :return: SensorSample, or None on timeout or when the port is not attached
+        """
+        if self.loop is None:
+            self.log.error("Serial port not attached.")
+            return None
+
+        if self._stream_active():
+            return await self._read_streamed(timeout)
+        if self.streaming:
+            await self.stop_stream()
+
+        if self._stale and not any(not waiter.done() for waiter in self._waiters):
+            await self._flush_async()
+
+        waiter = self.loop.create_future()
+        self._waiters.append(waiter)
+        self.send_command(CMD_READ)
+        try:
+            return await asyncio.wait_for(waiter, timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            self._stale = True
+            return None
+
+    async def _read_streamed(self, timeout):
+        """
+        Next pushed frame, or None if none arrives within timeout seconds.
+        """
+        if self.loop is None:
+            return None
+        deadline = self.loop.time() + timeout
+        while not self._samples:
+            if self.loop is None:
+                return None
+            remaining = deadline - self.loop.time()
+            if remaining <= 0:
+                self.timeouts += 1
+                return None
+            self._sample_ready.clear()
+            try:
+                await asyncio.wait_for(self._sample_ready.wait(), remaining)
+            except asyncio.TimeoutError:
+                pass
+        return self._samples.popleft()
+
+    async def _flush_async(self, quiet_time=0.02):
+        """
+        Let late replies arrive until the port has been quiet for quiet_time seconds, then
+        drop them, like the pipeline flush of the blocking interface. With no read waiting,
+        _on_readable() discards the replies.
+        """
+        self.pipeline_flushes += 1
+        self._stale = False
+        while True:
+            frames, pending = self.parser.frames_decoded, self.parser.pending()
+            await asyncio.sleep(quiet_time)
+            if self.loop is None or (self.parser.frames_decoded == frames and
+                                     self.parser.pending() == pending):
+                break
+        if self.loop is not None:
+            self._discard_input()
+
+    def stream(self, rate_hz=500, timeout=None):
+        """
+        Samples pushed by the board at rate_hz, as a SampleStream. Use it as an async
+        context manager, so streaming stops as soon as the block is left:
+
+            async with sensor.stream(rate_hz=500) as samples:
+                async for sample in samples:
+                    ...
+
+        :param timeout: seconds without a sample before the iteration ends (default: ten frame periods)
+        """
+        rate_hz = int(rate_hz)
+        if not 0 < rate_hz <= 0xFFFF:
+            raise ValueError(f"Stream rate must be in 1 ... 65535 Hz, got {rate_hz}.")
+        if timeout is None:
+            timeout = max(0.05, 10.0 / rate_hz)
+        return SampleStream(self, rate_hz, timeout)
+
+    def _start_stream(self, stream):
+        """
+        Make the board push frames for stream.
+
+        :return: False if the port is not attached
+        """
+        if self.loop is None:
+            self.log.error("Serial port not attached.")
+            return False
+        self._samples.clear()
+        self.send_command(CMD_STREAM, stream.rate_hz.to_bytes(2, 'big'))
+        self.streaming = True
+        self._stream_started = self._last_raw_sequence is not None
+        self._stream = weakref.ref(stream)
+        return True
+
+    async def stop_stream(self):
+        """
+        Stop the board from pushing frames and drop any that are still buffered.
+        """
+        if self.ser is None or not self.streaming:
+            return
+        self.send_command(CMD_STREAM, (0).to_bytes(2, 'big'))
+        self.streaming = False
+        self._stream = None
+        await asyncio.sleep(0.02)  # Let frames already on the wire arrive
+        self._samples.clear()
+        self._discard_input()
+
+    async def calibrate(self):
+        """
+        Store the current angles as the calibration offsets of the board.
+        """
+        self.send_command(CMD_CALIBRATION)
+        await asyncio.sleep(0.05)
+
+    def close(self):
+        """
+        Stop watching the port and close it.
+        """
+        self.detach()
+        if self.ser:
+            if self.streaming:
+                self.send_command(CMD_STREAM, (0).to_bytes(2, 'big'))
+                self.streaming = False
+                self._stream = None
+            self.ser.close()
+            print("Serial port closed.")
+
+
+class SampleStream:
+    def __init__(self, sensor, rate_hz, timeout):
+        """
+        Asynchronous iterator over the samples pushed by the board, from AsyncSensorInterface.stream().
+
+        Streaming starts with the async with block or the first iteration. It stops when the
+        block is left, also on break or an exception, or when the iteration ends because no
+        sample arrived within timeout. A plain async for that is left with break keeps the
+        board streaming until the next read(), stop_stream() or close() of the sensor.
+        """
+        self.sensor = sensor
+        self.rate_hz = rate_hz
+        self.timeout = timeout
+        self.closed = False
+        self._started = False
+
+    def _start(self):
+        if not self._started:
+            self._started = True
+            if not self.sensor._start_stream(self):
+                self.closed = True
+
+    async def __aenter__(self):
+        self._start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        self._start()
+        if self.closed:
+            raise StopAsyncIteration
+        sample = await self.sensor._read_streamed(self.timeout)
+        if sample is None:
+            await self.aclose()
+            raise StopAsyncIteration
+        return sample
+
+    async def aclose(self):
+        """
+        Stop streaming, unless a newer stream has taken over the board.
+        """
+        if self.closed:
+            return
+        self.closed = True
+        if self.sensor._stream is not None and self.sensor._stream() is self:
+            await self.sensor.stop_stream()
+
+
+if __name__ == "__main__":
+    async def main():
+        sensor = await AsyncSensorInterface.open('/dev/ttyACM0')
+        try:
+            print(await sensor.read())
+            start = time.perf_counter()
+            n = 0
+            async with sensor.stream(rate_hz=500) as samples:
+                async for sample in samples:
+                    n += 1
+                    if n == 1000:
+                        break
+            print(f"{n / (time.perf_counter() - start):.0f} samples/s, "
+                  f"{sensor.dropped_frames} dropped, last {sample}")
+        finally:
+            sensor.close()
+
+    asyncio.run(main())
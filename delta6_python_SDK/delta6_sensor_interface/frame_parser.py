@@ -0,0 +1,228 @@
+"""
+Bulk decoder for Delta6 encoder frames.
+
+Bytes are appended to one reusable bytearray, frame boundaries are found with
+bytearray.find and every run of complete, valid frames is decoded by a single
+numpy.frombuffer call. A backlog of frames therefore costs one call instead of
+one Python-level read per byte.
+
+Packed frames store each angle as 14-bit two's complement, i.e. the calibrated
+angle modulo one revolution, and only the low 6 bits of the sequence. Legacy and
+timestamped frames carry the int16 difference position - offset, which spans
+almost two revolutions; it is wrapped the same way, so every format reports the
+same count in [-8192, 8191] for the same angle.
+"""
+
+from typing import NamedTuple, Optional
+import numpy as np
+
+START_BYTE = 0xAA
+START_BYTE_V1 = 0xAB
+START_BYTE_PACKED = 0xAC
+FRAME_FORMAT_LEGACY = 0
+FRAME_FORMAT_TIMESTAMPED = 1
+FRAME_FORMAT_PACKED = 2
+FRAME_VERSION = 1
+
+# Record layout of each frame format (all multi-byte fields big-endian)
+_FRAME_DTYPES = {
+    FRAME_FORMAT_LEGACY: np.dtype([
+        ('start', 'u1'), ('counts', '>i2', (6,)), ('flags', 'u1'), ('checksum', 'u1')]),
+    FRAME_FORMAT_TIMESTAMPED: np.dtype([
+        ('start', 'u1'), ('version', 'u1'), ('sequence', '>u2'), ('time_us', '>u4'),
+        ('counts', '>i2', (6,)), ('flags', 'u1'), ('checksum', 'u1')]),
+    FRAME_FORMAT_PACKED: np.dtype([
+        ('start', 'u1'), ('packed', 'u1', (12,)), ('checksum', 'u1')]),
+}
+_START_BYTES = {
+    FRAME_FORMAT_LEGACY: START_BYTE,
+    FRAME_FORMAT_TIMESTAMPED: START_BYTE_V1,
+    FRAME_FORMAT_PACKED: START_BYTE_PACKED,
+}
+
+# Number of distinct sequence values per format before the counter wraps
+SEQUENCE_MODULUS = {
+    FRAME_FORMAT_TIMESTAMPED: 1 << 16,
+    FRAME_FORMAT_PACKED: 1 << 6,
+}
+
+# Counts of one revolution; decoded angles are wrapped into [-COUNTS_PER_REV / 2, COUNTS_PER_REV / 2)
+COUNTS_PER_REV = 1 << 14
+
+# Bit weights for unpacking the 96-bit payload of packed frames, MSB first
+_WEIGHTS_14 = 1 << np.arange(13, -1, -1)
+_WEIGHTS_6 = 1 << np.arange(5, -1, -1)
+
+
+class FrameBatch(NamedTuple):
+    """
+    Frames decoded by one FrameParser.parse call.
+
+    counts: (N, 6) signed calibrated angles in encoder counts, in [-8192, 8191]
+    error_flags: (N,) bit i set if sensor i+1 reported a read error
+    sequence: (N,) device sample counter (None for legacy frames, 6 bits for packed frames)
+    device_time_us: (N,) device sample time in us (timestamped frames only, otherwise None)
+    """
+    counts: np.ndarray
+    error_flags: np.ndarray
+    sequence: Optional[np.ndarray]
+    device_time_us: Optional[np.ndarray]
+
+
+class FrameParser:
+    def __init__(self, frame_format=FRAME_FORMAT_LEGACY):
+        """
+        :param frame_format: FRAME_FORMAT_LEGACY (0xAA), FRAME_FORMAT_TIMESTAMPED (0xAB)
+                             or FRAME_FORMAT_PACKED (0xAC)
+        """
+        self._buffer = bytearray()
+        self.set_format(frame_format)
+
+        # Stream health
+        self.frames_decoded = 0
+        self.checksum_errors = 0
+        self.resyncs = 0
+        self.bytes_discarded = 0
+
+    def set_format(self, frame_format):
+        """
+        Switch the expected frame layout and drop any buffered bytes.
+        """
+        if frame_format not in _FRAME_DTYPES:
+            raise ValueError(f"Unknown frame format {frame_format}.")
+        self.frame_format = frame_format
+        self.frame_length = _FRAME_DTYPES[frame_format].itemsize
+        self._dtype = _FRAME_DTYPES[frame_format]
+        self._start = _START_BYTES[frame_format]
+        self.clear()
+
+    def clear(self):
+        """
+        Drop all buffered bytes.
+        """
+        del self._buffer[:]
+
+    def pending(self):
+        """
+        Number of buffered bytes not yet decoded.
+        """
+        return len(self._buffer)
+
+    def empty_batch(self):
+        """
+        FrameBatch with no frames, shaped like the current format.
+        """
+        empty = np.empty(0, dtype=np.int64)
+        return FrameBatch(np.empty((0, 6), dtype=np.int32), np.empty(0, dtype=np.uint8),
+                          empty if self.frame_format != FRAME_FORMAT_LEGACY else None,
+                          empty if self.frame_format == FRAME_FORMAT_TIMESTAMPED else None)
+
+    def feed(self, data):
+        """
+        Append received bytes to the buffer.
+        """
+        self._buffer += data
+
+    def read_from(self, ser):
+        """
+        Append everything the serial port has buffered, without blocking.
+
+        :return: number of bytes read
+        """
+        waiting = ser.in_waiting
+        if waiting:
+            self._buffer += ser.read(waiting)
+        return waiting
+
+    def _valid_rows(self, offset, n):
+        """
+        Mask of the n frame-sized rows starting at offset that are valid frames.
+        """
+        rows = np.frombuffer(self._buffer, np.uint8, count=n * self.frame_length,
+                             offset=offset).reshape(n, self.frame_length)
+        # Checksum is the sum of all bytes between start byte and checksum
+        valid = (rows[:, 0] == self._start) & \
+            ((rows[:, 1:-1].sum(axis=1, dtype=np.uint32) & 0xFF) == rows[:, -1])
+        if self.frame_format == FRAME_FORMAT_TIMESTAMPED:
+            valid &= rows[:, 1] == FRAME_VERSION
+        return valid
+
+    def _decode(self, offset, n):
+        """
+        Decode n consecutive valid frames starting at offset into owned arrays.
+        """
+        records = np.frombuffer(self._buffer, self._dtype, count=n, offset=offset)
+        if self.frame_format == FRAME_FORMAT_PACKED:
+            bits = np.unpackbits(records['packed'], axis=1)
+            counts = (bits[:, :84].reshape(n, 6, 14) @ _WEIGHTS_14).astype(np.int32)
+            counts[counts >= COUNTS_PER_REV // 2] -= COUNTS_PER_REV  # Sign-extend the 14-bit values
+            flags = (bits[:, 84:90] @ _WEIGHTS_6).astype(np.uint8)
+            sequence = (bits[:, 90:96] @ _WEIGHTS_6).astype(np.int64)
+            return [counts, flags, sequence]
+
+        # Wrap the int16 difference into one revolution, like the packed format
+        half = COUNTS_PER_REV // 2
+        counts = (records['counts'].astype(np.int32) + half) % COUNTS_PER_REV - half
+        fields = [counts, records['flags'].copy()]
+        if self.frame_format == FRAME_FORMAT_TIMESTAMPED:
+            fields += [records['sequence'].astype(np.int64),
+                       records['time_us'].astype(np.int64)]
+        return fields
+
+    def parse(self, max_frames=None):
+        """
+        Decode all complete frames in the buffer (at most max_frames).
+
+        Invalid frames (bad checksum or version) are skipped by resynchronizing
+        on the next start byte; incomplete trailing bytes stay buffered.
+
+        :return: FrameBatch with N >= 0 frames, oldest first
+        """
+        buf = self._buffer
+        length = self.frame_length
+        decoded = []
+        total = 0
+
+        pos = buf.find(self._start)
+        if pos < 0:
+            pos = len(buf)
+        if pos:
+            self.resyncs += 1
+            self.bytes_discarded += pos
+
+        while max_frames is None or total < max_frames:
+            n = (len(buf) - pos) // length
+            if max_frames is not None:
+                n = min(n, max_frames - total)
+            if n == 0:
+                break
+
+            invalid = np.flatnonzero(~self._valid_rows(pos, n))
+            good = int(invalid[0]) if len(invalid) else n
+            if good:
+                decoded.append(self._decode(pos, good))
+                pos += good * length
+                total += good
+            if not len(invalid):
+                continue
+
+            # Skip the bad frame's start byte and look for the next one
+            if buf[pos] == self._start:
+                self.checksum_errors += 1
+            self.resyncs += 1
+            nxt = buf.find(self._start, pos + 1)
+            if nxt < 0:
+                nxt = len(buf)
+            self.bytes_discarded += nxt - pos
+            pos = nxt
+
+        # The decoded arrays own their data, so the buffer can be compacted
+        del buf[:pos]
+        self.frames_decoded += total
+
+        if not decoded:
+            return self.empty_batch()
+        columns = [np.concatenate(parts) for parts in zip(*decoded)]
+        columns += [None] * (4 - len(columns))
+        return FrameBatch(*columns)
+
@@ -0,0 +1,81 @@
+"""
+Link health counters and rate-limited logging for the encoder interfaces.
+
+Faults in the read path (timeouts, checksum errors, sensor error flags) are
+counted on the interface and logged at most once per interval per message, so
+a failing link cannot flood the console or stall the acquisition thread on
+console I/O. Monitoring code polls SensorInterface.stats() for the counters.
+"""
+
+import logging
+import time
+from typing import NamedTuple, Tuple
+
+logger = logging.getLogger("delta6_sensor_interface")
+
+
+class LinkStats(NamedTuple):
+    """
+    Snapshot of the counters of one SensorInterface, all totals since the port was opened.
+
+    frames: frames decoded
+    timeouts: reads that received no start byte in time
+    incomplete_frames: reads that timed out part-way through a frame
+    checksum_errors: frames dropped for a bad checksum or version
+    resyncs: times the parser skipped bytes to find the next start byte
+    bytes_discarded: bytes skipped while resynchronizing
+    sensor_errors: frames with the error flag set, per encoder 1 ... 6
+    serial_errors: exceptions raised by the serial port
+    dropped_frames: gaps in the device sequence while streaming (sequenced frame formats only)
+    duplicate_frames: repeated device sequence numbers
+    skipped_samples: device samples between two polled reads, which were never requested
+    pipeline_flushes: times the read pipeline was drained after a lost reply
+    suppressed_logs: log messages withheld by the rate limit
+    """
+    frames: int
+    timeouts: int
+    incomplete_frames: int
+    checksum_errors: int
+    resyncs: int
+    bytes_discarded: int
+    sensor_errors: Tuple[int, ...]
+    serial_errors: int
+    dropped_frames: int
+    duplicate_frames: int
+    skipped_samples: int
+    pipeline_flushes: int
+    suppressed_logs: int
+
+
+class RateLimitedLogger:
+    def __init__(self, log=logger, interval=1.0):
+        """
+        :param log: logging.Logger the messages go to
+        :param interval: shortest time in seconds between two messages with the same format string
+        """
+        self.log = log
+        self.interval = interval
+        self.suppressed = 0
+        self._last = {}  # Format string -> (time of last message, messages suppressed since)
+
+    def emit(self, level, msg, *args):
+        """
+        Log msg % args unless the same msg was logged less than interval seconds ago.
+        Messages are keyed on the format string, so varying arguments share one limit.
+        """
+        now = time.monotonic()
+        last, suppressed = self._last.get(msg, (None, 0))
+        if last is not None and now - last < self.interval:
+            self._last[msg] = (last, suppressed + 1)
+            self.suppressed += 1
+            return
+        self._last[msg] = (now, 0)
+        if suppressed:
+            msg += f" ({suppressed} similar messages suppressed)"
+        self.log.log(level, msg, *args)
+
+    def warning(self, msg, *args):
+        self.emit(logging.WARNING, msg, *args)
+
+    def error(self, msg, *args):
+        self.emit(logging.ERROR, msg, *args)
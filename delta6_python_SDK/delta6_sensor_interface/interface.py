@@ -1,113 +1,491 @@
-import math
 import serial
 import time
+from typing import NamedTuple, Optional
+import numpy as np
+from delta6_sensor_interface.frame_parser import (
+    FRAME_FORMAT_LEGACY, FRAME_FORMAT_PACKED, FRAME_FORMAT_TIMESTAMPED, SEQUENCE_MODULUS,
+    START_BYTE, FrameParser)
+from delta6_sensor_interface.health import LinkStats, RateLimitedLogger
+from delta6_utils.math_tools import counts_to_radians
 
 # Define constants for the communication protocol
-START_BYTE = 0xAA
+# Response frame layouts (FRAME_FORMAT_*) and start bytes are defined in frame_parser
 CMD_CALIBRATION = 0x01
 CMD_READ = 0x02
+CMD_STREAM = 0x03
+CMD_SET_FORMAT = 0x04
+CMD_SET_BAUD = 0x05
+CMD_HELLO = 0x06
+
+# Acknowledgement frame: ACK_BYTE, command, status, checksum
+# The board also sends the CMD_HELLO acknowledgement on its own once it has booted
+ACK_BYTE = 0xAD
+ACK_OK = 0x00
+ACK_UNSUPPORTED = 0x01
+
+# Baud rates the firmware accepts for CMD_SET_BAUD; it always starts at DEFAULT_BAUD
+DEFAULT_BAUD = 115200
+SUPPORTED_BAUDS = (115200, 230400, 250000, 500000, 1000000)
+
+
+def find_ack(buf, cmd):
+    """
+    Status of the first valid acknowledgement frame of cmd in buf, or None.
+    """
+    idx = buf.find(ACK_BYTE)
+    while 0 <= idx <= len(buf) - 4:
+        ack_cmd, status, checksum = buf[idx + 1:idx + 4]
+        if ack_cmd == cmd and (ack_cmd + status) & 0xFF == checksum:
+            return status
+        idx = buf.find(ACK_BYTE, idx + 1)
+    return None
+
+
+def is_ready_reply(buf):
+    """
+    True if buf holds the CMD_HELLO acknowledgement, or a legacy read reply from firmware
+    without the handshake.
+    """
+    if find_ack(buf, CMD_HELLO) == ACK_OK:
+        return True
+    parser = FrameParser(FRAME_FORMAT_LEGACY)
+    parser.feed(buf)
+    return len(parser.parse(max_frames=1).counts) > 0
+
+
+def frame_host_times(host_time, n, device_time_us=None, frame_period=None):
+    """
+    Host times of n frames decoded together, oldest first.
+
+    Only the newest frame's decode time (host_time) is measured; a backlog of older frames
+    is spread back from it by the device time between the frames or, for frames without a
+    timestamp, by the stream period frame_period. Without either they all get host_time.
+
+    :param device_time_us: n device sample times in us, or None
+    :return: (n,) array of time.perf_counter() times
+    """
+    if n == 1:
+        return np.array([host_time])
+    if device_time_us is not None:
+        return host_time - (device_time_us[-1] - np.asarray(device_time_us)) * 1e-6
+    if frame_period:
+        return host_time - np.arange(n - 1, -1, -1) * frame_period
+    return np.full(n, host_time)
+
+
+class SensorSample(NamedTuple):
+    """
+    One decoded response frame.
+
+    counts: six signed calibrated angles in encoder counts
+    error_flags: bit i set if sensor i+1 reported a read error
+    sequence: device sample counter, unwrapped (None for legacy frames)
+    device_time_us: device time the sample was taken, unwrapped past 32 bits (timestamped frames only)
+    host_time: time.perf_counter() when the frame was decoded
+    """
+    counts: list
+    error_flags: int
+    sequence: Optional[int]
+    device_time_us: Optional[int]
+    host_time: float
 
 
 class SensorInterface:
-    def __init__(self, port='/dev/ttyACM0', baudrate=115200, timeout=0.005):
+    def __init__(self, port='/dev/ttyACM0', baudrate=115200, timeout=0.005, ready_timeout=3.0):
         """
-        Initialize the serial connection.
+        Initialize the serial connection and wait until the board is ready.
+
+        :param ready_timeout: longest wait in seconds for the board to finish booting
         """
+        # Seconds from opening the port until the board answered, None if it never did
+        self.connect_time = None
         try:
+            start = time.perf_counter()
             self.ser = serial.Serial(
                 port=port, baudrate=baudrate, timeout=timeout)
+            self.timeout = timeout
+            self.baudrate = baudrate
             print(f"Serial port {port} opened successfully.")
-            time.sleep(2.0)
 
         except serial.SerialException as e:
             print(f"Error opening serial port {port}: {e}")
             self.ser = None
 
+        self._init_state()
+        if self.ser is not None:
+            if self.wait_ready(ready_timeout):
+                self.connect_time = time.perf_counter() - start
+                print(f"Board ready after {self.connect_time:.3f} s.")
+            else:
+                print(f"Board not ready after {ready_timeout:.1f} s.")
+
+    def _init_state(self):
+        """
+        Protocol and sequence bookkeeping of a freshly opened port.
+        """
+        # True while the board pushes frames on its own, see start_streaming()
+        self.streaming = False
+
+        # Pipelined polling: CMD_READ requests kept in flight, see enable_pipelining()
+        self.pipeline_depth = 0
+        self.pipeline_flushes = 0
+        self._in_flight = 0
+
+        # Received bytes are decoded in bulk by the frame parser
+        self.frame_format = FRAME_FORMAT_LEGACY
+        self.parser = FrameParser(self.frame_format)
+
+        # Timestamped frames: last sample and sequence bookkeeping
+        self.last_sample = None
+        self.dropped_frames = 0
+        self.duplicate_frames = 0
+        self.skipped_samples = 0
+        self._last_raw_sequence = None
+        self._last_raw_time_us = None
+        self._sequence = 0
+        self._device_time_us = 0
+        self._stream_started = False  # Next gap is from the switch to streaming, not a drop
+
+        # Link health, see stats(); read-path faults are counted and logged rate-limited
+        self.timeouts = 0
+        self.incomplete_frames = 0
+        self.serial_errors = 0
+        self.sensor_errors = np.zeros(6, dtype=np.int64)
+        self.log = RateLimitedLogger()
+
+    def stats(self):
+        """
+        Snapshot of the link health counters as a LinkStats.
+        """
+        return LinkStats(
+            self.parser.frames_decoded, self.timeouts, self.incomplete_frames,
+            self.parser.checksum_errors, self.parser.resyncs, self.parser.bytes_discarded,
+            tuple(self.sensor_errors.tolist()), self.serial_errors, self.dropped_frames,
+            self.duplicate_frames, self.skipped_samples, self.pipeline_flushes, self.log.suppressed)
+
     def calculate_checksum(self, data):
         """
         Calculate checksum (simple sum).
         """
         return sum(data) & 0xFF  # Ensure result is within 0-255
 
-    def send_command(self, cmd):
+    def send_command(self, cmd, payload=b""):
         """
-        Send command to Arduino.
+        Send command to Arduino, optionally followed by payload bytes.
         """
         if self.ser is None:
-            print("Serial port not initialized.")
+            self.log.error("Serial port not initialized.")
             return
 
         packet = bytearray()
         packet.append(START_BYTE)
         packet.append(cmd)
-        checksum = self.calculate_checksum([cmd])
+        packet.extend(payload)
+        checksum = self.calculate_checksum([cmd, *payload])
         packet.append(checksum)
 
         try:
             self.ser.write(packet)
             # print(f"Command {cmd:#04x} sent.")
         except serial.SerialException as e:
-            print(f"Error sending command: {e}")
+            self.serial_errors += 1
+            self.log.error("Error sending command: %s", e)
+
+    def set_frame_format(self, frame_format):
+        """
+        Select the response frame layout (FRAME_FORMAT_LEGACY, FRAME_FORMAT_TIMESTAMPED
+        or FRAME_FORMAT_PACKED). Timestamped frames carry a sequence number and the device
+        sample time. Packed frames are 14 bytes instead of 15, with 14-bit angles (modulo
+        one revolution) and a 6-bit sequence for drop detection.
+        """
+        if frame_format not in (FRAME_FORMAT_LEGACY, FRAME_FORMAT_TIMESTAMPED, FRAME_FORMAT_PACKED):
+            raise ValueError(f"Unknown frame format {frame_format}.")
+        if self.ser is None:
+            self.log.error("Serial port not initialized.")
+            return
+
+        self.send_command(CMD_SET_FORMAT, bytes([frame_format]))
+        self.frame_format = frame_format
+        self.parser.set_format(frame_format)
+        self.reset_sequence()
+        if self.streaming:
+            time.sleep(0.02)  # Frames of the old layout may still be on the wire
+            self._discard_input()
+        elif self._in_flight:
+            self._flush_pipeline()
+
+    def wait_ready(self, timeout=3.0, probe_interval=0.25):
+        """
+        Wait until the board reports that it is ready instead of sleeping a fixed boot time.
+
+        Opening the port usually resets the board, which announces itself when setup() is done.
+        Boards that were not reset are probed every probe_interval with CMD_HELLO, and with
+        CMD_READ, which firmware without the handshake answers as well.
+        Once the board has answered, it is reset to the host's state, see reset_board().
+
+        :return: True if the board answered within timeout
+        """
+        deadline = time.perf_counter() + timeout
+        buf = bytearray()
+        while True:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            self.send_command(CMD_HELLO)
+            self.send_command(CMD_READ)
+            probe_deadline = time.perf_counter() + min(probe_interval, remaining)
+            while time.perf_counter() < probe_deadline:
+                buf += self.ser.read(max(1, self.ser.in_waiting))
+                if is_ready_reply(buf):
+                    self.reset_board()
+                    return True
+                del buf[:-64]  # Longer than any reply; a board left streaming keeps sending
+
+        self._discard_input()
+        return False
+
+    def reset_board(self):
+        """
+        Stop streaming and select this interface's frame format on the board.
+
+        A board that was not reset may still be configured by an earlier session,
+        e.g. streaming timestamped frames; its frames would not decode.
+        """
+        self.send_command(CMD_STREAM, (0).to_bytes(2, 'big'))
+        self.send_command(CMD_SET_FORMAT, bytes([self.frame_format]))
+        time.sleep(0.02)  # Let frames already on the wire arrive
+        self._discard_input()
+
+    def reset_sequence(self):
+        """
+        Restart sequence/timestamp unwrapping and the drop, duplicate and skip counters.
+        """
+        self.dropped_frames = 0
+        self.duplicate_frames = 0
+        self.skipped_samples = 0
+        self._last_raw_sequence = None
+        self._last_raw_time_us = None
+        self._sequence = 0
+        self._device_time_us = 0
+
+    def _track_sequence(self, raw_sequence, raw_time_us):
+        """
+        Unwrap sequences and 32-bit timestamps (arrays, oldest first) and count gaps and repeats.
+        In streaming mode every frame carries a new sample, so a gap is a dropped frame.
+        When polling, the board keeps sampling between requests and a gap only means
+        samples were never asked for; those are counted as skipped_samples.
+        raw_time_us is None for packed frames, which carry no timestamp.
+        """
+        modulus = SEQUENCE_MODULUS[self.frame_format]
+        first = self._last_raw_sequence is None
+        if first:
+            self._sequence = self._last_raw_sequence = int(raw_sequence[0])
+            if raw_time_us is not None:
+                self._device_time_us = self._last_raw_time_us = int(raw_time_us[0])
+
+        seq_steps = np.diff(raw_sequence, prepend=self._last_raw_sequence) % modulus
+
+        forward = seq_steps < modulus // 2
+        repeats = seq_steps == 0
+        repeats[0] &= not first
+        self.duplicate_frames += int(repeats.sum())
+        gaps = np.where(forward & (seq_steps > 0), seq_steps - 1, 0)
+        if self.streaming:
+            if self._stream_started:
+                # Samples taken since the last polled read were never requested
+                self._stream_started = False
+                self.skipped_samples += int(gaps[0])
+                gaps[0] = 0
+            self.dropped_frames += int(gaps.sum())
+        else:
+            self.skipped_samples += int(gaps.sum())
+
+        # A backwards step means the board restarted; continue from there
+        sequence = self._sequence + np.cumsum(np.where(forward, seq_steps, 1))
+        self._sequence = int(sequence[-1])
+        self._last_raw_sequence = int(raw_sequence[-1])
+
+        if raw_time_us is None:
+            return sequence, None
+        time_steps = np.diff(raw_time_us, prepend=self._last_raw_time_us) & 0xFFFFFFFF
+        device_time_us = self._device_time_us + np.cumsum(time_steps)
+        self._device_time_us = int(device_time_us[-1])
+        self._last_raw_time_us = int(raw_time_us[-1])
+        return sequence, device_time_us
+
+    def _accept_batch(self, batch):
+        """
+        Unwrap the sequence numbers of a decoded batch and remember its newest frame.
+        """
+        if not len(batch.counts):
+            return batch
+        if batch.error_flags.any():
+            # Count error frames per encoder: bit i of the flags is sensor i+1
+            self.sensor_errors += (batch.error_flags[:, None] >> np.arange(6) & 1).sum(axis=0)
+        if self.frame_format != FRAME_FORMAT_LEGACY:
+            sequence, device_time_us = self._track_sequence(
+                batch.sequence, batch.device_time_us)
+            batch = batch._replace(sequence=sequence, device_time_us=device_time_us)
+            self.last_sample = SensorSample(
+                batch.counts[-1].tolist(), int(batch.error_flags[-1]), int(sequence[-1]),
+                None if device_time_us is None else int(device_time_us[-1]),
+                time.perf_counter())
+        else:
+            self.last_sample = SensorSample(batch.counts[-1].tolist(), int(batch.error_flags[-1]),
+                                            None, None, time.perf_counter())
+        return batch
 
     def read_response(self):
         """
         Read and parse the response from Arduino.
+        The decoded frame, including sequence and timestamp, is kept in self.last_sample.
         """
         if self.ser is None:
-            print("Serial port not initialized.")
+            self.log.error("Serial port not initialized.")
             return None
 
         try:
-            # Look for the start byte
+            checksum_errors = self.parser.checksum_errors
             while True:
-                start_byte = self.ser.read(1)
-                if not start_byte:
-                    print("Timeout waiting for start byte.")
-                    return None
-                if start_byte[0] == START_BYTE:
+                batch = self.parser.parse(max_frames=1)
+                if len(batch.counts):
                     break
+                if self.parser.checksum_errors != checksum_errors:
+                    self.log.warning("Checksum mismatch.")
+                    return None
 
-            # Read the remaining data (14 bytes)
-            expected_length = 14  # 6 sensors * 2 bytes + 1 error flag + 1 checksum
-            data = self.ser.read(expected_length)
-            if len(data) < expected_length:
-                print("Incomplete data received.")
-                return None
+                # Wait for at least the rest of one frame, and take anything else already there
+                needed = max(1, self.parser.frame_length - self.parser.pending())
+                data = self.ser.read(max(needed, self.ser.in_waiting))
+                if not data:
+                    if self.parser.pending():
+                        self.incomplete_frames += 1
+                        self.log.warning("Incomplete data received.")
+                    else:
+                        self.timeouts += 1
+                        self.log.warning("Timeout waiting for start byte.")
+                    return None
+                self.parser.feed(data)
 
-            # Parse sensor data
-            sensor_values = []
-            idx = 0
-            for i in range(6):
-                # Combine high byte and low byte to form a signed integer
-                high_byte = data[idx]
-                low_byte = data[idx + 1]
-                value = (high_byte << 8) | low_byte
-                if value >= 0x8000:
-                    value -= 0x10000  # Convert to negative if needed
-                sensor_values.append(value)
-                idx += 2
-
-            # Read error flags
-            error_flags = data[idx]
-            idx += 1
-
-            # Read checksum
-            received_checksum = data[idx]
-
-            # Verify data integrity with checksum
-            # Exclude checksum byte
-            checksum_data = [byte for byte in data[:idx]]
-            calculated_checksum = self.calculate_checksum(checksum_data)
-            if calculated_checksum != received_checksum:
-                print("Checksum mismatch.")
-                return None
+            self._accept_batch(batch)
+            return self.last_sample.counts, self.last_sample.error_flags
+
+        except serial.SerialException as e:
+            self.serial_errors += 1
+            self.log.error("Error reading response: %s", e)
+            return None
+
+    def read_frames(self, block=False):
+        """
+        Decode every complete frame received so far in one pass.
 
-            return sensor_values, error_flags
+        :param block: if True and no complete frame is buffered, wait up to the serial timeout for one
+        :return: FrameBatch, oldest frame first; sequence and device time are unwrapped
+        """
+        if self.ser is None:
+            self.log.error("Serial port not initialized.")
+            return self.parser.empty_batch()
 
+        try:
+            self.parser.read_from(self.ser)
+            batch = self.parser.parse()
+            if block and not len(batch.counts):
+                needed = max(1, self.parser.frame_length - self.parser.pending())
+                self.parser.feed(self.ser.read(needed))
+                self.parser.read_from(self.ser)
+                batch = self.parser.parse()
         except serial.SerialException as e:
-            print(f"Error reading response: {e}")
+            self.serial_errors += 1
+            self.log.error("Error reading response: %s", e)
+            return self.parser.empty_batch()
+
+        return self._accept_batch(batch)
+
+    def read_available(self, block=False):
+        """
+        Counts of every complete frame received so far, e.g. the backlog of a streaming board.
+        Frames with a sensor error flag are left out.
+
+        :param block: if True and no complete frame is buffered, wait up to the serial timeout for one
+        :return: (N, 6) integer array of signed counts, oldest first
+        """
+        batch = self.read_frames(block)
+        return batch.counts[batch.error_flags == 0]
+
+    def negotiate_baud(self, candidates=(1000000, 500000, 250000, 230400), ack_timeout=0.2):
+        """
+        Move the link to the fastest baud rate in candidates that both ends accept.
+
+        For each candidate the board acknowledges CMD_SET_BAUD at the current rate and
+        switches; the host follows and confirms with a read at the new rate. If that read
+        fails, the host switches back and waits for the board's own fallback (it reverts
+        when no valid command arrives within 1 s) before trying the next candidate.
+
+        :return: the baud rate in use afterwards
+        """
+        if self.ser is None:
+            self.log.error("Serial port not initialized.")
             return None
 
+        self.stop_streaming()
+        self.disable_pipelining()
+        for baud in candidates:
+            if baud == self.baudrate:
+                return baud
+            if baud not in SUPPORTED_BAUDS:
+                continue
+
+            self._discard_input()
+            self.send_command(CMD_SET_BAUD, int(baud).to_bytes(4, 'big'))
+            if self._read_ack(CMD_SET_BAUD, ack_timeout) != ACK_OK:
+                continue
+
+            previous = self.baudrate
+            self.ser.baudrate = baud
+            self._discard_input()
+            if self._confirm_link():
+                self.baudrate = baud
+                return baud
+
+            self.ser.baudrate = previous
+            time.sleep(1.1)  # Let the board's confirmation timeout revert it as well
+            self._discard_input()
+            if not self._confirm_link():
+                self.log.error("Link lost while falling back from %d baud.", baud)
+                return None
+        return self.baudrate
+
+    def _confirm_link(self, attempts=3):
+        """
+        True if a read succeeds at the current baud rate.
+        """
+        timeout = self.ser.timeout
+        self.ser.timeout = max(timeout, 0.05)  # Cover the firmware's 10 ms polling delay
+        try:
+            for _ in range(attempts):
+                self.send_command(CMD_READ)
+                if self.read_response() is not None:
+                    return True
+                self._discard_input()
+            return False
+        finally:
+            self.ser.timeout = timeout
+
+    def _read_ack(self, cmd, timeout):
+        """
+        Wait for the acknowledgement frame of cmd.
+
+        :return: status byte, or None on timeout
+        """
+        deadline = time.perf_counter() + timeout
+        buf = bytearray()
+        while time.perf_counter() < deadline:
+            buf += self.ser.read(max(1, self.ser.in_waiting))
+            status = find_ack(buf, cmd)
+            if status is not None:
+                return status
+        return None
+
     def calibrate_sensors(self):
         """
         Send calibration command.
@@ -128,42 +506,174 @@ class SensorInterface:
             # Process error flags
             for i in range(6):
                 if error_flags & (1 << i):
-                    print(f"Sensor {i+1} error.")
+                    self.log.warning("Sensor %d error.", i + 1)
                 # else:
                 #     print(f"Sensor {i+1} value: {sensor_values[i]}")
         else:
-            print("Failed to read sensor data.")
+            self.log.warning("Failed to read sensor data.")
 
-    def read_radians(self):
+    def start_streaming(self, rate_hz=500):
         """
-        Convert the latest sensor angle data to radians.
-        Each 14-bit sensor value ranges from 0 to 16383, representing 0 to 2π radians.
+        Ask the board to push frames at rate_hz without per-sample requests.
+        While streaming, read_counts() and read_radians() consume the pushed frames.
         """
-        self.send_command(CMD_READ)
-        # time.sleep(0.05)  # Wait for Arduino to prepare data
-        result = self.read_response()
-        radians_values = []
-        if result:
-            sensor_values, error_flags = result
-            # Process error flags
-            for i in range(6):
-                if error_flags & (1 << i):
-                    print(f"Sensor {i+1} error.")
-                    return []
-                else:
-                    angle_in_radians = round(
-                        (sensor_values[i] / 16383.0) * (2 * math.pi), 5)
-                    radians_values.append(angle_in_radians)
+        if self.ser is None:
+            self.log.error("Serial port not initialized.")
+            return
+
+        rate_hz = int(rate_hz)
+        if not 0 < rate_hz <= 0xFFFF:
+            raise ValueError(f"Stream rate must be in 1 ... 65535 Hz, got {rate_hz}.")
+
+        if self._in_flight:
+            self._flush_pipeline()
+        self._discard_input()
+        self.send_command(CMD_STREAM, rate_hz.to_bytes(2, 'big'))
+        # A read waits up to two frame periods before reporting a timeout
+        self.ser.timeout = max(self.timeout, 2.0 / rate_hz)
+        self.streaming = True
+        self._stream_started = self._last_raw_sequence is not None
+
+    def stop_streaming(self):
+        """
+        Stop the board from pushing frames and drop any that are still buffered.
+        """
+        if self.ser is None or not self.streaming:
+            return
+
+        self.send_command(CMD_STREAM, (0).to_bytes(2, 'big'))
+        self.streaming = False
+        self.ser.timeout = self.timeout
+        time.sleep(0.02)  # Let frames already on the wire arrive
+        self._discard_input()
+
+    def read_counts(self):
+        """
+        Read the latest calibrated sensor values as raw signed 14-bit counts.
+        Returns an empty list on failure or if any sensor reports an error.
+
+        In streaming mode this returns the next pushed frame instead of sending CMD_READ.
+        """
+        sample = self.read_sample()
+        if sample:
+            # Process error flags; they are counted per encoder in stats()
+            if sample.error_flags:
+                for i in range(6):
+                    if sample.error_flags & (1 << i):
+                        self.log.warning("Sensor %d error.", i + 1)
+                return []
         else:
-            print("Failed to read sensor data.")
+            self.log.warning("Failed to read sensor data.")
             return []
 
-        return radians_values
+        return sample.counts
+
+    def read_sample(self):
+        """
+        Read the next frame as a SensorSample, or None on failure.
+        Sends CMD_READ first unless the board is streaming or pipelining is enabled.
+        """
+        if self.pipeline_depth and not self.streaming:
+            return self._read_pipelined()
+        if not self.streaming:
+            self.send_command(CMD_READ)
+        # time.sleep(0.05)  # Wait for Arduino to prepare data
+        if self.read_response() is None:
+            return None
+        return self.last_sample
+
+    def enable_pipelining(self, depth=2):
+        """
+        Keep depth (1 or 2) CMD_READ requests in flight while polling, so the board
+        prepares the next reply while the host is still parsing the current one.
+
+        Works with the request/response protocol of any firmware version. Replies are
+        matched to requests in order; after a timeout or corrupted reply the pipeline
+        is drained and restarted, so replies are never attributed to the wrong request.
+        """
+        if depth not in (1, 2):
+            raise ValueError(f"Pipeline depth must be 1 or 2, got {depth}.")
+        if self._in_flight:
+            self._flush_pipeline()
+        self.pipeline_depth = depth
+
+    def disable_pipelining(self):
+        """
+        Return to one request per read, discarding replies still in flight.
+        """
+        if self._in_flight:
+            self._flush_pipeline()
+        self.pipeline_depth = 0
+
+    def _read_pipelined(self):
+        """
+        read_sample() for pipelined polling.
+        """
+        if self.ser is None:
+            self.log.error("Serial port not initialized.")
+            return None
+
+        self._fill_pipeline()
+        resyncs = self.parser.resyncs
+        result = self.read_response()
+        if result is None or self.parser.resyncs != resyncs:
+            # A reply was lost or damaged, so the in-order match is no longer known
+            self._flush_pipeline()
+            return None
+
+        self._in_flight -= 1
+        # Request the next reply before handing this one to the caller
+        self._fill_pipeline()
+        return self.last_sample
+
+    def _fill_pipeline(self):
+        while self._in_flight < self.pipeline_depth:
+            self.send_command(CMD_READ)
+            self._in_flight += 1
+
+    def _flush_pipeline(self, quiet_time=0.02):
+        """
+        Wait until no reply has arrived for quiet_time seconds (longer than the firmware's
+        10 ms loop), then drop everything received so the next request starts clean.
+        """
+        self.pipeline_flushes += 1
+        timeout = self.ser.timeout
+        self.ser.timeout = quiet_time
+        try:
+            while self.ser.read(max(1, self.ser.in_waiting)):
+                pass
+        finally:
+            self.ser.timeout = timeout
+        self.parser.clear()
+        self._in_flight = 0
+
+    def _discard_input(self):
+        """
+        Drop received bytes, both in the OS buffer and in the frame parser.
+        """
+        self.ser.reset_input_buffer()
+        self.parser.clear()
+
+    def read_stream_radians(self):
+        """
+        Start streaming if needed and return the next pushed frame in radians.
+        """
+        if not self.streaming:
+            self.start_streaming()
+        return self.read_radians()
+
+    def read_radians(self):
+        """
+        Convert the latest sensor angle data to radians.
+        Each 14-bit sensor value ranges from 0 to 16383, representing 0 to 2π radians.
+        """
+        return [counts_to_radians(value) for value in self.read_counts()]
 
     def close(self):
         """
         Close the serial connection.
         """
         if self.ser:
+            self.stop_streaming()
             self.ser.close()
             print("Serial port closed.")
@@ -0,0 +1,107 @@
+"""
+Measure the serial link throughput of the encoder board.
+
+Compares baud rate x frame format x read mode (polling or streaming) on a real
+board and reports delivered frames/s, bytes/s and dropped frames:
+    python -m delta6_sensor_interface.link_benchmark --port /dev/ttyACM0
+"""
+
+import argparse
+import itertools
+import time
+from typing import NamedTuple
+from delta6_sensor_interface.frame_parser import (
+    FRAME_FORMAT_LEGACY, FRAME_FORMAT_PACKED, FRAME_FORMAT_TIMESTAMPED, FrameParser)
+from delta6_sensor_interface.interface import DEFAULT_BAUD, SensorInterface
+
+FORMAT_NAMES = {
+    FRAME_FORMAT_LEGACY: "legacy",
+    FRAME_FORMAT_TIMESTAMPED: "timestamped",
+    FRAME_FORMAT_PACKED: "packed",
+}
+
+
+class LinkResult(NamedTuple):
+    baudrate: int
+    frame_format: int
+    mode: str
+    frames_per_s: float
+    bytes_per_s: float
+    dropped_frames: int
+    checksum_errors: int
+
+
+def wire_limit(baudrate, frame_format):
+    """
+    Upper bound on frames/s for one frame format at baudrate (8N1, 10 bits per byte).
+    """
+    return baudrate / 10.0 / FrameParser(frame_format).frame_length
+
+
+def measure_throughput(sensor, duration=2.0, mode="stream", rate_hz=2000):
+    """
+    Read frames for duration seconds with the sensor's current baud rate and format.
+
+    :param mode: "stream" (board pushes at rate_hz) or "poll" (one CMD_READ per frame)
+    :return: LinkResult
+    """
+    if mode not in ("stream", "poll"):
+        raise ValueError(f"Unknown mode {mode}.")
+
+    sensor.reset_sequence()
+    dropped = sensor.dropped_frames
+    errors = sensor.parser.checksum_errors
+    frames = 0
+    if mode == "stream":
+        sensor.start_streaming(rate_hz)
+
+    start = time.perf_counter()
+    try:
+        while time.perf_counter() - start < duration:
+            if mode == "stream":
+                frames += len(sensor.read_frames(block=True).counts)
+            elif sensor.read_sample() is not None:
+                frames += 1
+    finally:
+        elapsed = time.perf_counter() - start
+        if mode == "stream":
+            sensor.stop_streaming()
+
+    frames_per_s = frames / elapsed
+    return LinkResult(sensor.baudrate, sensor.frame_format, mode, frames_per_s,
+                      frames_per_s * sensor.parser.frame_length,
+                      sensor.dropped_frames - dropped,
+                      sensor.parser.checksum_errors - errors)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare encoder link throughput across baud rates, frame formats and read modes.")
+    parser.add_argument("--port", type=str, default="/dev/ttyACM0",
+                        help="Serial port of the encoder board (default /dev/ttyACM0)")
+    parser.add_argument("--bauds", type=int, nargs="+", default=[115200, 500000, 1000000],
+                        help="Baud rates to try (default 115200 500000 1000000)")
+    parser.add_argument("--duration", type=float, default=2.0,
+                        help="Seconds per measurement (default 2.0)")
+    parser.add_argument("--rate", type=int, default=2000,
+                        help="Requested stream rate in Hz (default 2000)")
+    args = parser.parse_args()
+
+    sensor = SensorInterface(port=args.port, baudrate=DEFAULT_BAUD)
+    print(f"{'baud':>8} {'format':>12} {'mode':>7} {'frames/s':>9} {'limit':>7} "
+          f"{'bytes/s':>8} {'dropped':>8} {'errors':>7}")
+    try:
+        for baud in args.bauds:
+            if sensor.negotiate_baud((baud,)) != baud:
+                print(f"{baud:>8} not accepted, skipped")
+                continue
+            for fmt, mode in itertools.product(FORMAT_NAMES, ("poll", "stream")):
+                sensor.set_frame_format(fmt)
+                result = measure_throughput(sensor, args.duration, mode, args.rate)
+                print(f"{baud:>8} {FORMAT_NAMES[fmt]:>12} {mode:>7} {result.frames_per_s:>9.0f} "
+                      f"{wire_limit(baud, fmt):>7.0f} {result.bytes_per_s:>8.0f} "
+                      f"{result.dropped_frames:>8} {result.checksum_errors:>7}")
+    finally:
+        sensor.set_frame_format(FRAME_FORMAT_LEGACY)
+        sensor.negotiate_baud((DEFAULT_BAUD,))
+        sensor.close()
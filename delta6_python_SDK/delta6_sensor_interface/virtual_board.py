@@ -0,0 +1,379 @@
+"""
+Software emulation of the Delta6 encoder board (firmware/src/main.cpp) on a pty.
+
+The board speaks the same protocol as the firmware: calibration, read, stream,
+set-format (legacy, timestamped and packed frames), set-baud and hello, with
+the ready announcement after boot. SensorInterface, ReadEncoderLoop and
+example.py connect to board.port like to a real /dev/ttyACM*:
+
+    with VirtualNanoBoard(trajectory=sine_trajectory(0.1, 1.0), noise=1.0) as board:
+        sensor = SensorInterface(port=board.port)
+
+or from a shell, printing the port to use:
+    python -m delta6_sensor_interface.virtual_board --noise 1 --corrupt 0.001
+
+A pty has no line rate, so frames go out as fast as the host reads them unless
+emulate_baud is set; use that to reproduce link limits, leave it off to load
+test the host beyond what the hardware delivers. POSIX only.
+"""
+
+import argparse
+import math
+import os
+import random
+import select
+import threading
+import time
+import tty
+
+from delta6_sensor_interface.frame_parser import (
+    FRAME_FORMAT_LEGACY, FRAME_FORMAT_PACKED, FRAME_FORMAT_TIMESTAMPED, FRAME_VERSION,
+    START_BYTE, START_BYTE_PACKED, START_BYTE_V1)
+from delta6_sensor_interface.interface import (
+    ACK_BYTE, ACK_OK, ACK_UNSUPPORTED, CMD_CALIBRATION, CMD_HELLO, CMD_READ, CMD_SET_BAUD,
+    CMD_SET_FORMAT, CMD_STREAM, DEFAULT_BAUD, SUPPORTED_BAUDS)
+
+COUNTS_PER_REV = 16384
+COUNTS_PER_RADIAN = 16383 / (2 * math.pi)  # Inverse of delta6_utils.math_tools.counts_to_radians
+
+# Firmware timing
+BAUD_CONFIRM_TIMEOUT = 1.0
+IDLE_PERIOD = 0.01  # delay(10) in the firmware loop while not streaming
+
+# Payload bytes following each command byte, see commandPayloadLength()
+PAYLOAD_LENGTHS = {CMD_STREAM: 2, CMD_SET_FORMAT: 1, CMD_SET_BAUD: 4}
+
+
+def sine_trajectory(amplitude=0.1, frequency=0.5, phases=(0, 1, 2, 3, 4, 5)):
+    """
+    Trajectory with joint i at amplitude * sin(2*pi*frequency*t + phases[i]) rad.
+    """
+    def trajectory(t):
+        return [amplitude * math.sin(2 * math.pi * frequency * t + phase) for phase in phases]
+    return trajectory
+
+
+class VirtualNanoBoard:
+    def __init__(self, trajectory=None, noise=0.0, error_rate=0.0, corrupt_rate=0.0,
+                 boot_time=0.0, emulate_baud=False, calibration_offsets=None, seed=None):
+        """
+        :param trajectory: Encoder angles in rad; a function of the time in s since start()
+                           returning six angles, or a sequence of six-angle rows played back
+                           one row per sample (looping). Default: all zero.
+        :param noise: Standard deviation of Gaussian noise on every reading, in counts
+        :param error_rate: Probability that a sensor read fails (sets its error flag)
+        :param corrupt_rate: Probability that one byte of a sent frame is flipped
+        :param boot_time: Seconds before the board handles commands and announces readiness
+        :param emulate_baud: Pace output at the current baud rate (10 bits per byte)
+        :param calibration_offsets: Initial offsets in counts, as if loaded from EEPROM
+        :param seed: Seed of the noise, error and corruption generator
+        """
+        self.trajectory = trajectory
+        self.noise = noise
+        self.error_rate = error_rate
+        self.corrupt_rate = corrupt_rate
+        self.boot_time = boot_time
+        self.emulate_baud = emulate_baud
+        self.calibration_offsets = list(calibration_offsets or [0] * 6)
+        self._random = random.Random(seed)
+
+        # Firmware state
+        self.positions = [0] * 6
+        self.error_flags = 0
+        self.frame_format = FRAME_FORMAT_LEGACY
+        self.sample_sequence = 0
+        self.sample_time_us = 0
+        self.baudrate = DEFAULT_BAUD
+        self._previous_baud = DEFAULT_BAUD
+        self._baud_switch_time = None
+        self.stream_period = None
+        self._last_frame = 0.0
+
+        # processSerial() parser state
+        self._state = 'start'
+        self._body = bytearray()
+        self._payload_length = 0
+
+        # Counters
+        self.commands_received = 0
+        self.checksum_errors = 0
+        self.frames_sent = 0
+        self.frames_corrupted = 0
+        self.frames_overflowed = 0
+        self._unsent = b""  # Tail of a frame the pty took only part of
+
+        self._master = None
+        self._slave = None
+        self.port = None
+        self._start_time = None
+        self._thread = None
+        self._stop_event = threading.Event()
+
+    def start(self):
+        """
+        Create the pty and start emulating; the host can open self.port right away.
+        """
+        if self._thread is not None:
+            return self.port
+        self._unsent = b""
+        self._master, self._slave = os.openpty()
+        tty.setraw(self._slave)
+        os.set_blocking(self._master, False)
+        self.port = os.ttyname(self._slave)
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self.port
+
+    def stop(self):
+        """
+        Stop emulating and close the pty.
+        """
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+        os.close(self._master)
+        os.close(self._slave)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def _micros(self):
+        return int((time.perf_counter() - self._start_time) * 1e6) & 0xFFFFFFFF
+
+    def _read_angle(self, i, angles):
+        """
+        sensors[i].readAngle(): raw count in 0 ... 16383, or -1 on a failed read.
+        """
+        if self.error_rate and self._random.random() < self.error_rate:
+            return -1
+        count = angles[i] * COUNTS_PER_RADIAN
+        if self.noise:
+            count += self._random.gauss(0.0, self.noise)
+        return int(round(count)) % COUNTS_PER_REV
+
+    def _trajectory_angles(self):
+        if self.trajectory is None:
+            return [0.0] * 6
+        if callable(self.trajectory):
+            return self.trajectory(time.perf_counter() - self._start_time)
+        return self.trajectory[self.sample_sequence % len(self.trajectory)]
+
+    def update_positions(self):
+        """
+        updatePositions(): take a new sample of all six sensors.
+        """
+        angles = self._trajectory_angles()
+        self.sample_time_us = self._micros()
+        self.sample_sequence = (self.sample_sequence + 1) & 0xFFFF
+        for i in range(6):
+            angle = self._read_angle(i, angles)
+            if angle == -1:
+                self.error_flags |= 1 << i
+                self.positions[i] = 0
+            else:
+                self.positions[i] = angle
+
+    def _adjusted(self, i):
+        # int16_t adjustedAngle = positions[i] - calibrationOffsets[i]
+        return ((self.positions[i] - self.calibration_offsets[i] + 0x8000) & 0xFFFF) - 0x8000
+
+    def _frame(self):
+        """
+        handleRead(): response frame of the current sample in the current format.
+        """
+        if self.frame_format == FRAME_FORMAT_PACKED:
+            bits = 0
+            for i in range(6):
+                bits = (bits << 14) | (self._adjusted(i) & 0x3FFF)
+            bits = (bits << 6) | (self.error_flags & 0x3F)
+            bits = (bits << 6) | (self.sample_sequence & 0x3F)
+            body = bits.to_bytes(12, 'big')
+            start = START_BYTE_PACKED
+        else:
+            body = bytearray()
+            if self.frame_format == FRAME_FORMAT_TIMESTAMPED:
+                body.append(FRAME_VERSION)
+                body += self.sample_sequence.to_bytes(2, 'big')
+                body += self.sample_time_us.to_bytes(4, 'big')
+            for i in range(6):
+                body += self._adjusted(i).to_bytes(2, 'big', signed=True)
+            body.append(self.error_flags)
+            start = START_BYTE_V1 if self.frame_format == FRAME_FORMAT_TIMESTAMPED else START_BYTE
+        self.error_flags = 0
+        return bytes([start]) + bytes(body) + bytes([sum(body) & 0xFF])
+
+    def _write(self, data):
+        """
+        Write as much of data as the pty takes and return the rest.
+        """
+        try:
+            return data[os.write(self._master, data):]
+        except BlockingIOError:
+            return data
+
+    def _send(self, data, frame=True):
+        if frame and self.corrupt_rate and self._random.random() < self.corrupt_rate:
+            data = bytearray(data)
+            data[self._random.randrange(len(data))] ^= 1 << self._random.randrange(8)
+            self.frames_corrupted += 1
+        if self._unsent:
+            # Finish the partly written frame first, so the host never sees a truncated one
+            self._unsent = self._write(self._unsent)
+            if self._unsent:
+                self.frames_overflowed += 1
+                return
+        unsent = self._write(data)
+        if len(unsent) == len(data):
+            # The host is not reading; like a full UART buffer the frame is lost
+            self.frames_overflowed += 1
+            return
+        self._unsent = unsent
+        if frame:
+            self.frames_sent += 1
+        if self.emulate_baud:
+            time.sleep(len(data) * 10.0 / self.baudrate)
+
+    def _send_ack(self, cmd, status):
+        self._send(bytes([ACK_BYTE, cmd, status, (cmd + status) & 0xFF]), frame=False)
+
+    def _handle(self, cmd, payload):
+        self.commands_received += 1
+        self._baud_switch_time = None  # Any valid command confirms a pending baud change
+        if cmd == CMD_CALIBRATION:
+            angles = self._trajectory_angles()
+            for i in range(6):
+                angle = self._read_angle(i, angles)
+                if angle == -1:
+                    self.error_flags |= 1 << i
+                    self.calibration_offsets[i] = 0
+                else:
+                    self.calibration_offsets[i] = angle
+        elif cmd == CMD_READ:
+            self._send(self._frame())
+        elif cmd == CMD_STREAM:
+            rate = int.from_bytes(payload, 'big')
+            if rate == 0:
+                self.stream_period = None
+            else:
+                self.stream_period = 1e-6 * (1000000 // rate)
+                self._last_frame = time.perf_counter() - self.stream_period
+        elif cmd == CMD_SET_FORMAT:
+            if payload[0] in (FRAME_FORMAT_LEGACY, FRAME_FORMAT_TIMESTAMPED, FRAME_FORMAT_PACKED):
+                self.frame_format = payload[0]
+        elif cmd == CMD_SET_BAUD:
+            baud = int.from_bytes(payload, 'big')
+            if baud not in SUPPORTED_BAUDS:
+                self._send_ack(CMD_SET_BAUD, ACK_UNSUPPORTED)
+                return
+            self._send_ack(CMD_SET_BAUD, ACK_OK)
+            self._previous_baud = self.baudrate
+            self.baudrate = baud
+            self._baud_switch_time = time.perf_counter()
+        elif cmd == CMD_HELLO:
+            self._send_ack(CMD_HELLO, ACK_OK)
+
+    def _process_bytes(self, data):
+        """
+        processSerial(): the firmware's command state machine, fed byte by byte.
+        """
+        for byte in data:
+            if self._state == 'start':
+                if byte == START_BYTE:
+                    self._state = 'cmd'
+            elif self._state == 'cmd':
+                self._body = bytearray([byte])
+                self._payload_length = PAYLOAD_LENGTHS.get(byte, 0)
+                self._state = 'payload' if self._payload_length else 'checksum'
+            elif self._state == 'payload':
+                self._body.append(byte)
+                if len(self._body) > self._payload_length:
+                    self._state = 'checksum'
+            else:
+                if byte == sum(self._body) & 0xFF:
+                    self._handle(self._body[0], bytes(self._body[1:]))
+                else:
+                    self.checksum_errors += 1
+                self._state = 'start'
+
+    def _run(self):
+        self._start_time = time.perf_counter()
+        if self._stop_event.wait(self.boot_time):
+            return
+        # Bytes sent while booting went to the bootloader
+        try:
+            os.read(self._master, 65536)
+        except BlockingIOError:
+            pass
+        self._send_ack(CMD_HELLO, ACK_OK)
+
+        next_sample = time.perf_counter()
+        while not self._stop_event.is_set():
+            now = time.perf_counter()
+            if self._baud_switch_time is not None and \
+                    now - self._baud_switch_time > BAUD_CONFIRM_TIMEOUT:
+                self.baudrate = self._previous_baud
+                self._baud_switch_time = None
+
+            if self.stream_period:
+                if now - self._last_frame >= self.stream_period:
+                    self._last_frame += self.stream_period
+                    if now - self._last_frame >= self.stream_period:
+                        self._last_frame = now  # Fell behind, restart the schedule
+                    self.update_positions()
+                    self._send(self._frame())
+                timeout = self._last_frame + self.stream_period - time.perf_counter()
+            else:
+                if now >= next_sample:
+                    self.update_positions()
+                    next_sample = now + IDLE_PERIOD
+                timeout = next_sample - time.perf_counter()
+
+            readable, _, _ = select.select([self._master], [], [], max(0.0, min(timeout, 0.05)))
+            if readable:
+                try:
+                    self._process_bytes(os.read(self._master, 4096))
+                except (BlockingIOError, OSError):
+                    pass
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Emulate a Delta6 encoder board on a pty and print its port.")
+    parser.add_argument("--amplitude", type=float, default=0.1,
+                        help="Amplitude of the sine trajectory in rad (default 0.1)")
+    parser.add_argument("--frequency", type=float, default=0.5,
+                        help="Frequency of the sine trajectory in Hz (default 0.5)")
+    parser.add_argument("--noise", type=float, default=0.0,
+                        help="Reading noise standard deviation in counts (default 0)")
+    parser.add_argument("--errors", type=float, default=0.0,
+                        help="Probability of a failed sensor read (default 0)")
+    parser.add_argument("--corrupt", type=float, default=0.0,
+                        help="Probability of a corrupted frame (default 0)")
+    parser.add_argument("--boot-time", type=float, default=0.0,
+                        help="Seconds until the board is ready (default 0)")
+    parser.add_argument("--emulate-baud", action="store_true",
+                        help="Pace output at the negotiated baud rate")
+    args = parser.parse_args()
+
+    board = VirtualNanoBoard(trajectory=sine_trajectory(args.amplitude, args.frequency),
+                             noise=args.noise, error_rate=args.errors,
+                             corrupt_rate=args.corrupt, boot_time=args.boot_time,
+                             emulate_baud=args.emulate_baud)
+    print(f"Virtual board on {board.start()}, press Ctrl+C to stop.")
+    try:
+        while True:
+            time.sleep(5)
+            print(f"commands {board.commands_received}, frames {board.frames_sent}, "
+                  f"corrupted {board.frames_corrupted}, overflowed {board.frames_overflowed}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        board.stop()
@@ -1,5 +1,6 @@
+import math
 import numpy as np
-from scipy.spatial.transform import Rotation as R
+from delta6_utils.rotation_tools import euler_xyz_to_matrix, matrix_to_euler_xyz
 
 
 def position_to_trans_matrix(transform):
@@ -20,8 +21,7 @@ def position_to_trans_matrix(transform):
     x, y, z, roll, pitch, yaw = transform
 
     # Rotation from Euler angles (in radians, 'XYZ' convention)
-    rot = R.from_euler('XYZ', [roll, pitch, yaw], degrees=False)
-    R_mat = rot.as_matrix()  # 3x3
+    R_mat = euler_xyz_to_matrix(roll, pitch, yaw)  # 3x3
 
     # Build the 4x4 homogeneous transform
     T_AB = np.eye(4)
@@ -47,8 +47,7 @@ def trans_matrix_to_position(T_AB):
 
     # Extract rotation part and convert to Euler angles
     R_mat = T_AB[0:3, 0:3]
-    rot = R.from_matrix(R_mat)
-    roll, pitch, yaw = rot.as_euler('XYZ', degrees=False)
+    roll, pitch, yaw = matrix_to_euler_xyz(R_mat)
 
     return np.array([x, y, z, roll, pitch, yaw])
 
@@ -178,6 +177,19 @@ def compute_force_at_B(measured_force_moment_A, transform):
     return force_moment_B.tolist()
 
 
+def counts_to_radians(count):
+    """
+    Convert a calibrated 14-bit encoder count to radians.
+
+    16383 counts correspond to 2*pi; the result is rounded to 5 decimals,
+    which is the resolution SensorInterface reports.
+
+    :param count: signed encoder count
+    :return: angle in radians
+    """
+    return round((count / 16383.0) * (2 * math.pi), 5)
+
+
 def quantize_to_resolution(value, resolution):
 
     sign = 1 if value >= 0 else -1
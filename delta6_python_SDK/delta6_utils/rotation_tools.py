@@ -0,0 +1,210 @@
+"""
+Closed-form rotation matrices and Euler-angle conversions.
+
+Drop-in replacement for the scipy.spatial.transform calls on the kinematics
+hot path. Angle conventions follow scipy: upper-case sequences are intrinsic,
+the first and last angles lie in [-pi, pi] and the middle angle in
+[-pi/2, pi/2]. In gimbal lock the last angle is set to zero, as scipy does.
+
+Every function accepts plain floats (fast path through the math module) or
+NumPy arrays of any matching shape; matrices are returned with shape (..., 3, 3).
+"""
+
+import math
+import numpy as np
+
+# Below this |cos(middle angle)| the first and last axes are treated as aligned
+_GIMBAL_EPS = 1e-7
+
+
+def _is_scalar(*values):
+    return all(isinstance(v, (float, int)) for v in values)
+
+
+def _cos_sin(angle):
+    if _is_scalar(angle):
+        return math.cos(angle), math.sin(angle)
+    angle = np.asarray(angle, dtype=float)
+    return np.cos(angle), np.sin(angle)
+
+
+def _atan2(y, x):
+    if _is_scalar(y, x):
+        return math.atan2(y, x)
+    return np.arctan2(y, x)
+
+
+def _hypot(x, y):
+    if _is_scalar(x, y):
+        return math.hypot(x, y)
+    return np.hypot(x, y)
+
+
+def _stack_matrix(rows):
+    """
+    Build a rotation matrix from nested rows of scalars or equally shaped arrays.
+    """
+    mat = np.array(rows, dtype=float)
+    if mat.ndim > 2:
+        mat = np.moveaxis(mat, (0, 1), (-2, -1))
+    return mat
+
+
+def rot_x(angle):
+    """Rotation matrix about the X axis (radians)."""
+    c, s = _cos_sin(angle)
+    zero, one = 0 * c, 0 * c + 1
+    return _stack_matrix([[one, zero, zero],
+                          [zero, c, -s],
+                          [zero, s, c]])
+
+
+def rot_y(angle):
+    """Rotation matrix about the Y axis (radians)."""
+    c, s = _cos_sin(angle)
+    zero, one = 0 * c, 0 * c + 1
+    return _stack_matrix([[c, zero, s],
+                          [zero, one, zero],
+                          [-s, zero, c]])
+
+
+def rot_z(angle):
+    """Rotation matrix about the Z axis (radians)."""
+    c, s = _cos_sin(angle)
+    zero, one = 0 * c, 0 * c + 1
+    return _stack_matrix([[c, -s, zero],
+                          [s, c, zero],
+                          [zero, zero, one]])
+
+
+def euler_xyz_to_matrix(roll, pitch, yaw):
+    """
+    Intrinsic 'XYZ' Euler angles to a rotation matrix, R = Rx(roll) Ry(pitch) Rz(yaw).
+
+    :param roll, pitch, yaw: angles in radians
+    :return: rotation matrix, shape (3, 3) or (..., 3, 3)
+    """
+    ca, sa = _cos_sin(roll)
+    cb, sb = _cos_sin(pitch)
+    cc, sc = _cos_sin(yaw)
+    return _stack_matrix([
+        [cb * cc, -cb * sc, sb],
+        [ca * sc + sa * sb * cc, ca * cc - sa * sb * sc, -sa * cb],
+        [sa * sc - ca * sb * cc, sa * cc + ca * sb * sc, ca * cb],
+    ])
+
+
+def euler_zxy_to_matrix(z, x, y):
+    """
+    Intrinsic 'ZXY' Euler angles to a rotation matrix, R = Rz(z) Rx(x) Ry(y).
+
+    :param z, x, y: angles in radians, in sequence order
+    :return: rotation matrix, shape (3, 3) or (..., 3, 3)
+    """
+    ca, sa = _cos_sin(z)
+    cb, sb = _cos_sin(x)
+    cc, sc = _cos_sin(y)
+    return _stack_matrix([
+        [ca * cc - sa * sb * sc, -sa * cb, ca * sc + sa * sb * cc],
+        [sa * cc + ca * sb * sc, ca * cb, sa * sc - ca * sb * cc],
+        [-cb * sc, sb, cb * cc],
+    ])
+
+
+def _xyz_from_elements(r00, r01, r02, r11, r12, r21, r22):
+    cos_pitch = _hypot(r00, r01)
+    pitch = _atan2(r02, cos_pitch)
+    if _is_scalar(cos_pitch):
+        if cos_pitch < _GIMBAL_EPS:
+            return math.atan2(r21, r11), pitch, 0.0
+        return math.atan2(-r12, r22), pitch, math.atan2(-r01, r00)
+
+    locked = cos_pitch < _GIMBAL_EPS
+    roll = np.where(locked, np.arctan2(r21, r11), np.arctan2(-r12, r22))
+    yaw = np.where(locked, 0.0, np.arctan2(-r01, r00))
+    return roll, pitch, yaw
+
+
+def _zxy_from_elements(r00, r01, r10, r11, r20, r21, r22):
+    cos_x = _hypot(r20, r22)
+    x = _atan2(r21, cos_x)
+    if _is_scalar(cos_x):
+        if cos_x < _GIMBAL_EPS:
+            return math.atan2(r10, r00), x, 0.0
+        return math.atan2(-r01, r11), x, math.atan2(-r20, r22)
+
+    locked = cos_x < _GIMBAL_EPS
+    z = np.where(locked, np.arctan2(r10, r00), np.arctan2(-r01, r11))
+    y = np.where(locked, 0.0, np.arctan2(-r20, r22))
+    return z, x, y
+
+
+def matrix_to_euler_xyz(mat):
+    """
+    Rotation matrix to intrinsic 'XYZ' Euler angles.
+
+    :param mat: rotation matrix, shape (3, 3) or (..., 3, 3)
+    :return: (roll, pitch, yaw) in radians
+    """
+    mat = np.asarray(mat, dtype=float)
+    if mat.ndim == 2:
+        mat = mat.tolist()
+        return _xyz_from_elements(mat[0][0], mat[0][1], mat[0][2],
+                                  mat[1][1], mat[1][2], mat[2][1], mat[2][2])
+    return _xyz_from_elements(mat[..., 0, 0], mat[..., 0, 1], mat[..., 0, 2],
+                              mat[..., 1, 1], mat[..., 1, 2],
+                              mat[..., 2, 1], mat[..., 2, 2])
+
+
+def matrix_to_euler_zxy(mat):
+    """
+    Rotation matrix to intrinsic 'ZXY' Euler angles.
+
+    :param mat: rotation matrix, shape (3, 3) or (..., 3, 3)
+    :return: (z, x, y) in radians, in sequence order
+    """
+    mat = np.asarray(mat, dtype=float)
+    if mat.ndim == 2:
+        mat = mat.tolist()
+        return _zxy_from_elements(mat[0][0], mat[0][1], mat[1][0], mat[1][1],
+                                  mat[2][0], mat[2][1], mat[2][2])
+    return _zxy_from_elements(mat[..., 0, 0], mat[..., 0, 1],
+                              mat[..., 1, 0], mat[..., 1, 1],
+                              mat[..., 2, 0], mat[..., 2, 1], mat[..., 2, 2])
+
+
+def zxy_to_xyz(z, x, y):
+    """
+    Re-express intrinsic 'ZXY' angles as intrinsic 'XYZ' angles (roll, pitch, yaw).
+
+    Equivalent to R.from_euler('ZXY', [z, x, y]).as_euler('XYZ').
+    """
+    # Only the matrix elements the decomposition needs, see euler_zxy_to_matrix
+    ca, sa = _cos_sin(z)
+    cb, sb = _cos_sin(x)
+    cc, sc = _cos_sin(y)
+    return _xyz_from_elements(
+        ca * cc - sa * sb * sc, -sa * cb, ca * sc + sa * sb * cc,
+        ca * cb, sa * sc - ca * sb * cc,
+        sb, cb * cc)
+
+
+def xyz_to_zxy(roll, pitch, yaw):
+    """
+    Re-express intrinsic 'XYZ' angles (roll, pitch, yaw) as intrinsic 'ZXY' angles.
+
+    Equivalent to R.from_euler('XYZ', [roll, pitch, yaw]).as_euler('ZXY').
+    """
+    # Only the matrix elements the decomposition needs, see euler_xyz_to_matrix
+    ca, sa = _cos_sin(roll)
+    cb, sb = _cos_sin(pitch)
+    cc, sc = _cos_sin(yaw)
+    return _zxy_from_elements(
+        cb * cc, -cb * sc,
+        ca * sc + sa * sb * cc, ca * cc - sa * sb * sc,
+        sa * sc - ca * sb * cc, sa * cc + ca * sb * sc, ca * cb)
+
+
+# Constant rotations from the Delta6 main frame into the frames of branch 2 and 3
+ROT_Z_NEG_120 = rot_z(-2.0 * math.pi / 3.0)
+ROT_Z_NEG_240 = rot_z(-4.0 * math.pi / 3.0)
@@ -3,14 +3,18 @@ import argparse
 from delta6_kinematics.delta6_analytics import DeltaRobot
 from delta6_loops.rt_loop import RTLoop
 from delta6_loops.read_encoder_loop import ReadEncoderLoop
+from delta6_loops.wrench_pipeline import WrenchPipeline
 from delta6_sensor_interface.sensors_calibration import sensor_calibration
 from delta6_utils.force_visualizer import ForceVisualizer
 
 
 class MainLoop(RTLoop):
-    def __init__(self, nano_port, freq=100):
+    def __init__(self, nano_port, freq=100, pipeline=False):
         super().__init__(freq=freq)
         self.nano_port = nano_port
+        # Compute the wrench once per streamed sample instead of on the loop timer
+        self.pipeline = pipeline
+        self.wrench_pipeline = None
 
     def setup(self):
         ENCODER_DIR = [1, 1, 1, -1, -1, -1]
@@ -18,9 +22,10 @@ class MainLoop(RTLoop):
         # Perform sensor calibration
         sensor_calibration(nano_port=self.nano_port)
 
-        # Initialize the encoder loop
+        # Initialize the encoder loop; in pipeline mode the board streams at freq
         self.read_encoder_loop = ReadEncoderLoop(
-            nano_port=self.nano_port, encoder_dir=ENCODER_DIR)
+            nano_port=self.nano_port, encoder_dir=ENCODER_DIR,
+            stream_rate=self.freq if self.pipeline else None)
         self.read_encoder_loop.loop_spin(frequency=self.freq)
         self.Delta6 = DeltaRobot()
 
@@ -38,20 +43,38 @@ class MainLoop(RTLoop):
         )
         self.force_visualizer.start()
 
-        super().setup()
+        if self.pipeline:
+            # No loop timer: the pipeline runs the kinematics whenever a sample arrives
+            self.wrench_pipeline = WrenchPipeline(
+                self.read_encoder_loop, robot=self.Delta6, on_state=self.on_state)
+            self.wrench_pipeline.start()
+        else:
+            super().setup()
         print("MainLoop setup done.")
 
+    def on_state(self, seq, delta6_state):
+        # No wrench outside the workspace; keep showing the last one
+        if delta6_state.wrench is not None:
+            self.force_visualizer.update_forces([delta6_state.wrench])
+
     def loop(self):
         encoder_reading = self.read_encoder_loop.get_encoder_reading()
         self.Delta6.update(*encoder_reading)
 
-        delta6_pose_reading = self.Delta6.get_FK_result()
+        # One kinematics pass gives both pose and wrench
+        delta6_state = self.Delta6.compute_state()
+
+        delta6_pose_reading = delta6_state.pose
         # print(f"End-effector pose (x, y, z, roll, pitch, yaw): {delta6_pose_reading}")
 
-        delta6_end_force = self.Delta6.get_end_force()
-        self.force_visualizer.update_forces([delta6_end_force])
+        delta6_end_force = delta6_state.wrench
+        if delta6_end_force is not None:
+            self.force_visualizer.update_forces([delta6_end_force])
 
     def shutdown(self):
+        if self.wrench_pipeline is not None:
+            self.wrench_pipeline.stop()
+            print(self.wrench_pipeline.format())
         super().shutdown()
         self.force_visualizer.stop()
         print("Force visualizer shutdown.")
@@ -64,8 +87,11 @@ if __name__ == "__main__":
                         help="Serial port name (e.g., COM6 or /dev/ttyACM0)")
     parser.add_argument("--freq", type=int, default=50,
                         help="Loop frequency (default 50 Hz)")
+    parser.add_argument("--pipeline", action="store_true",
+                        help="Stream at --freq and compute the wrench once per new sample, "
+                             "reporting the sample-to-wrench latency on exit")
     args = parser.parse_args()
 
-    rt_loop = MainLoop(nano_port=args.port, freq=args.freq)
+    rt_loop = MainLoop(nano_port=args.port, freq=args.freq, pipeline=args.pipeline)
     rt_loop.setup()
     rt_loop.loop_spin()
@@ -6,12 +6,14 @@ setup(
     packages=find_packages(),
     install_requires=[
         'pyserial', 
-        'apscheduler',
         'scipy',
         'numpy',
         'pygame',
         'platformio'
     ],
+    extras_require={
+        'jit': ['numba'],
+    },
     author="Yue Feng",
     author_email="ttopeor@gmail.com",
     description="An affordable 6-dof force sensor",
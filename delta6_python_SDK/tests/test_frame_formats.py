@@ -0,0 +1,39 @@
+import math
+
+import pytest
+
+from delta6_sensor_interface.frame_parser import (
+    FRAME_FORMAT_LEGACY, FRAME_FORMAT_PACKED, FRAME_FORMAT_TIMESTAMPED)
+from delta6_sensor_interface.interface import SensorInterface
+from delta6_sensor_interface.virtual_board import VirtualNanoBoard
+
+COUNTS_PER_RADIAN = 16383 / (2 * math.pi)
+
+# Angles and calibration offsets whose differences span almost two revolutions
+ANGLES = [0.01, 0.01, 3.0, -3.0, 1.0, 6.2]
+OFFSETS = [0, 16000, 100, 16300, 12000, 50]
+
+
+def read_counts(frame_format):
+    with VirtualNanoBoard([ANGLES], calibration_offsets=OFFSETS) as board:
+        sensor = SensorInterface(board.port)
+        try:
+            sensor.set_frame_format(frame_format)
+            return sensor.read_counts()
+        finally:
+            sensor.close()
+
+
+@pytest.mark.parametrize("frame_format", [FRAME_FORMAT_LEGACY, FRAME_FORMAT_TIMESTAMPED])
+def test_read_counts_matches_packed_format(frame_format):
+    packed = read_counts(FRAME_FORMAT_PACKED)
+    assert len(packed) == 6
+    assert read_counts(frame_format) == packed
+
+
+def test_read_counts_wraps_into_one_revolution():
+    counts = read_counts(FRAME_FORMAT_LEGACY)
+    for count, angle, offset in zip(counts, ANGLES, OFFSETS):
+        position = int(round(angle * COUNTS_PER_RADIAN)) % 16384
+        assert -8192 <= count < 8192
+        assert (count - (position - offset)) % 16384 == 0
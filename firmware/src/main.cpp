@@ -10,22 +10,66 @@ byte pinSCK = 2;                                   // Shared SCK pin
 ercks sensors[6]; // Create 6 ercks sensor objects
 
 #define START_BYTE 0xAA
+#define START_BYTE_V1 0xAB  // Timestamped response frame
+#define START_BYTE_PACKED 0xAC  // Packed 14-bit response frame
+#define ACK_BYTE 0xAD  // Command acknowledgement frame
 #define CMD_CALIBRATION 0x01
 #define CMD_READ 0x02
+#define CMD_STREAM 0x03
+#define CMD_SET_FORMAT 0x04
+#define CMD_SET_BAUD 0x05
+#define CMD_HELLO 0x06
+
+#define FRAME_FORMAT_LEGACY 0       // 0xAA frame: angles, error flags
+#define FRAME_FORMAT_TIMESTAMPED 1  // 0xAB frame: version, sequence, timestamp, angles, error flags
+#define FRAME_FORMAT_PACKED 2       // 0xAC frame: 14-bit angles, error flags, 6-bit sequence
+#define FRAME_VERSION 1
+
+#define ACK_OK 0x00
+#define ACK_UNSUPPORTED 0x01
+
+#define MAX_PAYLOAD 4 // Largest command payload in bytes
+
+#define DEFAULT_BAUD 115200
+#define BAUD_CONFIRM_TIMEOUT_MS 1000 // Revert a baud change not confirmed by a valid command in time
+const unsigned long supportedBauds[] = {115200, 230400, 250000, 500000, 1000000};
 
 int calibrationOffsets[6] = {0}; // Stores calibration offset for each sensor
 int positions[6] = {0};          // Stores current position for each sensor
 uint8_t errorFlags = 0;          // Error flag byte
 
+uint8_t frameFormat = FRAME_FORMAT_LEGACY; // Layout of response frames, see CMD_SET_FORMAT
+uint16_t sampleSequence = 0;               // Incremented for every sample taken by updatePositions()
+unsigned long sampleTimeUs = 0;            // micros() when the current sample was taken
+
+// Link speed: a new baud rate stays pending until the host sends a valid command at it
+unsigned long currentBaud = DEFAULT_BAUD;
+unsigned long previousBaud = DEFAULT_BAUD;
+bool baudPendingConfirm = false;
+unsigned long baudSwitchMs = 0;
+
+// Streaming state: while streaming, a frame is pushed every streamPeriodUs
+bool streaming = false;
+unsigned long streamPeriodUs = 0;
+unsigned long lastFrameUs = 0;
+
 // Function declarations (function prototypes)
 void processSerial();
 uint8_t calculateChecksum(uint8_t *data, uint8_t length);
 void handleCalibration();
 void handleRead();
+void handleStream(uint8_t *payload);
+void handleSetFormat(uint8_t *payload);
+void handleSetBaud(uint8_t *payload);
+void switchBaud(unsigned long baud);
+void sendAck(uint8_t cmd, uint8_t status);
+void sendPackedFrame();
+void putBits(uint8_t *buf, uint8_t bitPos, uint16_t value, uint8_t nbits);
+uint8_t commandPayloadLength(uint8_t cmd);
 void updatePositions();
 
 void setup() {
-  Serial.begin(115200);
+  Serial.begin(DEFAULT_BAUD);
 
   // Load calibration offsets from EEPROM
   for (int i = 0; i < 6; i++) {
@@ -38,18 +82,43 @@ void setup() {
   }
 
   //Serial.println("6x ercks Rotary Position Sensors Initialized");
+
+  // Announce readiness so the host does not have to wait a fixed boot time
+  sendAck(CMD_HELLO, ACK_OK);
 }
 
 void loop() {
   processSerial();    // Process serial commands
-  updatePositions();  // Update sensor position data
-  delay(10);          // Small delay
+
+  if (baudPendingConfirm && millis() - baudSwitchMs > BAUD_CONFIRM_TIMEOUT_MS) {
+    // The host never spoke at the new rate, fall back so it can reach us again
+    switchBaud(previousBaud);
+    baudPendingConfirm = false;
+  }
+
+  if (streaming) {
+    // Push frames on a fixed schedule, without the polling delay
+    unsigned long now = micros();
+    if (now - lastFrameUs >= streamPeriodUs) {
+      lastFrameUs += streamPeriodUs;
+      if (now - lastFrameUs >= streamPeriodUs) {
+        lastFrameUs = now;  // Fell behind, restart the schedule instead of bursting
+      }
+      updatePositions();
+      handleRead();
+    }
+  } else {
+    updatePositions();  // Update sensor position data
+    delay(10);          // Small delay
+  }
 }
 
 // Process serial data
 void processSerial() {
-  static enum { WAIT_START, READ_CMD, READ_CHECKSUM } state = WAIT_START;
-  static uint8_t cmd;
+  static enum { WAIT_START, READ_CMD, READ_PAYLOAD, READ_CHECKSUM } state = WAIT_START;
+  static uint8_t body[1 + MAX_PAYLOAD]; // Command byte followed by its payload
+  static uint8_t payloadLength;
+  static uint8_t payloadIdx;
   static uint8_t checksum;
 
   while (Serial.available()) {
@@ -61,28 +130,63 @@ void processSerial() {
         }
         break;
       case READ_CMD:
-        cmd = byte;
-        state = READ_CHECKSUM;
+        body[0] = byte;
+        payloadLength = commandPayloadLength(byte);
+        payloadIdx = 0;
+        state = payloadLength > 0 ? READ_PAYLOAD : READ_CHECKSUM;
         break;
-      case READ_CHECKSUM:
+      case READ_PAYLOAD:
+        body[1 + payloadIdx++] = byte;
+        if (payloadIdx >= payloadLength) {
+          state = READ_CHECKSUM;
+        }
+        break;
+      case READ_CHECKSUM: {
         checksum = byte;
-        // Verify checksum
-        uint8_t calcChecksum = calculateChecksum(&cmd, 1);
+        // Verify checksum over command and payload
+        uint8_t calcChecksum = calculateChecksum(body, 1 + payloadLength);
         if (checksum == calcChecksum) {
+          // Any valid command confirms a pending baud change
+          baudPendingConfirm = false;
+
           // Process command
+          uint8_t cmd = body[0];
           if (cmd == CMD_CALIBRATION) {
             handleCalibration();
           } else if (cmd == CMD_READ) {
             handleRead();
+          } else if (cmd == CMD_STREAM) {
+            handleStream(&body[1]);
+          } else if (cmd == CMD_SET_FORMAT) {
+            handleSetFormat(&body[1]);
+          } else if (cmd == CMD_SET_BAUD) {
+            handleSetBaud(&body[1]);
+          } else if (cmd == CMD_HELLO) {
+            sendAck(CMD_HELLO, ACK_OK);
           }
         }
         // Reset state regardless of checksum verification result
         state = WAIT_START;
         break;
+      }
     }
   }
 }
 
+// Number of payload bytes that follow a command byte
+uint8_t commandPayloadLength(uint8_t cmd) {
+  if (cmd == CMD_STREAM) {
+    return 2;
+  }
+  if (cmd == CMD_SET_FORMAT) {
+    return 1;
+  }
+  if (cmd == CMD_SET_BAUD) {
+    return 4;
+  }
+  return 0;
+}
+
 // Calculate checksum (simple sum)
 uint8_t calculateChecksum(uint8_t *data, uint8_t length) {
   uint8_t sum = 0;
@@ -110,10 +214,28 @@ void handleCalibration() {
 
 // Handle read command
 void handleRead() {
+  if (frameFormat == FRAME_FORMAT_PACKED) {
+    sendPackedFrame();
+    errorFlags = 0;
+    return;
+  }
+
   // Prepare response packet
-  uint8_t packet[1 + 6 * 2 + 1 + 1]; // Start byte + data + error flag + checksum
+  // Start byte + [version + sequence + timestamp] + data + error flag + checksum
+  uint8_t packet[1 + 1 + 2 + 4 + 6 * 2 + 1 + 1];
   uint8_t idx = 0;
-  packet[idx++] = START_BYTE;
+  if (frameFormat == FRAME_FORMAT_TIMESTAMPED) {
+    packet[idx++] = START_BYTE_V1;
+    packet[idx++] = FRAME_VERSION;
+    packet[idx++] = (sampleSequence >> 8) & 0xFF;
+    packet[idx++] = sampleSequence & 0xFF;
+    packet[idx++] = (sampleTimeUs >> 24) & 0xFF;
+    packet[idx++] = (sampleTimeUs >> 16) & 0xFF;
+    packet[idx++] = (sampleTimeUs >> 8) & 0xFF;
+    packet[idx++] = sampleTimeUs & 0xFF;
+  } else {
+    packet[idx++] = START_BYTE;
+  }
 
   // Add position data for each sensor (considering calibration offset)
   for (int i = 0; i < 6; i++) {
@@ -136,8 +258,98 @@ void handleRead() {
   errorFlags = 0;
 }
 
+// Packed frame: six 14-bit angles, 6 error flag bits and the low 6 bits of the
+// sequence, most significant bit first, in 12 bytes
+void sendPackedFrame() {
+  uint8_t packet[1 + 12 + 1] = {0}; // Start byte + packed data + checksum
+  packet[0] = START_BYTE_PACKED;
+
+  uint8_t bitPos = 0;
+  for (int i = 0; i < 6; i++) {
+    // The calibrated angle wraps into 14 bits, i.e. modulo one revolution
+    int16_t adjustedAngle = positions[i] - calibrationOffsets[i];
+    putBits(&packet[1], bitPos, (uint16_t)adjustedAngle & 0x3FFF, 14);
+    bitPos += 14;
+  }
+  putBits(&packet[1], bitPos, errorFlags & 0x3F, 6);
+  bitPos += 6;
+  putBits(&packet[1], bitPos, sampleSequence & 0x3F, 6);
+
+  packet[13] = calculateChecksum(&packet[1], 12); // Exclude start byte
+  Serial.write(packet, sizeof(packet));
+}
+
+// Write the lowest nbits of value into buf starting at bit bitPos, most significant bit first
+void putBits(uint8_t *buf, uint8_t bitPos, uint16_t value, uint8_t nbits) {
+  for (int8_t b = nbits - 1; b >= 0; b--) {
+    if (value & (1 << b)) {
+      buf[bitPos >> 3] |= 0x80 >> (bitPos & 7);
+    }
+    bitPos++;
+  }
+}
+
+// Acknowledgement frame: ACK byte, command, status, checksum
+void sendAck(uint8_t cmd, uint8_t status) {
+  uint8_t packet[4] = {ACK_BYTE, cmd, status, 0};
+  packet[3] = calculateChecksum(&packet[1], 2); // Exclude start byte
+  Serial.write(packet, sizeof(packet));
+}
+
+// Handle set-baud command: payload is the new baud rate (big-endian uint32)
+void handleSetBaud(uint8_t *payload) {
+  unsigned long baud = ((unsigned long)payload[0] << 24) | ((unsigned long)payload[1] << 16) |
+                       ((unsigned long)payload[2] << 8) | payload[3];
+  bool supported = false;
+  for (uint8_t i = 0; i < sizeof(supportedBauds) / sizeof(supportedBauds[0]); i++) {
+    if (supportedBauds[i] == baud) {
+      supported = true;
+    }
+  }
+  if (!supported) {
+    sendAck(CMD_SET_BAUD, ACK_UNSUPPORTED);
+    return;
+  }
+
+  // Acknowledge at the old rate, then switch and wait for the host to confirm
+  sendAck(CMD_SET_BAUD, ACK_OK);
+  Serial.flush();
+  previousBaud = currentBaud;
+  switchBaud(baud);
+  baudPendingConfirm = true;
+  baudSwitchMs = millis();
+}
+
+void switchBaud(unsigned long baud) {
+  Serial.end();
+  Serial.begin(baud);
+  currentBaud = baud;
+}
+
+// Handle stream command: payload is the frame rate in Hz (big-endian), 0 stops streaming
+void handleStream(uint8_t *payload) {
+  uint16_t rate = ((uint16_t)payload[0] << 8) | payload[1];
+  if (rate == 0) {
+    streaming = false;
+    return;
+  }
+  streamPeriodUs = 1000000UL / rate;
+  lastFrameUs = micros() - streamPeriodUs; // Send the first frame right away
+  streaming = true;
+}
+
+// Handle set-format command: payload selects the response frame layout
+void handleSetFormat(uint8_t *payload) {
+  if (payload[0] == FRAME_FORMAT_LEGACY || payload[0] == FRAME_FORMAT_TIMESTAMPED ||
+      payload[0] == FRAME_FORMAT_PACKED) {
+    frameFormat = payload[0];
+  }
+}
+
 // Update sensor position data
 void updatePositions() {
+  sampleTimeUs = micros();
+  sampleSequence++;
   for (int i = 0; i < 6; i++) {
     int angle = sensors[i].readAngle();
     if (angle == -1) {